@@ -4,7 +4,7 @@ set -xe
 if [ $TOX_ENV == "coverage" ]
 then
   pip install coveralls
-  tox -e py34
+  tox -e py35
   coveralls
 else
   tox -e $TOX_ENV
@@ -0,0 +1,185 @@
+"""
+rfxcom.bench
+============
+
+Benchmarks for the rfxcom library, which run offline and write their
+results as JSON so they can be compared between versions::
+
+    python -m rfxcom.bench parsers --output before.json
+    # ... change the parsers ...
+    python -m rfxcom.bench parsers --output after.json
+    python -m rfxcom.bench compare before.json after.json
+
+"""
+
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import rfxcom
+
+
+def environment():
+    """Describe where the benchmarks were run, so results from different
+    machines or Python versions aren't mistaken for a regression.
+
+    :return: The Python version and implementation, the platform, the
+        version of rfxcom and the time.
+    :rtype: dict
+    """
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'rfxcom': rfxcom.__version__,
+        'time': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def timed(function, items, repeat=5):
+    """Call a function with each of the items, ``repeat`` times, and return
+    the fastest time per item.
+
+    :param function: The function to benchmark.
+
+    :param items: The arguments for each call.
+    :type items: list
+
+    :param repeat: The number of times to go through the items.
+    :type repeat: int
+
+    :return: The number of nanoseconds per call and calls per second.
+    :rtype: dict
+    """
+
+    best = None
+
+    for _ in range(repeat):
+
+        start = time.perf_counter()
+
+        for item in items:
+            function(item)
+
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    per_item = best / len(items)
+
+    return {
+        'ns_per_packet': per_item * 1e9,
+        'packets_per_second': 1 / per_item if per_item else None,
+    }
+
+
+def allocations(function, items):
+    """Call a function with each of the items while tracing memory
+    allocations, and return the memory still allocated per call afterwards,
+    which is what each result keeps alive.
+
+    :param function: The function to benchmark.
+
+    :param items: The arguments for each call.
+    :type items: list
+
+    :return: The number of memory blocks and bytes per call.
+    :rtype: dict
+    """
+
+    results = [None] * len(items)
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(ignore)
+
+        for index, item in enumerate(items):
+            results[index] = function(item)
+
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+
+    return {
+        'blocks_per_packet': sum(s.count_diff for s in stats) / len(items),
+        'bytes_per_packet': sum(s.size_diff for s in stats) / len(items),
+    }
+
+
+def write_results(results, output=None):
+    """Write the results as JSON to a file, or to stdout if ``output`` is
+    None.
+    """
+
+    if output is None:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+        return
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def read_results(path):
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(old, new, threshold=None):
+    """Compare the results of two runs of the same benchmark, by the metric
+    named in the results, ``ns_per_packet`` by default. Lower is better for
+    every metric.
+
+    :param old: The results from before the change.
+    :type old: dict
+
+    :param new: The results from after the change.
+    :type new: dict
+
+    :param threshold: The percentage a benchmark may get worse before it is
+        reported as a regression.
+    :type threshold: float
+
+    :return: A list of lines describing the differences and a list of the
+        names of the benchmarks which regressed.
+    :rtype: tuple
+    """
+
+    metric = new.get('metric', 'ns_per_packet')
+    lines = ["%-45s %12s %12s %8s" % ("benchmark", "before", "after",
+                                      metric)]
+    regressions = []
+
+    for group in sorted(set(old['results']) & set(new['results'])):
+        for name in sorted(set(old['results'][group]) &
+                           set(new['results'][group])):
+
+            before = old['results'][group][name].get(metric)
+            after = new['results'][group][name].get(metric)
+
+            if not before or after is None:
+                continue
+
+            change = (after - before) / before * 100
+            label = "%s.%s" % (group, name)
+            flag = ""
+
+            if threshold is not None and change > threshold:
+                regressions.append(label)
+                flag = "  REGRESSION"
+
+            lines.append("%-45s %12.1f %12.1f %+7.1f%%%s" % (
+                label, before, after, change, flag))
+
+    return lines, regressions
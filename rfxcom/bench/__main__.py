@@ -0,0 +1,102 @@
+"""
+rfxcom.bench.__main__
+=====================
+
+Run the benchmarks from the command line, see ``python -m rfxcom.bench -h``.
+"""
+
+import sys
+from argparse import ArgumentParser
+
+from rfxcom.bench import compare, read_results, write_results
+
+
+def parsers(args):
+
+    from rfxcom.bench import parsers
+
+    results = parsers.run(packets=args.packets, repeat=args.repeat,
+                          seed=args.seed, handlers=args.handler)
+    write_results(results, args.output)
+
+
+def loopback(args):
+
+    from rfxcom.bench import loopback
+
+    results = loopback.run(rates=args.rate or [100, 1000],
+                           packets=args.packets,
+                           transports=args.transport or loopback.TRANSPORTS)
+    write_results(results, args.output)
+
+
+def compare_results(args):
+
+    lines, regressions = compare(read_results(args.old),
+                                 read_results(args.new), args.threshold)
+
+    for line in lines:
+        print(line)
+
+    if regressions:
+        print("%s benchmarks are more than %s%% slower." % (
+              len(regressions), args.threshold))
+        return 1
+
+
+def main(argv=None):
+
+    parser = ArgumentParser(prog='python -m rfxcom.bench',
+                            description="Benchmark the rfxcom library.")
+    commands = parser.add_subparsers(dest='command')
+
+    command = commands.add_parser(
+        'parsers', help="Decode generated packets with every handler.")
+    command.add_argument('--packets', type=int, default=1000,
+                         help="The number of packets for each handler.")
+    command.add_argument('--repeat', type=int, default=5,
+                         help="The number of runs, the fastest is kept.")
+    command.add_argument('--seed', type=int, default=0,
+                         help="The seed for the generated packets.")
+    command.add_argument('--handler', action='append',
+                         help="Only benchmark this handler, by class name.")
+    command.add_argument('--output',
+                         help="Write the JSON results to a file.")
+    command.set_defaults(run=parsers)
+
+    command = commands.add_parser(
+        'loopback', help="Measure the latency from the serial line to the "
+                         "callback through a pseudo-terminal.")
+    command.add_argument('--rate', type=float, action='append',
+                         help="Packets written per second, can be given more "
+                              "than once (default: 100 and 1000).")
+    command.add_argument('--packets', type=int, default=1000,
+                         help="The number of packets written at each rate.")
+    command.add_argument('--transport', action='append',
+                         choices=('asyncio', 'nonblocking', 'base',
+                                  'threaded'),
+                         help="Only benchmark this transport.")
+    command.add_argument('--output',
+                         help="Write the JSON results to a file.")
+    command.set_defaults(run=loopback)
+
+    command = commands.add_parser(
+        'compare', help="Compare the JSON results of two runs.")
+    command.add_argument('old')
+    command.add_argument('new')
+    command.add_argument('--threshold', type=float,
+                         help="Exit with an error if a benchmark is this "
+                              "percentage slower.")
+    command.set_defaults(run=compare_results)
+
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""
+rfxcom.bench.loopback
+=====================
+
+Benchmark the time from the last byte of a packet arriving on the serial
+line to the callback running, through the transports reading a real file
+descriptor. A pseudo-terminal stands in for the RFXtrx: the transport opens
+the slave side and a generator thread writes energy usage packets into the
+master side at a fixed rate, each numbered in its current watts field. The
+time each packet is written and its callback runs are compared by number.
+
+The master side also answers the status request, so the asyncio
+transports are initialised as they would be with a real RFXtrx. Writes to
+the master side don't block, a packet that doesn't fit in the
+pseudo-terminal's buffer because the transport has fallen behind isn't
+written and is counted in ``not_written``. Packets written but never
+passed to the callback are counted in ``lost``.
+
+Pseudo-terminals are only available on Unix.
+"""
+
+import asyncio
+import os
+import select
+import threading
+import time
+import tty
+
+from serial import Serial
+
+from rfxcom.bench import environment
+from rfxcom.protocol import MODE_PACKET
+from rfxcom.protocol.stream import StreamDecoder
+from rfxcom.transport import (AsyncioTransport, NonBlockingTransport,
+                              ThreadedTransport)
+from rfxcom.transport.base import BaseTransport
+
+#: The transports that can be benchmarked, by name.
+TRANSPORTS = ('asyncio', 'nonblocking', 'base', 'threaded')
+
+#: How long to wait for the last packets once they have all been written.
+DRAIN_TIMEOUT = 5.0
+
+
+def elec_packet(number):
+    """An energy usage packet with ``number`` as its current watts."""
+
+    pkt = bytearray(b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                    b'\x00\x00\x00\x00\x0C\x46\xA8\x11\x69')
+    pkt[3] = number % 256
+    pkt[7:11] = number.to_bytes(4, 'big')
+    return bytes(pkt)
+
+
+def status_response(request):
+    """The RFXtrx's response to a status or mode request, reporting the mode
+    in ``MODE_PACKET`` so no mode needs to be set.
+    """
+
+    return bytes([0x0D, 0x01, 0x00, request[3], request[4], MODE_PACKET[5],
+                  0x5D]) + MODE_PACKET[7:10] + b'\x00\x00\x00\x00'
+
+
+class PseudoDevice:
+    """A pseudo-terminal standing in for the RFXtrx. ``port`` is the slave
+    side opened as a serial port, for the transport, and the packets are
+    written to the master side with ``write``.
+    """
+
+    def __init__(self):
+
+        self.master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(self.master, False)
+
+        self.port = Serial(os.ttyname(slave), 38400, timeout=0.1)
+        os.close(slave)
+
+        self._decoder = StreamDecoder()
+        self._running = True
+        self._responder = threading.Thread(
+            target=self._respond, name="rfxcom-bench-responder", daemon=True)
+        self._responder.start()
+
+    def write(self, data):
+        """Write a packet to the master side.
+
+        :return: False if the packet didn't fit in the buffer.
+        :rtype: boolean
+        """
+
+        try:
+            written = os.write(self.master, data)
+        except BlockingIOError:
+            return False
+
+        if written < len(data):
+            # Keep the stream framed, the transport must not see half a
+            # packet.
+            self._write_all(data[written:])
+
+        return True
+
+    def _write_all(self, data):
+
+        while data:
+            select.select([], [self.master], [], 1)
+            try:
+                data = data[os.write(self.master, data):]
+            except BlockingIOError:
+                pass
+
+    def _respond(self):
+        """Answer the status and mode requests written by the transport."""
+
+        while self._running:
+
+            readable, _, _ = select.select([self.master], [], [], 0.05)
+
+            if not readable:
+                continue
+
+            try:
+                data = os.read(self.master, 1024)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                return
+
+            self._decoder.feed(data)
+
+            for pkt in self._decoder:
+                if pkt[1] == 0x00 and len(pkt) > 4 and pkt[4] in (2, 3):
+                    self._write_all(status_response(pkt))
+
+    def close(self):
+
+        self._running = False
+        self._responder.join()
+        self.port.close()
+        os.close(self.master)
+
+
+class Recorder:
+    """Record when each numbered packet is written and its callback runs."""
+
+    def __init__(self, count):
+        self.written_at = [None] * count
+        self.received_at = [None] * count
+        self.received = 0
+        self.done = threading.Event()
+
+    def callback(self, reading):
+
+        now = time.perf_counter()
+
+        # The status response is also passed to the callback.
+        number = getattr(reading, 'current_watts', None)
+
+        if number is not None and self.received_at[number] is None:
+            self.received_at[number] = now
+            self.received += 1
+
+    def generate(self, device, rate):
+        """Write the packets to the device at ``rate`` packets per second."""
+
+        interval = 1.0 / rate
+        deadline = time.perf_counter()
+
+        for number in range(len(self.written_at)):
+
+            pkt = elec_packet(number)
+            delay = deadline - time.perf_counter()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            # Taken before writing, as the callback may run on another
+            # thread before the write returns.
+            written_at = time.perf_counter()
+
+            if device.write(pkt):
+                self.written_at[number] = written_at
+
+            deadline += interval
+
+        self.done.set()
+
+    @property
+    def written(self):
+        return sum(1 for written in self.written_at if written is not None)
+
+    def wait(self, timeout=DRAIN_TIMEOUT):
+        """Wait until the callbacks have run for every packet written, or
+        until ``timeout`` seconds after the last packet was written.
+        """
+
+        self.done.wait()
+        deadline = time.perf_counter() + timeout
+
+        while (self.received < self.written and
+               time.perf_counter() < deadline):
+            time.sleep(0.01)
+
+    def results(self):
+
+        latencies = sorted(
+            received - written
+            for written, received in zip(self.written_at, self.received_at)
+            if written is not None and received is not None)
+
+        written = self.written
+
+        results = {
+            'written': written,
+            'received': len(latencies),
+            'not_written': len(self.written_at) - written,
+            'lost': written - len(latencies),
+        }
+
+        results.update(percentiles(latencies))
+
+        return results
+
+
+def percentiles(latencies):
+    """Summarise sorted latencies in seconds as microseconds."""
+
+    if not latencies:
+        return {'p50_us': None, 'p99_us': None, 'max_us': None,
+                'mean_us': None}
+
+    def percentile(fraction):
+        index = min(len(latencies) - 1, int(round(fraction *
+                                                  (len(latencies) - 1))))
+        return latencies[index] * 1e6
+
+    return {
+        'p50_us': percentile(0.50),
+        'p99_us': percentile(0.99),
+        'max_us': latencies[-1] * 1e6,
+        'mean_us': sum(latencies) / len(latencies) * 1e6,
+    }
+
+
+def _run_asyncio(Transport, device, recorder, rate):
+
+    loop = asyncio.new_event_loop()
+
+    try:
+        transport = Transport(device.port, loop, callback=recorder.callback)
+        loop.run_until_complete(asyncio.wait_for(transport.ready, 10))
+
+        generator = threading.Thread(
+            target=recorder.generate, args=(device, rate), daemon=True)
+        generator.start()
+
+        loop.run_until_complete(loop.run_in_executor(None, recorder.wait))
+        generator.join()
+
+        close = getattr(transport, 'close', None)
+        if close is not None:
+            close()
+        else:
+            loop.remove_reader(device.port.fd)
+    finally:
+        loop.close()
+
+
+def _run_base(device, recorder, rate):
+
+    transport = BaseTransport(device.port, callback=recorder.callback)
+    running = True
+
+    def read():
+        while running:
+            transport.read()
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+
+    recorder.generate(device, rate)
+    recorder.wait()
+
+    running = False
+    reader.join()
+
+
+def _run_threaded(device, recorder, rate):
+
+    with ThreadedTransport(device.port, callback=recorder.callback):
+        recorder.generate(device, rate)
+        recorder.wait()
+
+
+def measure(transport, rate, packets):
+    """Run one transport at one rate.
+
+    :param transport: One of ``TRANSPORTS``.
+    :type transport: str
+
+    :param rate: The number of packets written per second.
+    :type rate: float
+
+    :param packets: The number of packets to write.
+    :type packets: int
+
+    :return: The latency percentiles and packet counts.
+    :rtype: dict
+    """
+
+    device = PseudoDevice()
+    recorder = Recorder(packets)
+
+    try:
+        if transport == 'asyncio':
+            _run_asyncio(AsyncioTransport, device, recorder, rate)
+        elif transport == 'nonblocking':
+            _run_asyncio(NonBlockingTransport, device, recorder, rate)
+        elif transport == 'base':
+            _run_base(device, recorder, rate)
+        elif transport == 'threaded':
+            _run_threaded(device, recorder, rate)
+        else:
+            raise ValueError("Unknown transport %r" % (transport, ))
+    finally:
+        device.close()
+
+    return recorder.results()
+
+
+def run(rates=(100, 1000), packets=1000, transports=TRANSPORTS):
+    """Run the benchmark for every transport at every rate.
+
+    :param rates: The rates, in packets per second, to write at.
+    :type rates: list
+
+    :param packets: The number of packets written for each run.
+    :type packets: int
+
+    :param transports: The names of the transports to benchmark.
+    :type transports: list
+
+    :return: The results, ready to be written as JSON.
+    :rtype: dict
+    """
+
+    results = {}
+
+    for transport in transports:
+        results[transport] = {}
+        for rate in rates:
+            results[transport]['%g/s' % rate] = measure(
+                transport, rate, packets)
+
+    return {
+        'benchmark': 'loopback',
+        'metric': 'p99_us',
+        'environment': environment(),
+        'settings': {
+            'rates': list(rates),
+            'packets': packets,
+        },
+        'results': results,
+    }
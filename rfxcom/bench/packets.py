@@ -0,0 +1,90 @@
+"""
+rfxcom.bench.packets
+====================
+
+"""
+
+import random
+
+#: The packet type used for the packets generated for handlers that accept
+#: any packet, it isn't used by the RFXtrx.
+UNKNOWN_TYPE = 0xFE
+
+#: The length, excluding the length byte, of the packets generated for
+#: handlers that accept any packet.
+UNKNOWN_LENGTH = 7
+
+#: The length byte the RFXtrx sends for each packet type. A handler's
+#: ``STRUCT`` doesn't always cover the whole packet, the interface responses
+#: are longer than the fields the Status handler reads for example, so the
+#: packets are generated with these lengths rather than the struct size.
+PACKET_LENGTHS = {
+    0x01: 0x0D,
+    0x11: 0x0B,
+    0x14: 0x0A,
+    0x50: 0x08,
+    0x51: 0x08,
+    0x52: 0x0A,
+    0x55: 0x0B,
+    0x56: 0x10,
+    0x57: 0x09,
+    0x5A: 0x11,
+}
+
+
+def generate_packets(Handler, count, seed=0, sensors=20):
+    """Generate packets which a packet handler can decode, as the RFXtrx
+    would send them. The packets cycle through the subtypes the handler
+    accepts, the sequence number increases with each packet, the sensor ID
+    is one of a small number of sensors and the rest of the data is random.
+
+    :param Handler: The packet handler class.
+
+    :param count: The number of packets to generate.
+    :type count: int
+
+    :param seed: The seed for the random data, so every run of a benchmark
+        uses the same packets.
+    :type seed: int
+
+    :param sensors: The number of sensor IDs the packets are spread over.
+    :type sensors: int
+
+    :return: The packets
+    :rtype: list
+    """
+
+    rng = random.Random("%s-%s" % (Handler.__name__, seed))
+
+    packet_types = sorted(Handler.PACKET_TYPES) or [UNKNOWN_TYPE]
+    subtypes = sorted(Handler.PACKET_SUBTYPES) or [0x00]
+    sensor_ids = [rng.randrange(0x10000) for _ in range(sensors)]
+
+    packets = []
+
+    for index in range(count):
+
+        packet_type = packet_types[index % len(packet_types)]
+
+        if packet_type in PACKET_LENGTHS:
+            size = PACKET_LENGTHS[packet_type] + 1
+        elif Handler.STRUCT is not None:
+            size = Handler.STRUCT.size
+        else:
+            size = UNKNOWN_LENGTH + 1
+
+        pkt = bytearray(rng.getrandbits(8) for _ in range(size))
+
+        pkt[0] = size - 1
+        pkt[1] = packet_type
+        pkt[2] = subtypes[index % len(subtypes)]
+        pkt[3] = index % 256
+
+        if size >= 6:
+            sensor_id = rng.choice(sensor_ids)
+            pkt[4] = sensor_id >> 8
+            pkt[5] = sensor_id & 0xFF
+
+        packets.append(pkt)
+
+    return packets
@@ -0,0 +1,100 @@
+"""
+rfxcom.bench.parsers
+====================
+
+Benchmark decoding the packets for every handler in
+:py:data:`rfxcom.protocol.HANDLERS`, both by calling the handler directly
+and by routing the packets through a transport. For each handler and way of
+decoding the results contain:
+
+- ``ns_per_packet`` and ``packets_per_second``, from the fastest of
+  ``repeat`` runs through the packets.
+- ``blocks_per_packet`` and ``bytes_per_packet``, the memory each decoded
+  packet keeps alive, measured with :py:mod:`tracemalloc`.
+"""
+
+from rfxcom.bench import allocations, environment, timed
+from rfxcom.bench.packets import generate_packets
+from rfxcom.protocol import HANDLERS
+from rfxcom.transport.base import BaseTransport
+
+
+def _noop(packet):
+    pass
+
+
+def benchmarks(Handler):
+    """Return the ways of decoding a packet with a handler, as a list of
+    names and the functions which take a single packet.
+    """
+
+    handler = Handler()
+
+    # The transports route a packet to the handler before decoding it, so
+    # the packets of the catch all handlers go to them last.
+    transport = BaseTransport(None, callback=_noop)
+    lazy_transport = BaseTransport(None, callback=_noop, lazy=True)
+
+    def get_callback_parser_lazy(pkt):
+        # Decode the view, as it would be when a callback reads a field.
+        _, view = lazy_transport.get_callback_parser(pkt)
+        view.reading
+        return view
+
+    return [
+        ('decode', handler.decode),
+        ('parse', handler.parse),
+        ('load', handler.load),
+        ('get_callback_parser', transport.get_callback_parser),
+        ('get_callback_parser_lazy', get_callback_parser_lazy),
+    ]
+
+
+def run(packets=1000, repeat=5, seed=0, handlers=None):
+    """Run the benchmarks.
+
+    :param packets: The number of packets generated for each handler.
+    :type packets: int
+
+    :param repeat: The number of times to time each benchmark, the fastest
+        time is kept.
+    :type repeat: int
+
+    :param seed: The seed for the generated packets.
+    :type seed: int
+
+    :param handlers: The names of the handlers to benchmark, or None for all
+        of the ``HANDLERS``.
+    :type handlers: list
+
+    :return: The results, ready to be written as JSON.
+    :rtype: dict
+    """
+
+    results = {}
+
+    for Handler in HANDLERS:
+
+        name = Handler.__name__
+
+        if handlers and name not in handlers:
+            continue
+
+        generated = generate_packets(Handler, packets, seed=seed)
+        results[name] = {}
+
+        for benchmark, function in benchmarks(Handler):
+            result = timed(function, generated, repeat=repeat)
+            result.update(allocations(function, generated))
+            results[name][benchmark] = result
+
+    return {
+        'benchmark': 'parsers',
+        'environment': environment(),
+        'settings': {
+            'packets': packets,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
@@ -42,3 +42,9 @@ class UnknownPacketSubtype(RFXComException):
     """This exception is raised when the packet subtype isn't recognised by
     the used packet handler class.
     """
+
+
+class PacketStreamClosed(RFXComException):
+    """This exception is raised when getting a packet from a packet stream
+    that has been closed and has no packets left.
+    """
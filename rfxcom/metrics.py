@@ -0,0 +1,364 @@
+"""
+rfxcom.metrics
+==============
+
+Every transport counts what it reads and times what it does with it in a
+:py:class:`TransportMetrics`, which is cheap enough to always be on. The
+metrics are available as a dict from ``transport.metrics_snapshot()`` and in
+the Prometheus text format, either written to a file for the node exporter's
+textfile collector or served over HTTP:
+
+.. code-block:: python
+
+    from rfxcom import metrics
+
+    server = metrics.serve(transport, port=9105)
+    # ...
+    server.shutdown()
+
+Anywhere a transport is accepted, a dict of transports by device name or a
+:py:class:`rfxcom.transport.manager.DeviceManager` can be used instead, and
+the metrics of each device are labelled with its name.
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from logging import getLogger
+
+#: The upper bounds, in seconds, of the buckets for the time taken to decode
+#: a packet.
+DECODE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.001, 0.01)
+
+#: The upper bounds, in seconds, of the buckets for the time taken by a
+#: callback.
+CALLBACK_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+#: The upper bounds, in seconds, of the buckets for the time from the first
+#: byte of a packet being read to the last.
+FRAME_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 1.0)
+
+#: The upper bounds, in seconds, of the buckets for the time from the last
+#: byte of a packet being read to the reading being dispatched.
+DISPATCH_BUCKETS = (0.00001, 0.00005, 0.0001, 0.001, 0.01, 0.1, 1.0)
+
+#: The content type of the Prometheus text format.
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+log = getLogger('rfxcom.metrics')
+
+
+class Histogram:
+    """Count values into buckets by their upper bounds, along with the
+    number and sum of all the values.
+
+    Without a lock the histogram must only be updated from one thread at a
+    time, as concurrent updates can be lost.
+
+    :param bounds: The upper bounds of the buckets, in increasing order. A
+        final bucket for everything larger is added.
+    :type bounds: tuple
+
+    :param lock: A :py:class:`threading.Lock` held while updating or reading
+        the histogram, for histograms updated from several threads.
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'lock')
+
+    def __init__(self, bounds, lock=None):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.lock = lock
+
+    def observe(self, value):
+
+        if self.lock is not None:
+            with self.lock:
+                self._observe(value)
+        else:
+            self._observe(value)
+
+    def _observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        """Return the count, sum and cumulative count of the values less
+        than or equal to each bound, as Prometheus expects.
+        """
+
+        if self.lock is not None:
+            with self.lock:
+                return self._as_dict()
+
+        return self._as_dict()
+
+    def _as_dict(self):
+
+        buckets = []
+        total = 0
+
+        for bound, count in zip(self.bounds + (float('inf'), ), self.counts):
+            total += count
+            buckets.append((bound, total))
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': buckets,
+        }
+
+
+class TransportMetrics:
+    """The counters and histograms kept by a transport. They aren't locked,
+    each is only updated by the thread that reads the device or decodes the
+    packets. The exception is ``callback_time`` in transports that run
+    callbacks on several threads, which give it a lock.
+
+    - ``bytes_read``: The number of bytes read from the device.
+    - ``packets``: The number of packets framed, by ``(packet_type,
+      packet_subtype)``.
+    - ``handler_not_found``: The number of packets that no handler could
+      decode.
+    - ``decode_time``: A :py:class:`Histogram` of the seconds taken to
+      decode each packet.
+    - ``callback_time``: A :py:class:`Histogram` of the seconds taken by
+      each callback that the transport runs itself.
+    - ``frame_time``: A :py:class:`Histogram` of the seconds from the first
+      byte of each packet being read to the last.
+    - ``dispatch_latency``: A :py:class:`Histogram` of the seconds from the
+      last byte of each packet being read to the reading being dispatched to
+      its callback, which includes decoding it and any time it was queued.
+    """
+
+    __slots__ = ('bytes_read', 'packets', 'handler_not_found', 'decode_time',
+                 'callback_time', 'frame_time', 'dispatch_latency')
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.packets = {}
+        self.handler_not_found = 0
+        self.decode_time = Histogram(DECODE_BUCKETS)
+        self.callback_time = Histogram(CALLBACK_BUCKETS)
+        self.frame_time = Histogram(FRAME_BUCKETS)
+        self.dispatch_latency = Histogram(DISPATCH_BUCKETS)
+
+    def count_packet(self, pkt):
+
+        key = (pkt[1], pkt[2]) if len(pkt) > 2 else (None, None)
+
+        try:
+            self.packets[key] += 1
+        except KeyError:
+            self.packets[key] = 1
+
+    def snapshot(self, **gauges):
+        """Return the metrics as a dict, along with any values the transport
+        keeps elsewhere passed as keyword arguments.
+        """
+
+        packets = dict(self.packets)
+
+        snapshot = {
+            'bytes_read': self.bytes_read,
+            'packets': packets,
+            'packets_total': sum(packets.values()),
+            'handler_not_found': self.handler_not_found,
+            'decode_time': self.decode_time.as_dict(),
+            'callback_time': self.callback_time.as_dict(),
+            'frame_time': self.frame_time.as_dict(),
+            'dispatch_latency': self.dispatch_latency.as_dict(),
+        }
+
+        snapshot.update(gauges)
+
+        return snapshot
+
+
+def _labelled(source):
+    """Return ``(device, transport)`` pairs for a transport, a dict of
+    transports or a DeviceManager.
+    """
+
+    if hasattr(source, 'metrics_snapshot'):
+        return [(None, source)]
+
+    transports = getattr(source, 'transports', source)
+
+    return sorted(transports.items())
+
+
+def _escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _labels(labels):
+
+    if not labels:
+        return ''
+
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value))
+                             for name, value in labels)
+
+
+def _hex(value):
+    return 'none' if value is None else '0x%02X' % value
+
+
+def _bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+# The counters and gauges in a snapshot, their Prometheus names, types and
+# help text.
+_SIMPLE = (
+    ('bytes_read', 'rfxcom_bytes_read_total', 'counter',
+     "Bytes read from the RFXtrx."),
+    ('framing_errors', 'rfxcom_framing_errors_total', 'counter',
+     "Bytes skipped between packets because they can't start one."),
+    ('handler_not_found', 'rfxcom_handler_not_found_total', 'counter',
+     "Packets that no packet handler could decode."),
+    ('queue_depth', 'rfxcom_queue_depth', 'gauge',
+     "Packets waiting to be passed to a callback or consumer."),
+)
+
+_HISTOGRAMS = (
+    ('decode_time', 'rfxcom_decode_seconds',
+     "Seconds taken to decode a packet."),
+    ('callback_time', 'rfxcom_callback_seconds',
+     "Seconds taken by a callback run by the transport."),
+    ('frame_time', 'rfxcom_frame_seconds',
+     "Seconds from the first byte of a packet being read to the last."),
+    ('dispatch_latency', 'rfxcom_dispatch_latency_seconds',
+     "Seconds from a packet being read to it being dispatched."),
+)
+
+
+def prometheus(source):
+    """Format the metrics of one or more transports in the Prometheus text
+    exposition format.
+
+    :param source: A transport, a dict of transports by device name or a
+        :py:class:`rfxcom.transport.manager.DeviceManager`.
+
+    :return: The metrics
+    :rtype: str
+    """
+
+    snapshots = [((('device', device), ) if device is not None else (),
+                  transport.metrics_snapshot())
+                 for device, transport in _labelled(source)]
+
+    lines = []
+
+    for key, name, type_, help_ in _SIMPLE:
+
+        lines.append("# HELP %s %s" % (name, help_))
+        lines.append("# TYPE %s %s" % (name, type_))
+
+        for labels, snapshot in snapshots:
+            if key in snapshot:
+                lines.append("%s%s %s" % (name, _labels(labels),
+                                          snapshot[key]))
+
+    lines.append("# HELP rfxcom_packets_total Packets read from the RFXtrx.")
+    lines.append("# TYPE rfxcom_packets_total counter")
+
+    for labels, snapshot in snapshots:
+        for (packet_type, subtype), count in sorted(
+                snapshot['packets'].items(), key=lambda item: str(item[0])):
+            lines.append("rfxcom_packets_total%s %s" % (_labels(
+                labels + (('packet_type', _hex(packet_type)),
+                          ('packet_subtype', _hex(subtype)))), count))
+
+    for key, name, help_ in _HISTOGRAMS:
+
+        lines.append("# HELP %s %s" % (name, help_))
+        lines.append("# TYPE %s histogram" % name)
+
+        for labels, snapshot in snapshots:
+
+            histogram = snapshot[key]
+
+            for bound, count in histogram['buckets']:
+                lines.append("%s_bucket%s %s" % (
+                    name, _labels(labels + (('le', _bound(bound)), )), count))
+
+            lines.append("%s_sum%s %r" % (name, _labels(labels),
+                                          histogram['sum']))
+            lines.append("%s_count%s %s" % (name, _labels(labels),
+                                            histogram['count']))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, source):
+    """Write the metrics to a file in the Prometheus text format. The file
+    is replaced atomically, so a collector never reads half of it.
+
+    :param path: The path of the file.
+    :type path: str
+
+    :param source: A transport, a dict of transports by device name or a
+        :py:class:`rfxcom.transport.manager.DeviceManager`.
+    """
+
+    tmp = path + '.tmp'
+
+    with open(tmp, 'w') as f:
+        f.write(prometheus(source))
+
+    os.replace(tmp, path)
+
+
+def serve(source, port=9105, host='127.0.0.1'):
+    """Serve the metrics in the Prometheus text format from a small HTTP
+    server in a daemon thread. Stop it with ``shutdown``.
+
+    :param source: A transport, a dict of transports by device name or a
+        :py:class:`rfxcom.transport.manager.DeviceManager`.
+
+    :param port: The port to listen on, 0 picks a free port.
+    :type port: int
+
+    :param host: The address to listen on, only the local host by default.
+    :type host: str
+
+    :return: The server, its address is in ``server_address``.
+    :rtype: http.server.HTTPServer
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+
+            body = prometheus(source).encode('utf-8')
+
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format_, *args):
+            log.debug(format_ % args)
+
+    server = HTTPServer((host, port), MetricsHandler)
+
+    thread = threading.Thread(target=server.serve_forever,
+                              name="rfxcom-metrics", daemon=True)
+    thread.start()
+
+    log.info("Serving metrics on http://%s:%s/metrics" % (
+             server.server_address[0], server.server_address[1]))
+
+    return server
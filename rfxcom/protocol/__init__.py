@@ -11,6 +11,7 @@ from .lighting2 import Lighting2
 from .lighting5 import Lighting5
 from .rain import Rain
 from .status import Status
+from .stream import iter_frames
 from .temperature import Temperature
 from .temphumidity import TempHumidity
 from .ultraviolet import UltraViolet
@@ -29,6 +30,12 @@ STATUS_PACKET = b'\x0D\x00\x00\x01\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00'
 #: these or the RFXmngr application can be used to configure the device.
 MODE_PACKET = b'\x0D\x00\x00\x01\x03\x53\x00\x00\x0E\x2F\x00\x00\x00\x00'
 
+#: The packet types the RFXtrx responds to commands with: interface
+#: responses, such as the status, and receiver/transmitter messages, such as
+#: the acknowledgement of a transmitted packet. A response has the same
+#: sequence number as the command.
+RESPONSE_TYPES = frozenset([0x01, 0x02])
+
 #: A list containing all the packet types supported in python-rfxcom. The
 #: last one is a raw packet and will be used for any unrecognised devices.
 HANDLERS = [
@@ -44,3 +51,77 @@ HANDLERS = [
     Wind,
     Packet,  # At the end as we should try it last.
 ]
+
+
+def _build_routes():
+    """Index a shared instance of each of the ``HANDLERS`` by every
+    ``(packet_type, packet_subtype)`` pair it declares.
+    """
+
+    routes = {}
+
+    for PacketHandler in HANDLERS:
+        handler = PacketHandler()
+        for packet_type in handler.PACKET_TYPES:
+            for packet_subtype in handler.PACKET_SUBTYPES:
+                routes.setdefault((packet_type, packet_subtype), handler)
+
+    return routes
+
+
+_ROUTES = _build_routes()
+_FALLBACK = Packet()
+
+
+def decode_many(buffer_, grouped=False):
+    """Decode every packet in a buffer of concatenated packets, such as a
+    capture of the bytes read from the RFXtrx. Each packet is routed to the
+    matching handler in ``HANDLERS`` and decoded from a memoryview slice of
+    the buffer, so no intermediate bytearray is created per packet. Packets
+    no handler understands are decoded by :py:class:`Packet`.
+
+    The readings reference the buffer, so a bytearray buffer can't be
+    resized while they are alive.
+
+    :param buffer_: The packets, each starting with its length byte.
+    :type buffer_: bytes, bytearray or memoryview
+
+    :param grouped: Return the readings grouped by packet handler class
+        rather than as a generator.
+    :type grouped: bool
+
+    :raises: :py:class:`rfxcom.exceptions.InvalidPacketLength`: If the
+        buffer ends with an incomplete packet.
+
+    :return: A generator of :py:class:`rfxcom.protocol.base.Reading`, or
+        a dict mapping the handler classes to lists of them.
+    """
+
+    readings = _decode_many(buffer_)
+
+    if not grouped:
+        return readings
+
+    groups = {}
+
+    for reading in readings:
+        groups.setdefault(reading.handler.__class__, []).append(reading)
+
+    return groups
+
+
+def _decode_many(buffer_):
+
+    get_handler = _ROUTES.get
+
+    for frame in iter_frames(buffer_):
+
+        handler = None
+
+        if len(frame) > 2:
+            handler = get_handler((frame[1], frame[2]))
+
+        if handler is None or not handler.can_handle(frame):
+            handler = _FALLBACK
+
+        yield handler.decode(frame)
@@ -7,28 +7,276 @@ Handlers.
 
 """
 
-from datetime import datetime
+from binascii import hexlify
 from logging import getLogger
 
 from rfxcom.exceptions import (InvalidPacketLength, MalformedPacket,
-                               UnknownPacketType, UnknownPacketSubtype,
-                               RFXComException)
+                               UnknownPacketType, UnknownPacketSubtype)
+from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from rfxcom.timing import monotonic_ns, wall_clock
+
+#: The statuses returned by :py:meth:`BasePacketHandler.check_packet`.
+VALID = 0
+INVALID_LENGTH = 1
+MALFORMED = 2
+UNKNOWN_TYPE = 3
+UNKNOWN_SUBTYPE = 4
+SHORT_FOR_LAYOUT = 5
+
+
+class Reading:
+    """A Reading is the result of decoding a single packet with
+    :py:meth:`BasePacket.decode`. It holds everything that ``load`` would
+    otherwise store on the packet handler, which leaves the handler free to
+    be shared between packets, threads and transports.
+
+    Packet handlers define a subclass which adds the fields they decode to
+    ``__slots__`` and lists them in ``FIELDS``, so the fields are plain
+    attributes and no dictionary is built unless ``as_dict`` or ``data`` is
+    used. Readings from handlers that only implement ``parse`` hold the
+    parsed dictionary instead.
+
+    The time the reading was created is kept in ``loaded_ns``, from
+    :py:func:`rfxcom.timing.monotonic_ns`, and only converted to a
+    ``datetime`` when ``loaded_at`` is accessed. Readings decoded by a
+    transport also have the :py:class:`rfxcom.timing.Timings` of the packet
+    in ``timings``, otherwise it is None.
+
+    :param handler: The packet handler that decoded the packet.
+    :param raw: The raw untouched bytearray as recieved by the RFXtrx
+    """
+
+    __slots__ = ('handler', 'raw', 'loaded_ns', 'timings', '_data')
+
+    #: The names of the fields returned by ``as_dict``, in order.
+    FIELDS = ()
+
+    #: The fields which are left out of ``as_dict`` when they are None,
+    #: because the sensor subtype doesn't provide them.
+    OPTIONAL_FIELDS = frozenset()
+
+    def __init__(self, handler, raw):
+        self.handler = handler
+        self.raw = raw
+        self.loaded_ns = monotonic_ns()
+        self.timings = None
+        self._data = None
+
+    @property
+    def loaded_at(self):
+        """The UTC time the reading was created, as a naive ``datetime``."""
+        return wall_clock(self.loaded_ns)
+
+    @property
+    def data(self):
+        """The parsed data represented in a dictionary, as returned by the
+        handler's ``parse`` method. It is built on first access.
+        """
+        if self._data is None:
+            self._data = self.as_dict()
+        return self._data
+
+    def as_dict(self):
+        """Return the fields of the reading in a new dictionary.
+
+        :return: Data dictionary containing the parsed values
+        :rtype: dict
+        """
+
+        if self._data is not None:
+            return dict(self._data)
+
+        result = {}
+        optional = self.OPTIONAL_FIELDS
+
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is None and name in optional:
+                continue
+            result[name] = value
+
+        return result
+
+    def __str__(self):
+        return "<{0} ID:{1}>".format(
+            self.handler.__class__.__name__, self.data.get('id'))
+
+    def __repr__(self):
+        return str(self)
+
+
+class HeaderReading(Reading):
+    """A Reading with the RFX common header part of the packet, which is
+    shared by all of the packet handlers for sensors and devices.
+    """
+
+    __slots__ = ('packet_length', 'packet_type', 'packet_subtype',
+                 'sequence_number')
+
+    FIELDS = ('packet_length', 'packet_type', 'packet_type_name',
+              'packet_subtype', 'packet_subtype_name', 'sequence_number')
+
+    @property
+    def packet_type_name(self):
+        return self.handler.PACKET_TYPES.get(self.packet_type)
+
+    @property
+    def packet_subtype_name(self):
+        return self.handler.PACKET_SUBTYPES.get(self.packet_subtype)
+
+
+class SensorReading(HeaderReading):
+    """A Reading for the packets sent by sensors and devices, which are
+    identified by an ID following the header. The ID is kept as an integer in
+    ``sensor_id``, which is cheap to hash and compare, and is only formatted
+    as a hex string when ``id`` is accessed. The hex strings are cached, so
+    every reading from a sensor shares the same string.
+    """
+
+    __slots__ = ('sensor_id',)
+
+    FIELDS = HeaderReading.FIELDS + ('id',)
+
+    #: The number of bytes the ID occupies in the packet.
+    ID_SIZE = 2
+
+    @property
+    def id(self):
+        return RfxPacketUtils.format_id(self.sensor_id, self.ID_SIZE)
+
+
+class PacketView:
+    """A PacketView wraps a raw packet and decodes it on demand. The header
+    fields are read straight from the raw bytes. The first access to any
+    other field decodes the whole packet with the packet handler, and the
+    view then reads every field from that :py:class:`Reading`. The view only
+    saves time when a callback looks at nothing but the header of most
+    packets, reading a field of every packet is slower than decoding them
+    eagerly.
+
+    A view is created with :py:meth:`BasePacket.view` and supports the same
+    fields as the :py:class:`Reading` the handler would return from
+    ``decode``. The eager ``as_dict`` and ``data`` are still available for
+    callers that want every field.
+
+    :param handler: The packet handler that decodes the packet.
+    :param raw: The raw untouched bytearray, or a memoryview of it, as
+        recieved by the RFXtrx
+    """
+
+    __slots__ = ('handler', 'raw', 'loaded_ns', 'timings', '_reading')
+
+    def __init__(self, handler, raw):
+        self.handler = handler
+        self.raw = raw
+        self.loaded_ns = monotonic_ns()
+        self.timings = None
+        self._reading = None
+
+    @property
+    def packet_length(self):
+        return self.raw[0]
+
+    @property
+    def packet_type(self):
+        return self.raw[1]
+
+    @property
+    def packet_subtype(self):
+        return self.raw[2]
+
+    @property
+    def sequence_number(self):
+        return self.raw[3]
+
+    @property
+    def decoded(self):
+        """True once the packet has been decoded."""
+        return self._reading is not None
+
+    @property
+    def reading(self):
+        """The :py:class:`Reading` decoded from the raw packet. The packet is
+        decoded on first access.
+        """
+        if self._reading is None:
+            self._reading = self.handler.decode(self.raw)
+            self._reading.timings = self.timings
+        return self._reading
+
+    @property
+    def loaded_at(self):
+        """The UTC time the view was created, the packet isn't decoded."""
+        return wall_clock(self.loaded_ns)
+
+    @property
+    def data(self):
+        return self.reading.data
+
+    def as_dict(self):
+        """Decode every field of the packet and return them in a new
+        dictionary.
+
+        :return: Data dictionary containing the parsed values
+        :rtype: dict
+        """
+        return self.reading.as_dict()
+
+    def __getattr__(self, name):
+
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return getattr(self.reading, name)
+
+    def __str__(self):
+        return "<{0} ID:{1}>".format(
+            self.handler.__class__.__name__, getattr(self, 'id', None))
+
+    def __repr__(self):
+        return str(self)
 
 
 class BasePacket:
     """The BasePacket class defines a packet that can be sent or received by
     the rfxtrx. It provides a number of simple helper methods and outlines the
     base API.
+
+    The packet types and subtypes understood by the class are defined at the
+    class level in ``PACKET_TYPES`` and ``PACKET_SUBTYPES``. Apart from the
+    deprecated ``load`` method, instances hold no per packet state, so a
+    single instance can be used to ``decode`` any number of packets.
     """
 
+    #: A mapping of the packet types understood by this class to their name.
+    #: An empty mapping means every packet type is accepted.
+    PACKET_TYPES = {}
+
+    #: A mapping of the packet subtypes understood by this class to their
+    #: name. An empty mapping means every packet subtype is accepted.
+    PACKET_SUBTYPES = {}
+
+    #: A precompiled :py:class:`struct.Struct` describing the layout of the
+    #: whole packet, used by subclasses to decode all of the fields with a
+    #: single ``unpack_from`` call.
+    STRUCT = None
+
     def __init__(self):
         """The BasePacket class is initialised with no arguments. It simply
-        sets up a number of instance attributes when its created.
+        sets up the logger when its created.
         """
 
         self.log = getLogger('rfxcom.protocol.%s' % self.__class__.__name__)
-        self.PACKET_TYPES = {}
-        self.PACKET_SUBTYPES = {}
+
+    def __reduce__(self):
+        # Handlers are stateless, so they are pickled by class. This lets a
+        # Reading be sent to another process along with its handler.
+        return (self.__class__, ())
+
+    @property
+    def loaded_at(self):
+        """The UTC time the last packet was loaded with ``load``."""
+        return wall_clock(self.loaded_ns)
 
     def dump_hex(self, data):
         """Given some bytes return the hex representation.
@@ -39,7 +287,7 @@ class BasePacket:
         :return: The formatted bytes as a readable hex string.
         :rtype: string
         """
-        return "0x%s" % (''.join('{:02x}'.format(x) for x in data)).upper()
+        return "0x" + hexlify(data).decode('ascii').upper()
 
     def parse(self, data):
         """Stub method to be implemented by subclasses. The parse method
@@ -70,10 +318,8 @@ class BasePacket:
         :type data: bytearray
 
         """
-        packet_length = data[0]
-        packet_type = data[1]
-        packet_subtype = data[2]
-        sequence_number = data[3]
+        packet_length, packet_type, packet_subtype, sequence_number = \
+            RfxPacketUtils.HEADER.unpack_from(data)
         return {
             'packet_length': packet_length,
             'packet_type': packet_type,
@@ -83,9 +329,44 @@ class BasePacket:
             'sequence_number': sequence_number
         }
 
+    def decode(self, data):
+        """Parse the data and return it wrapped in a :py:class:`Reading`
+        along with the raw data and the time it was decoded. Unlike ``load``
+        this doesn't modify the packet handler, so it is safe to call on a
+        shared instance.
+
+        Subclasses override this method to decode straight into their own
+        :py:class:`Reading` subclass and implement ``parse`` with it. By
+        default the dictionary returned by ``parse`` is wrapped.
+
+        :param data: The raw untouched bytearray as recieved by the RFXtrx
+        :type data: bytearray
+
+        :return: The decoded packet
+        :rtype: Reading
+        """
+        reading = Reading(self, data)
+        reading._data = self.parse(data)
+        return reading
+
+    def view(self, data):
+        """Wrap the data in a :py:class:`PacketView` which decodes the fields
+        of the packet when they are first accessed. The packet isn't validated
+        until a field other than the header is accessed, so this should only
+        be used for packets that ``can_handle`` has accepted.
+
+        :param data: The raw untouched bytearray as recieved by the RFXtrx
+        :type data: bytearray
+
+        :return: A lazy view of the packet
+        :rtype: PacketView
+        """
+        return PacketView(self, data)
+
     def load(self, data):
         """This is the entrance method for all data which is used to store the
-        raw data and start parsing the data.
+        raw data and start parsing the data. The results are stored on the
+        packet handler, use ``decode`` to share a handler between packets.
 
         :param data: The raw untouched bytearray as recieved by the RFXtrx
         :type data: bytearray
@@ -93,9 +374,10 @@ class BasePacket:
         :return: The parsed data represented in a dictionary
         :rtype: dict
         """
-        self.loaded_at = datetime.utcnow()
+        reading = self.decode(data)
+        self.loaded_ns = reading.loaded_ns
         self.raw = data
-        self.data = self.parse(data)
+        self.data = reading.data
         return self.data
 
 
@@ -103,9 +385,9 @@ class BasePacketHandler(BasePacket):
 
     def can_handle(self, data):
         """Determine if the packet handler understand and can parse this
-        packet. This is defined by the checks in the ``validate_packet``
-        method but can_handle provides a neat interface to ignore errors and
-        see if the packet is good.
+        packet. This is defined by the checks in the ``check_packet`` method
+        but can_handle provides a neat interface to see if the packet is good
+        without building an error.
 
         :param data: bytearray to be verified
         :type data: bytearray
@@ -114,86 +396,156 @@ class BasePacketHandler(BasePacket):
         :rtype: boolean
         """
 
-        try:
-            return self.validate_packet(data)
-        except RFXComException:
-            return False
+        return self.check_packet(data) == VALID
 
-    def validate_packet(self, data):
-        """Validate a packet against this packet handler and determine if it
+    def check_packet(self, data):
+        """Check a packet against this packet handler and determine if it
         meets the requirements. This is done by checking the following
         conditions are true.
 
         - The length of the packet is equal to the first byte.
         - The second byte is in the set of defined PACKET_TYPES for this class.
         - The third byte is in the set of this class defined PACKET_SUBTYPES.
+        - The packet is long enough for the class defined STRUCT.
 
-        If one or more of these conditions isn't met then we have a packet that
-        isn't valid or at least isn't understood by this handler.
+        Unlike ``validate_packet`` no exception or message is created for
+        a packet that isn't understood by this handler, which makes this
+        cheap enough to probe every handler with. Use ``packet_error`` to
+        create the error for a status.
 
         :param data: bytearray to be verified
         :type data: bytearray
 
-
-        :raises: :py:class:`rfxcom.exceptions.InvalidPacketLength`: If the
-            number of bytes in the packet doesn't match the expected length.
-
-        :raises: :py:class:`rfxcom.exceptions.UnknownPacketType`: If the packet
-            type is unknown to this packet handler
-
-        :raises: :py:class:`rfxcom.exceptions.UnknownPacketSubtype`: If the
-            packet sub type is unknown to this packet handler
-
-        :return: true is returned if validation passes.
-        :rtype: boolean
-
+        :return: ``VALID`` if the checks pass, otherwise one of
+            ``INVALID_LENGTH``, ``MALFORMED``, ``UNKNOWN_TYPE``,
+            ``UNKNOWN_SUBTYPE`` or ``SHORT_FOR_LAYOUT``.
+        :rtype: int
         """
 
         # Validate length.
         # The first byte in the packet should be equal to the number of
         # remaining bytes (i.e. length excluding the first byte).
+        if not data:
+            return INVALID_LENGTH
+
         expected_length = data[0] + 1
 
         if len(data) != expected_length:
-            raise InvalidPacketLength(
-                "Expected packet length to be %s bytes but it was %s bytes"
-                % (expected_length, len(data))
-            )
+            return INVALID_LENGTH
 
         # Validate minimal length.
         # The packet contains at least the RFX header:
         #  packet_length (1 byte) + packet_type (1 byte)
         #  + packet_subtype (1 byte) + sequence_number (1 byte)
         if expected_length < 4:
-            raise MalformedPacket(
-                    "Expected packet length to be larger than 4 bytes but \
-                    it was %s bytes"
-                    % (len(data))
-            )
+            return MALFORMED
 
         # Validate Packet Type.
         # This specifies the family of devices.
         # Check it is one of the supported packet types
-        packet_type = data[1]
-
-        if self.PACKET_TYPES and packet_type not in self.PACKET_TYPES:
-            types = ",".join("0x{:02x}".format(pt) for pt in self.PACKET_TYPES)
-            raise UnknownPacketType(
-                "Expected packet type to be one of [%s] but recieved %s"
-                % (types, packet_type)
-            )
+        if self.PACKET_TYPES and data[1] not in self.PACKET_TYPES:
+            return UNKNOWN_TYPE
 
         # Validate Packet Subtype.
         # This specifies the sub-family of devices.
         # Check it is one of the supported packet subtypes for current type
-        sub_type = data[2]
+        if self.PACKET_SUBTYPES and data[2] not in self.PACKET_SUBTYPES:
+            return UNKNOWN_SUBTYPE
+
+        # Validate the length against the packet layout.
+        # This ensures all of the fields can be unpacked.
+        if self.STRUCT is not None and expected_length < self.STRUCT.size:
+            return SHORT_FOR_LAYOUT
+
+        return VALID
 
-        if self.PACKET_SUBTYPES and sub_type not in self.PACKET_SUBTYPES:
+    def packet_error(self, status, data):
+        """Create the exception describing why a packet failed
+        ``check_packet``.
+
+        :param status: The status returned by ``check_packet``.
+        :type status: int
+
+        :param data: The bytearray that was checked.
+        :type data: bytearray
+
+        :return: The exception to be raised, or None if the status is
+            ``VALID``.
+        :rtype: :py:class:`rfxcom.exceptions.RFXComException`
+        """
+
+        if status == VALID:
+            return None
+
+        if status == INVALID_LENGTH:
+            if not data:
+                return InvalidPacketLength(
+                    "Expected a packet but recieved 0 bytes")
+            return InvalidPacketLength(
+                "Expected packet length to be %s bytes but it was %s bytes"
+                % (data[0] + 1, len(data))
+            )
+
+        if status == MALFORMED:
+            return MalformedPacket(
+                    "Expected packet length to be larger than 4 bytes but \
+                    it was %s bytes"
+                    % (len(data))
+            )
+
+        if status == UNKNOWN_TYPE:
+            types = ",".join("0x{:02x}".format(pt) for pt in self.PACKET_TYPES)
+            return UnknownPacketType(
+                "Expected packet type to be one of [%s] but recieved %s"
+                % (types, data[1])
+            )
+
+        if status == UNKNOWN_SUBTYPE:
             types = \
                 ",".join("0x{:02x}".format(pt) for pt in self.PACKET_SUBTYPES)
-            raise UnknownPacketSubtype(
+            return UnknownPacketSubtype(
                 "Expected packet type to be one of [%s] but recieved %s"
-                % (types, sub_type))
+                % (types, data[2]))
+
+        if status == SHORT_FOR_LAYOUT:
+            return InvalidPacketLength(
+                "Expected packet length to be at least %s bytes but it was "
+                "%s bytes" % (self.STRUCT.size, data[0] + 1)
+            )
+
+        raise ValueError("Unknown packet status %r" % (status, ))
+
+    def validate_packet(self, data):
+        """Validate a packet against this packet handler and determine if it
+        meets the requirements checked by ``check_packet``. If one or more of
+        these conditions isn't met then we have a packet that isn't valid or
+        at least isn't understood by this handler.
+
+        :param data: bytearray to be verified
+        :type data: bytearray
+
+
+        :raises: :py:class:`rfxcom.exceptions.InvalidPacketLength`: If the
+            number of bytes in the packet doesn't match the expected length.
+
+        :raises: :py:class:`rfxcom.exceptions.MalformedPacket`: If the packet
+            is too short to contain the RFX header.
+
+        :raises: :py:class:`rfxcom.exceptions.UnknownPacketType`: If the packet
+            type is unknown to this packet handler
+
+        :raises: :py:class:`rfxcom.exceptions.UnknownPacketSubtype`: If the
+            packet sub type is unknown to this packet handler
+
+        :return: true is returned if validation passes.
+        :rtype: boolean
+
+        """
+
+        status = self.check_packet(data)
+
+        if status != VALID:
+            raise self.packet_error(status, data)
 
         return True
 
@@ -202,6 +554,18 @@ class BasePacketHandler(BasePacket):
             self.__class__.__name__, self.data.get('id'))
 
 
+class PacketReading(Reading):
+    """The Reading for any packet decoded by :py:class:`Packet`."""
+
+    __slots__ = ('packet_length', 'packet_type', 'packet_subtype')
+
+    FIELDS = ('packet_length', 'packet_type', 'packet_subtype', 'packet')
+
+    @property
+    def packet(self):
+        return self.raw
+
+
 class Packet(BasePacket):
     """The Packet class is a base class that can be used for all data packets.
     It is a dumb class that accepts any data and doesn't validate it. However,
@@ -212,15 +576,15 @@ class Packet(BasePacket):
     def can_handle(self, data):
         return True
 
-    def parse(self, data):
+    def decode(self, data):
 
-        packet_length = data[0]
-        packet_type = data[1]
-        sub_type = data[2]
+        reading = PacketReading(self, data)
+        reading.packet_length = data[0]
+        reading.packet_type = data[1]
+        reading.packet_subtype = data[2]
 
-        return {
-            'packet_length': packet_length,
-            'packet_type': packet_type,
-            'packet_subtype': sub_type,
-            'packet': data,
-        }
+        return reading
+
+    def parse(self, data):
+
+        return self.decode(data).as_dict()
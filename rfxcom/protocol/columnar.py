@@ -0,0 +1,235 @@
+"""
+Columnar Decoding
+=================
+
+Decodes large batches of fixed layout sensor packets into columns, using
+NumPy when it is installed.
+
+"""
+
+from rfxcom.exceptions import InvalidPacketLength
+from rfxcom.protocol.humidity import Humidity
+from rfxcom.protocol.temperature import Temperature
+from rfxcom.protocol.temphumidity import TempHumidity
+from rfxcom.protocol.ultraviolet import UltraViolet
+from rfxcom.protocol.wind import Wind
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+#: The handlers that have a fixed length and fixed field offsets, and can
+#: therefore be decoded a column at a time.
+COLUMNAR_HANDLERS = [
+    Temperature,
+    Humidity,
+    TempHumidity,
+    UltraViolet,
+    Wind,
+]
+
+#: The columns decoded for every packet type.
+COMMON_COLUMNS = [
+    'packet_subtype',
+    'sequence_number',
+    'id',
+    'signal_level',
+    'battery_level',
+]
+
+#: The sensor specific columns decoded for each handler. Values a subtype
+#: doesn't provide, for example the temperature of most UV sensors, are NaN.
+COLUMNS = {
+    Temperature: ['temperature'],
+    Humidity: ['humidity', 'humidity_status'],
+    TempHumidity: ['channel', 'temperature', 'humidity', 'humidity_status'],
+    UltraViolet: ['uv', 'temperature'],
+    Wind: ['direction', 'av_speed', 'wind_gust', 'temperature',
+           'wind_chill'],
+}
+
+_HUMIDITY_STATUS = ['Dry', 'Comfort', 'Normal', 'Wet', '--??--']
+
+_HANDLERS = dict(
+    (packet_type, Handler())
+    for Handler in COLUMNAR_HANDLERS
+    for packet_type in Handler.PACKET_TYPES
+)
+
+
+def _packet_offsets(view):
+    """Find the offset of every packet in the buffer that has the length one
+    of the columnar handlers expects, grouped by packet type.
+    """
+
+    lengths = dict((packet_type, handler.STRUCT.size - 1)
+                   for packet_type, handler in _HANDLERS.items())
+
+    offsets = dict((packet_type, []) for packet_type in _HANDLERS)
+    offset = 0
+    size = len(view)
+
+    while offset < size:
+
+        length = view[offset]
+
+        # Skip any zero length bytes.
+        if length == 0:
+            offset += 1
+            continue
+
+        end = offset + length + 1
+
+        if end > size:
+            raise InvalidPacketLength(
+                "Expected packet length to be %s bytes but only %s bytes "
+                "remain" % (length + 1, size - offset)
+            )
+
+        packet_type = view[offset + 1]
+
+        if lengths.get(packet_type) == length:
+            offsets[packet_type].append(offset)
+
+        offset = end
+
+    return offsets
+
+
+def decode_columns(buffer_, use_numpy=None):
+    """Decode the Temperature, Humidity, TempHumidity, UltraViolet and Wind
+    packets in a buffer of concatenated packets into columns. Other packets,
+    and packets with an unknown subtype or the wrong length, are skipped.
+
+    With NumPy each handler's packets are gathered into a 2-D byte matrix and
+    every field is decoded for all of them at once. Without it the packets
+    are decoded one at a time by the packet handlers and the columns are
+    lists.
+
+    .. code-block:: python
+
+        columns = decode_columns(capture)
+        temperatures = columns[TempHumidity]['temperature']
+
+    :param buffer_: The packets, each starting with its length byte.
+    :type buffer_: bytes, bytearray or memoryview
+
+    :param use_numpy: Force or disable the use of NumPy. By default it is
+        used when it is installed.
+    :type use_numpy: bool
+
+    :raises: :py:class:`rfxcom.exceptions.InvalidPacketLength`: If the
+        buffer ends with an incomplete packet.
+
+    :return: A dict mapping each handler class to a dict of column names and
+        their values. The columns are listed in ``COMMON_COLUMNS`` and
+        ``COLUMNS``.
+    :rtype: dict
+    """
+
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError("NumPy is required to decode with use_numpy=True")
+
+    view = memoryview(buffer_).cast('B')
+    offsets = _packet_offsets(view)
+
+    if use_numpy:
+        data = numpy.frombuffer(view, dtype=numpy.uint8)
+        decode = _decode_numpy
+    else:
+        data = view
+        decode = _decode_python
+
+    columns = {}
+
+    for packet_type, handler in _HANDLERS.items():
+        columns[handler.__class__] = decode(handler, data,
+                                            offsets[packet_type])
+
+    return columns
+
+
+def _decode_python(handler, view, offsets):
+
+    names = COMMON_COLUMNS + COLUMNS[handler.__class__]
+    columns = dict((name, []) for name in names)
+    length = handler.STRUCT.size
+
+    for offset in offsets:
+
+        pkt = view[offset:offset + length]
+
+        if not handler.can_handle(pkt):
+            continue
+
+        data = handler.parse(pkt)
+        data['id'] = int(data['id'], 16)
+
+        for name in names:
+            columns[name].append(data.get(name, float('nan')))
+
+    return columns
+
+
+def _decode_numpy(handler, data, offsets):
+
+    length = handler.STRUCT.size
+    offsets = numpy.asarray(offsets, dtype=numpy.intp)
+
+    rows = data[offsets[:, numpy.newaxis] + numpy.arange(length)]
+    rows = rows[numpy.isin(rows[:, 2], list(handler.PACKET_SUBTYPES))]
+
+    subtype = rows[:, 2]
+
+    def uint_16(index):
+        return (rows[:, index].astype(numpy.int32) << 8) | rows[:, index + 1]
+
+    def signed_magnitude_16(index):
+        magnitude = uint_16(index) & 0x7fff
+        return numpy.where(rows[:, index] & 0x80, -magnitude, magnitude) / 10
+
+    def humidity_status(index):
+        status = numpy.minimum(rows[:, index], len(_HUMIDITY_STATUS) - 1)
+        return numpy.array(_HUMIDITY_STATUS, dtype=object)[status]
+
+    def when(condition, values):
+        return numpy.where(condition, values, numpy.nan)
+
+    columns = {
+        'packet_subtype': subtype,
+        'sequence_number': rows[:, 3],
+        'id': uint_16(4),
+        'signal_level': rows[:, -1] >> 4,
+        'battery_level': rows[:, -1] & 0x0f,
+    }
+
+    Handler = handler.__class__
+
+    if Handler is Temperature:
+        columns['temperature'] = signed_magnitude_16(6)
+    elif Handler is Humidity:
+        columns['humidity'] = rows[:, 6]
+        columns['humidity_status'] = humidity_status(7)
+    elif Handler is TempHumidity:
+        columns['channel'] = rows[:, 5]
+        columns['temperature'] = signed_magnitude_16(6)
+        columns['humidity'] = rows[:, 8]
+        columns['humidity_status'] = humidity_status(9)
+    elif Handler is UltraViolet:
+        columns['uv'] = rows[:, 6]
+        columns['temperature'] = when(subtype == 0x03,
+                                      signed_magnitude_16(7))
+    elif Handler is Wind:
+        columns['direction'] = uint_16(6)
+        columns['av_speed'] = when(subtype != 0x05, uint_16(8) * 0.1)
+        columns['wind_gust'] = uint_16(10) * 0.1
+        columns['temperature'] = when(subtype == 0x04,
+                                      signed_magnitude_16(12))
+        columns['wind_chill'] = when(subtype == 0x04,
+                                     signed_magnitude_16(14))
+
+    return columns
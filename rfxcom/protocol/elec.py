@@ -4,10 +4,21 @@ Energy Usage Sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
+class ElecReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Elec`."""
+
+    __slots__ = ('count', 'current_watts', 'total_watts',
+                 'signal_level', 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
+
+
 class Elec(BasePacketHandler):
     """The Elec protocol is a 17 byte packet used by energy sensors. The
     sensors transmit this packet periodically and the key data it provides is
@@ -37,17 +48,21 @@ class Elec(BasePacketHandler):
     17      RSSI and Battery Level
     ====    ====
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
+    PACKET_TYPES = {
+        0x5A: "Energy usage sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: "CM119/160",
+        0x02: "CM180",
+    }
+
+    #: Header, ID, count, current watts, total watts (as 16 and 32 bits),
+    #: RSSI and battery level.
+    STRUCT = Struct('>BBBBHBIHIB')
 
-        self.PACKET_TYPES = {
-            0x5A: "Energy usage sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: "CM119/160",
-            0x02: "CM180",
-        }
+    #: Divisor used to convert the total watts counter to watt hours.
+    TOTAL_DIVISOR = 223.666
 
     def _bytes_to_uint_32(self, bytes_):
         """Converts an array of 4 bytes to a 32bit integer.
@@ -58,8 +73,7 @@ class Elec(BasePacketHandler):
         :return: the integer
         :rtype: int
         """
-        return ((bytes_[0] * pow(2, 24)) +
-                (bytes_[1] << 16) + (bytes_[2] << 8) + bytes_[3])
+        return int.from_bytes(bytes_, 'big')
 
     def _bytes_to_uint_48(self, bytes_):
         """Converts an array of 6 bytes to a 48bit integer.
@@ -70,9 +84,35 @@ class Elec(BasePacketHandler):
         :return: the integer
         :rtype: int
         """
-        return ((bytes_[0] * pow(2, 40)) + (bytes_[1] * pow(2, 32)) +
-                (bytes_[2] * pow(2, 24)) + (bytes_[3] << 16) +
-                (bytes_[4] << 8) + bytes_[4])
+        return int.from_bytes(bytes_, 'big')
+
+    def decode(self, data):
+        """Decode a 18 bytes packet in the Electricity format into an
+        :py:class:`ElecReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: ElecReading
+        """
+
+        self.validate_packet(data)
+
+        reading = ElecReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, reading.count, reading.current_watts,
+         total_high, total_low, signal_battery) = self.STRUCT.unpack_from(data)
+
+        total = RfxPacketUtils.uint_48(total_high, total_low)
+
+        reading.sensor_id = id_
+        reading.total_watts = total / self.TOTAL_DIVISOR
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 18 bytes packet in the Electricity format and return a
@@ -91,7 +131,7 @@ class Elec(BasePacketHandler):
                 'sequence_number': 0,
                 'packet_subtype': 1,
                 'packet_subtype_name': "CM119/160",
-                'total_watts': 920825.1947099693,
+                'total_watts': 920824.5195961836,
                 'signal_level': 9,
                 'battery_level': 6,
             }
@@ -103,27 +143,4 @@ class Elec(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        TOTAL_DIVISOR = 223.666
-
-        id_ = self.dump_hex(data[4:6])
-        count = data[6]
-        instant = data[7:11]
-        total = data[11:16]
-
-        current_watts = self._bytes_to_uint_32(instant)
-        total_watts = self._bytes_to_uint_48(total) / TOTAL_DIVISOR
-
-        sensor_specific = {
-            'count': count,
-            'current_watts': current_watts,
-            'id': id_,
-            'total_watts': total_watts
-        }
-
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[17]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
@@ -4,8 +4,18 @@ Humidity sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
+
+
+class HumidityReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Humidity`."""
+
+    __slots__ = ('humidity', 'humidity_status', 'signal_level',
+                 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
 
 
 class Humidity(BasePacketHandler):
@@ -26,17 +36,45 @@ class Humidity(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
+    PACKET_TYPES = {
+        0x51: "Humidity sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: 'LaCrosse TX3',
+        0x02: 'LaCrosse WS2300'
+    }
+
+    #: Header, ID, humidity, humidity status, RSSI and battery level.
+    STRUCT = Struct('>BBBBHBBB')
+
+    def decode(self, data):
+        """Decode a 9 bytes packet in the Humidity format into a
+        :py:class:`HumidityReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: HumidityReading
+        """
+
+        self.validate_packet(data)
+
+        reading = HumidityReading(self, data)
 
-        self.PACKET_TYPES = {
-            0x51: "Humidity sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'LaCrosse TX3',
-            0x02: 'LaCrosse WS2300'
-        }
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, reading.humidity, humidity_status,
+         signal_battery) = self.STRUCT.unpack_from(data)
+        # channel = id_ & 0xFF TBC
+
+        reading.sensor_id = id_
+        reading.humidity_status = self._extract_humidity_status(
+            humidity_status)
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 9 bytes packet in the Humidity format and return a
@@ -66,26 +104,7 @@ class Humidity(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        id_ = self.dump_hex(data[4:6])
-        # channel = data[5] TBC
-
-        humidity = data[6]
-        humidity_status = self._extract_humidity_status(data[7])
-
-        sensor_specific = {
-            'id': id_,
-            # 'channel': channel, TBC
-            'humidity': humidity,
-            'humidity_status': humidity_status
-        }
-
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[8]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
 
     def _extract_humidity_status(self, data):
         """Extract the humidity status.
@@ -4,8 +4,9 @@ Lighting 5
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 
 
 SUB_TYPE_COMMANDS = {
@@ -50,6 +51,22 @@ DIM_LEVEL_TO_PERCENT = {
     }
 
 
+class Lighting2Reading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Lighting2`."""
+
+    __slots__ = ('unit_code', 'command', 'dim_level',
+                 'signal_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__ + ('command_text',)
+
+    ID_SIZE = 4
+
+    @property
+    def command_text(self):
+        return SUB_TYPE_COMMANDS.get(
+            self.packet_subtype, {}).get(self.command)
+
+
 class Lighting2(BasePacketHandler):
     """The Lighting2 protocol is a 12 byte packet used by a number of lighting
     systems. For example Lightwave devices use this protocol.
@@ -72,19 +89,43 @@ class Lighting2(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x11: "Lighting2 sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x00: 'AC',
+        0x01: 'HomeEasy EU',
+        0x02: 'Anslut'
+    }
+
+    #: Header, ID, unit code, command, dim level and RSSI.
+    STRUCT = Struct('>BBBBIBBBB')
+
+    def decode(self, data):
+        """Decode a 12 bytes packet in the Lighting2 format into a
+        :py:class:`Lighting2Reading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: Lighting2Reading
+        """
 
-        super().__init__(*args, **kwargs)
+        self.validate_packet(data)
 
-        self.PACKET_TYPES = {
-            0x11: "Lighting2 sensors"
-        }
+        reading = Lighting2Reading(self, data)
 
-        self.PACKET_SUBTYPES = {
-            0x00: 'AC',
-            0x01: 'HomeEasy EU',
-            0x02: 'Anslut'
-        }
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, reading.unit_code, reading.command,
+         dim_level, signal) = self.STRUCT.unpack_from(data)
+
+        reading.sensor_id = id_
+        reading.dim_level = DIM_LEVEL_TO_PERCENT.get(dim_level, '--??--')
+        reading.signal_level = signal >> 4
+
+        return reading
 
     def parse(self, data):
         """Parse a 12 bytes packet in the Lighting2 format and return a
@@ -115,27 +156,4 @@ class Lighting2(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:8])
-
-        unit_code = data[8]
-        command = data[9]
-        command_text = SUB_TYPE_COMMANDS.get(sub_type, {}).get(command)
-        dim_level = DIM_LEVEL_TO_PERCENT.get(data[10], '--??--')
-
-        sensor_specific = {
-            'id': id_,
-            'unit_code': unit_code,
-            'command': command,
-            'command_text': command_text,
-            'dim_level': dim_level
-        }
-
-        results.update(RfxPacketUtils.parse_signal_upper(data[11]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
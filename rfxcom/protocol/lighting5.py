@@ -4,8 +4,9 @@ Lighting 5
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 
 
 SUB_TYPE_COMMANDS = {
@@ -79,6 +80,22 @@ SUB_TYPE_COMMANDS = {
 }
 
 
+class Lighting5Reading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Lighting5`."""
+
+    __slots__ = ('unit_code', 'command', 'level',
+                 'signal_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__ + ('command_text',)
+
+    ID_SIZE = 3
+
+    @property
+    def command_text(self):
+        return SUB_TYPE_COMMANDS.get(
+            self.packet_subtype, {}).get(self.command)
+
+
 class Lighting5(BasePacketHandler):
     """The Lighting5 protocol is a 10 byte packet used by a number of lighting
     systems. For example Lightwave devices use this protocol.
@@ -100,23 +117,47 @@ class Lighting5(BasePacketHandler):
     ====    ====
     """
 
-    def __init__(self, *args, **kwargs):
+    PACKET_TYPES = {
+        0x14: "Lighting5 sensors"
+    }
+
+    PACKET_SUBTYPES = {
+        0x00: "LightwaveRF, Siemens",
+        0x01: "EMW100 GAO/Everflourish",
+        0x02: "BBSB new types",
+        0x03: "MDREMOTE LED dimmer",
+        0x04: "Conrad RSL2",
+        0x05: "Livolo",
+        0x06: "RGB TRC02",
+    }
+
+    #: Header, ID (as 8 and 16 bits), unit code, command, level and RSSI.
+    STRUCT = Struct('>BBBBBHBBBB')
 
-        super().__init__(*args, **kwargs)
+    def decode(self, data):
+        """Decode a 11 bytes packet in the Lighting5 format into a
+        :py:class:`Lighting5Reading`.
 
-        self.PACKET_TYPES = {
-            0x14: "Lighting5 sensors"
-        }
+        :param data: bytearray to be decoded
+        :type data: bytearray
 
-        self.PACKET_SUBTYPES = {
-            0x00: "LightwaveRF, Siemens",
-            0x01: "EMW100 GAO/Everflourish",
-            0x02: "BBSB new types",
-            0x03: "MDREMOTE LED dimmer",
-            0x04: "Conrad RSL2",
-            0x05: "Livolo",
-            0x06: "RGB TRC02",
-        }
+        :return: The reading containing the decoded values
+        :rtype: Lighting5Reading
+        """
+
+        self.validate_packet(data)
+
+        reading = Lighting5Reading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_high, id_low, reading.unit_code,
+         reading.command, reading.level,
+         signal) = self.STRUCT.unpack_from(data)
+
+        reading.sensor_id = (id_high << 16) | id_low
+        reading.signal_level = signal >> 4
+
+        return reading
 
     def parse(self, data):
         """Parse a 11 bytes packet in the Lighting5 format and return a
@@ -147,26 +188,4 @@ class Lighting5(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:7])
-        unit_code = data[7]
-        command = data[8]
-        command_text = SUB_TYPE_COMMANDS.get(sub_type, {}).get(command)
-        level = data[9]
-
-        sensor_specific = {
-            'id': id_,
-            'unit_code': unit_code,
-            'command': command,
-            'command_text': command_text,
-            'level': level
-        }
-
-        results.update(RfxPacketUtils.parse_signal_upper(data[10]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
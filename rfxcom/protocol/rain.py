@@ -4,8 +4,22 @@ Rain sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
-from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
+
+
+class RainReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Rain`. The rain rate
+    and rain total are None for the subtypes which don't provide them.
+    """
+
+    __slots__ = ('rain_rate', 'rain_total', 'signal_level',
+                 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
+
+    OPTIONAL_FIELDS = frozenset(['rain_rate', 'rain_total'])
 
 
 class Rain(BasePacketHandler):
@@ -33,21 +47,61 @@ class Rain(BasePacketHandler):
     Note:
     need example data to implement correctly subtype 6 (La Crosse TX5)
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x55: "Rain sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'RGR126/682/918',
-            0x02: 'PCR800',
-            0x03: 'TFA',
-            0x04: 'UPM RG700',
-            0x05: 'WS2300',
-            0x06: 'La Crosse TX5'
-        }
+
+    PACKET_TYPES = {
+        0x55: "Rain sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: 'RGR126/682/918',
+        0x02: 'PCR800',
+        0x03: 'TFA',
+        0x04: 'UPM RG700',
+        0x05: 'WS2300',
+        0x06: 'La Crosse TX5'
+    }
+
+    #: Header, ID, rain rate, rain total (as 8 and 16 bits), RSSI and
+    #: battery level.
+    STRUCT = Struct('>BBBBHHBHB')
+
+    def decode(self, data):
+        """Decode a 12 bytes packet in the Rain format into a
+        :py:class:`RainReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: RainReading
+        """
+
+        self.validate_packet(data)
+
+        reading = RainReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, rain_rate, rain_total_high,
+         rain_total_low, signal_battery) = self.STRUCT.unpack_from(data)
+
+        sub_type = reading.packet_subtype
+
+        if sub_type == 0x01:
+            reading.rain_rate = rain_rate
+        elif sub_type == 0x02:
+            reading.rain_rate = float(rain_rate) / 100
+        else:
+            reading.rain_rate = None
+        if sub_type != 0x06:
+            reading.rain_total = float(
+                rain_total_high * 0x1000 + rain_total_low) / 10
+        else:
+            reading.rain_total = None
+
+        reading.sensor_id = id_
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 12 bytes packet in the Rain format and return a
@@ -77,39 +131,4 @@ class Rain(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:6])
-
-        rain_rate_high = data[6]
-        rain_rate_low = data[7]
-        if sub_type == 0x01:
-            rain_rate = rain_rate_high * 0x100 + rain_rate_low
-        elif sub_type == 0x02:
-            rain_rate = float(rain_rate_high * 0x100 + rain_rate_low) / 100
-        else:
-            rain_rate = '--??--'
-        rain_total1 = data[8]
-        rain_total2 = data[9]
-        rain_total3 = data[10]
-        if sub_type != 0x06:
-            rain_total = float(
-                rain_total1 * 0x1000 + rain_total2 * 0x100 + rain_total3) / 10
-        else:
-            rain_total = '--??--'
-
-        sensor_specific = {
-            'id': id_
-        }
-        if rain_rate != '--??--':
-            sensor_specific['rain_rate'] = rain_rate
-        if rain_total != '--??--':
-            sensor_specific['rain_total'] = rain_total
-
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[11]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
@@ -1,11 +1,18 @@
 
 # ----------------------------------------------------------------------------
 
+from struct import Struct
+from sys import intern
+
 
 class RfxPacketUtils:
     """Utility class that offers common services to decode RFX packets
     """
 
+    #: The RFX common header part of all packets: packet length, packet type,
+    #: packet sub-type and sequence number.
+    HEADER = Struct('>BBBB')
+
     @staticmethod
     def parse_signal_and_battery(byte):
         """Decode signal/battery byte:
@@ -30,3 +37,62 @@ class RfxPacketUtils:
         return {
             'signal_level': rssi
         }
+
+    @staticmethod
+    def signed_magnitude_16(value):
+        """Decode a 16 bit signed-magnitude value, as used for temperatures.
+        The upper bit is the sign and the remaining 15 bits the magnitude.
+
+        :param value: The value unpacked as an unsigned 16 bit integer.
+        :type value: int
+
+        :return: the integer
+        :rtype: int
+        """
+        if value & 0x8000:
+            return -(value & 0x7fff)
+        return value
+
+    @staticmethod
+    def uint_48(high, low):
+        """Combine the upper 16 bits and lower 32 bits of a 48 bit integer.
+        The struct module has no 48 bit format, so these are unpacked as an
+        ``H`` and an ``I``.
+
+        :return: the integer
+        :rtype: int
+        """
+        return (high << 32) | low
+
+    #: The maximum number of formatted IDs kept by ``format_id``. The cache
+    #: is cleared when it is full, which only happens if a lot of distinct
+    #: (or corrupt) IDs are received.
+    ID_CACHE_SIZE = 4096
+
+    _id_cache = {}
+
+    @classmethod
+    def format_id(cls, value, size):
+        """Format an ID the same way ``BasePacket.dump_hex`` would format the
+        bytes it was unpacked from. The strings are interned and cached, so
+        each distinct ID is only formatted once.
+
+        :param value: The ID unpacked as an unsigned integer.
+        :type value: int
+
+        :param size: The number of bytes the ID occupies in the packet.
+        :type size: int
+
+        :return: The ID as an upper case hex string, for example "0x2EB2"
+        :rtype: string
+        """
+        key = (value, size)
+        cache = cls._id_cache
+
+        try:
+            return cache[key]
+        except KeyError:
+            if len(cache) >= cls.ID_CACHE_SIZE:
+                cache.clear()
+            formatted = cache[key] = intern("0x%0*X" % (size * 2, value))
+            return formatted
@@ -4,7 +4,9 @@ Interface Message
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, HeaderReading
 
 
 _MSG1_RECEIVER_TYPE = {
@@ -60,6 +62,30 @@ _MSG5_PROTOCOLS = [
 PROTOCOLS = _MSG3_PROTOCOLS + _MSG4_PROTOCOLS + _MSG5_PROTOCOLS
 
 
+class StatusReading(HeaderReading):
+    """The Reading for packets decoded by :py:class:`Status`."""
+
+    __slots__ = ('command_type', 'transceiver_type', 'firmware_version',
+                 'protocol_flags', 'enabled_protocols', 'disabled_protocols')
+
+    FIELDS = ('packet_length', 'packet_type', 'packet_type_name',
+              'sequence_number', 'sub_type', 'sub_type_name', 'command_type',
+              'transceiver_type', 'transceiver_type_text', 'firmware_version',
+              'enabled_protocols', 'disabled_protocols')
+
+    @property
+    def sub_type(self):
+        return self.packet_subtype
+
+    @property
+    def sub_type_name(self):
+        return self.packet_subtype_name
+
+    @property
+    def transceiver_type_text(self):
+        return _MSG1_RECEIVER_TYPE.get(self.transceiver_type)
+
+
 class Status(BasePacketHandler):
     """The Status packet is returned by the RFXtrx itself and is used to show
     the status and configuration of the device.
@@ -83,17 +109,18 @@ class Status(BasePacketHandler):
     13      Message 9
     ====    ====
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
+    PACKET_TYPES = {
+        0x01: "Interface message"
+    }
+    PACKET_SUBTYPES = {
+        0x00: "Response on a mode command",
+        0xFF: "Wrong command received from the application.",
+    }
 
-        self.PACKET_TYPES = {
-            0x01: "Interface message"
-        }
-        self.PACKET_SUBTYPES = {
-            0x00: "Response on a mode command",
-            0xFF: "Wrong command received from the application.",
-        }
+    #: Header, command, transceiver type, firmware version and the three
+    #: bytes of protocol flags. The remaining messages aren't used.
+    STRUCT = Struct('>BBBBBBBBBB')
 
     def _log_enabled_protocols(self, flags, protocols):
         """Given a list of single character strings of 1's and 0's and a list
@@ -141,6 +168,37 @@ class Status(BasePacketHandler):
         """
         return list('{0:08b}'.format(int_))
 
+    def decode(self, data):
+        """Decode a 13 byte packet in the Status format into a
+        :py:class:`StatusReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: StatusReading
+        """
+
+        self.validate_packet(data)
+
+        reading = StatusReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, reading.command_type,
+         reading.transceiver_type, reading.firmware_version, msg3, msg4,
+         msg5) = self.STRUCT.unpack_from(data)
+
+        reading.protocol_flags = (msg3, msg4, msg5)
+
+        flags = self._int_to_binary_list(msg3)
+        flags.extend(self._int_to_binary_list(msg4))
+        flags.extend(self._int_to_binary_list(msg5))
+
+        reading.enabled_protocols, reading.disabled_protocols = \
+            self._log_enabled_protocols(flags, PROTOCOLS)
+
+        return reading
+
     def parse(self, data):
         """Parse a 13 byte packet in the Status format.
 
@@ -151,34 +209,4 @@ class Status(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        packet_length = data[0]
-        packet_type = data[1]
-        sub_type = data[2]
-        sequence_number = data[3]
-        command_type = data[4]
-        transceiver_type = data[5]
-        transceiver_type_text = _MSG1_RECEIVER_TYPE.get(data[5])
-        firmware_version = data[6]
-
-        flags = self._int_to_binary_list(data[7])
-        flags.extend(self._int_to_binary_list(data[8]))
-        flags.extend(self._int_to_binary_list(data[9]))
-
-        enabled, disabled = self._log_enabled_protocols(flags, PROTOCOLS)
-
-        return {
-            'packet_length': packet_length,
-            'packet_type': packet_type,
-            'packet_type_name': self.PACKET_TYPES.get(packet_type),
-            'sequence_number': sequence_number,
-            'sub_type': sub_type,
-            'sub_type_name': self.PACKET_SUBTYPES.get(sub_type),
-            'command_type': command_type,
-            'transceiver_type': transceiver_type,
-            'transceiver_type_text': transceiver_type_text,
-            'firmware_version': firmware_version,
-            'enabled_protocols': enabled,
-            'disabled_protocols': disabled,
-        }
+        return self.decode(data).as_dict()
@@ -0,0 +1,174 @@
+"""
+Stream Decoder
+==============
+
+Frames a stream of bytes, as read from the RFXtrx, into packets.
+
+"""
+
+from rfxcom.exceptions import InvalidPacketLength
+from rfxcom.timing import monotonic_ns
+
+
+def iter_frames(buffer_):
+    """Iterate over the packets in a buffer of concatenated packets, such as
+    a capture of the bytes read from the RFXtrx. Unlike the
+    :py:class:`StreamDecoder` the whole buffer is available up front, so the
+    packets are returned as memoryview slices of it and no bytes are copied.
+
+    :param buffer_: The packets, each starting with its length byte.
+    :type buffer_: bytes, bytearray or memoryview
+
+    :raises: :py:class:`rfxcom.exceptions.InvalidPacketLength`: If the
+        buffer ends with an incomplete packet.
+
+    :return: A generator of memoryview packets.
+    :rtype: generator
+    """
+
+    view = memoryview(buffer_)
+    offset = 0
+    size = len(view)
+
+    while offset < size:
+
+        length = view[offset]
+
+        # Skip any zero length bytes.
+        if length == 0:
+            offset += 1
+            continue
+
+        end = offset + length + 1
+
+        if end > size:
+            raise InvalidPacketLength(
+                "Expected packet length to be %s bytes but only %s bytes "
+                "remain" % (length + 1, size - offset)
+            )
+
+        yield view[offset:end]
+        offset = end
+
+
+class StreamDecoder:
+    """The StreamDecoder splits a stream of bytes into the individual
+    packets it contains. Every RFXtrx packet starts with a length byte which
+    excludes itself, so the bytes can be fed in as chunks of any size and the
+    complete packets iterated out. Any trailing partial packet is kept until
+    more bytes are fed in.
+
+    .. code-block:: python
+
+        decoder = StreamDecoder()
+        decoder.feed(serial.read(serial.in_waiting or 1))
+
+        for pkt in decoder:
+            print(pkt)
+
+    The same decoder can be used to frame packets from a socket or a file of
+    captured packets.
+
+    Each ``feed`` is stamped with :py:func:`rfxcom.timing.monotonic_ns`.
+    After a packet is returned, ``first_byte_ns`` is the stamp of the feed
+    its first byte arrived in and ``framed_ns`` the stamp of the feed that
+    completed it. They are exact as long as the packets are iterated out
+    after every ``feed``.
+    """
+
+    def __init__(self):
+        """The StreamDecoder is initialised with no arguments. It starts with
+        an empty buffer which is reused as bytes are fed in and consumed.
+        """
+
+        self._buffer = bytearray()
+        self._offset = 0
+
+        #: The number of zero bytes skipped between packets. The RFXtrx
+        #: doesn't send empty packets, so these are noise on the line.
+        self.skipped = 0
+
+        #: The stamp of the feed the last packet returned started in.
+        self.first_byte_ns = None
+
+        #: The stamp of the feed that completed the last packet returned.
+        self.framed_ns = None
+
+        # The stamps of the feed the next packet starts in and of the last
+        # feed.
+        self._started_ns = None
+        self._fed_ns = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Return the next complete packet in the buffer as a new bytearray.
+
+        :raises: :py:class:`StopIteration`: When there isn't a complete
+            packet left in the buffer.
+
+        :return: The next packet, including the length byte.
+        :rtype: bytearray
+        """
+
+        buffer_ = self._buffer
+        offset = self._offset
+        size = len(buffer_)
+
+        # Skip any zero length bytes.
+        while offset < size and buffer_[offset] == 0:
+            offset += 1
+            self.skipped += 1
+
+        self._offset = offset
+
+        if offset == size:
+            raise StopIteration
+
+        end = offset + buffer_[offset] + 1
+
+        if end > size:
+            raise StopIteration
+
+        self._offset = end
+        self.first_byte_ns = self._started_ns
+        self.framed_ns = self._fed_ns
+        # Only the last feed can still hold a packet's first byte.
+        self._started_ns = self._fed_ns
+        return buffer_[offset:end]
+
+    @property
+    def pending(self):
+        """The number of bytes buffered that haven't been returned as a
+        packet yet.
+        """
+        return len(self._buffer) - self._offset
+
+    def feed(self, data):
+        """Add bytes read from the RFXtrx to the buffer. Any packets that
+        have already been returned are dropped from the buffer first, so it
+        only ever holds a partial packet and the new data.
+
+        :param data: The bytes to add.
+        :type data: bytes
+        """
+
+        self._fed_ns = monotonic_ns()
+
+        if self._offset:
+            del self._buffer[:self._offset]
+            self._offset = 0
+
+        if not self._buffer:
+            self._started_ns = self._fed_ns
+
+        self._buffer.extend(data)
+
+    def reset(self):
+        """Discard everything in the buffer, for example after the RFXtrx
+        has been reset or its buffer flushed.
+        """
+
+        del self._buffer[:]
+        self._offset = 0
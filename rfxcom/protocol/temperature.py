@@ -4,10 +4,20 @@ Temperature sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
+class TemperatureReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Temperature`."""
+
+    __slots__ = ('temperature', 'signal_level', 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
+
+
 class Temperature(BasePacketHandler):
     """
     ====    ====
@@ -26,25 +36,53 @@ class Temperature(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x50: "Temperature sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'THR128/138, THC138',
-            0x02: 'THC238/268,THN132,THWR288,THRN122,THN122,AW129/131',
-            0x03: 'THWR800',
-            0x04: 'RTHN318',
-            0x05: 'La Crosse TX2, TX3, TX4, TX17',
-            0x06: 'TS15C',
-            0x07: 'Viking 02811',
-            0x08: 'La Crosse WS2300',
-            0x09: 'RUBiCSON',
-            0x0A: 'TFA 30.3133'
-        }
+
+    PACKET_TYPES = {
+        0x50: "Temperature sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: 'THR128/138, THC138',
+        0x02: 'THC238/268,THN132,THWR288,THRN122,THN122,AW129/131',
+        0x03: 'THWR800',
+        0x04: 'RTHN318',
+        0x05: 'La Crosse TX2, TX3, TX4, TX17',
+        0x06: 'TS15C',
+        0x07: 'Viking 02811',
+        0x08: 'La Crosse WS2300',
+        0x09: 'RUBiCSON',
+        0x0A: 'TFA 30.3133'
+    }
+
+    #: Header, ID, temperature, RSSI and battery level.
+    STRUCT = Struct('>BBBBHHB')
+
+    def decode(self, data):
+        """Decode a 9 bytes packet in the Temperature format into a
+        :py:class:`TemperatureReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: TemperatureReading
+        """
+
+        self.validate_packet(data)
+
+        reading = TemperatureReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, temperature,
+         signal_battery) = self.STRUCT.unpack_from(data)
+        # channel = id_ & 0xFF TBC
+
+        reading.sensor_id = id_
+        reading.temperature = \
+            RfxPacketUtils.signed_magnitude_16(temperature) / 10
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 9 bytes packet in the Temperature format and return a
@@ -73,24 +111,4 @@ class Temperature(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        id_ = self.dump_hex(data[4:6])
-        # channel = data[5] TBC
-
-        temperature = ((data[6] & 0x7f) * 256 + data[7]) / 10
-        signbit = data[6] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-
-        sensor_specific = {
-            'id': id_,
-            # 'channel': channel, TBC
-            'temperature': temperature
-        }
-
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[8]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
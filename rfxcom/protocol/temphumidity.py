@@ -4,10 +4,21 @@ Temperature and Humidity sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
+class TempHumidityReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`TempHumidity`."""
+
+    __slots__ = ('channel', 'temperature', 'humidity',
+                 'humidity_status', 'signal_level', 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
+
+
 class TempHumidity(BasePacketHandler):
     """
     ====    ====
@@ -28,27 +39,58 @@ class TempHumidity(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x52: "Temperature and humidity sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'THGN122/123, THGN132, THGR122/228/238/268',
-            0x02: 'THGR810, THGN801, THGN800',
-            0x03: 'RTGR328',
-            0x04: 'THGR328',
-            0x05: 'WTGR800',
-            0x06: 'THGR918/928, THGRN228, THGN500',
-            0x07: 'TFA TS34C, Cresta',
-            0x08: 'WT260,WT260H,WT440H,WT450,WT450H',
-            0x09: 'Viking 02035,02038 (02035 has no humidity)',
-            0x0A: 'Rubicson',
-            0x0B: 'EW109',
-            0x0C: 'Imagintronix Soil Sensor'
-        }
+
+    PACKET_TYPES = {
+        0x52: "Temperature and humidity sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: 'THGN122/123, THGN132, THGR122/228/238/268',
+        0x02: 'THGR810, THGN801, THGN800',
+        0x03: 'RTGR328',
+        0x04: 'THGR328',
+        0x05: 'WTGR800',
+        0x06: 'THGR918/928, THGRN228, THGN500',
+        0x07: 'TFA TS34C, Cresta',
+        0x08: 'WT260,WT260H,WT440H,WT450,WT450H',
+        0x09: 'Viking 02035,02038 (02035 has no humidity)',
+        0x0A: 'Rubicson',
+        0x0B: 'EW109',
+        0x0C: 'Imagintronix Soil Sensor'
+    }
+
+    #: Header, ID, temperature, humidity, humidity status, RSSI and battery
+    #: level.
+    STRUCT = Struct('>BBBBHHBBB')
+
+    def decode(self, data):
+        """Decode a 11 bytes packet in the TemperatureHumidity format into
+        a :py:class:`TempHumidityReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: TempHumidityReading
+        """
+
+        self.validate_packet(data)
+
+        reading = TempHumidityReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, temperature, reading.humidity,
+         humidity_status, signal_battery) = self.STRUCT.unpack_from(data)
+
+        reading.sensor_id = id_
+        reading.channel = id_ & 0xFF
+        reading.temperature = \
+            RfxPacketUtils.signed_magnitude_16(temperature) / 10
+        reading.humidity_status = self._extract_humidity_status(
+            humidity_status)
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 11 bytes packet in the TemperatureHumidity format and return a
@@ -79,31 +121,7 @@ class TempHumidity(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        id_ = self.dump_hex(data[4:6])
-        channel = data[5]
-
-        temperature = ((data[6] & 0x7f) * 256 + data[7]) / 10
-        signbit = data[6] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-        humidity = data[8]
-        humidity_status = self._extract_humidity_status(data[9])
-
-        sensor_specific = {
-            'id': id_,
-            'channel': channel,
-            'temperature': temperature,
-            'humidity': humidity,
-            'humidity_status': humidity_status
-        }
-
-        results = self.parse_header_part(data)
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[10]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
 
     def _extract_humidity_status(self, data):
         """Extract the humidity status.
@@ -4,10 +4,24 @@ UV sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
+class UltraVioletReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`UltraViolet`. The
+    temperature is None for the subtypes which don't provide it.
+    """
+
+    __slots__ = ('uv', 'temperature', 'signal_level', 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
+
+    OPTIONAL_FIELDS = frozenset(['temperature'])
+
+
 class UltraViolet(BasePacketHandler):
     """
     ====    ====
@@ -27,18 +41,49 @@ class UltraViolet(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
 
-        super().__init__(*args, **kwargs)
+    PACKET_TYPES = {
+        0x57: "UV sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: 'UVN128, UV138',
+        0x02: 'UVN800',
+        0x03: 'TFA'
+    }
+
+    #: Header, ID, UV, temperature, RSSI and battery level.
+    STRUCT = Struct('>BBBBHBHB')
+
+    def decode(self, data):
+        """Decode a 10 bytes packet in the UltraViolet format into an
+        :py:class:`UltraVioletReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: UltraVioletReading
+        """
+
+        self.validate_packet(data)
+
+        reading = UltraVioletReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, reading.uv, temperature,
+         signal_battery) = self.STRUCT.unpack_from(data)
 
-        self.PACKET_TYPES = {
-            0x57: "UV sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'UVN128, UV138',
-            0x02: 'UVN800',
-            0x03: 'TFA'
-        }
+        if reading.packet_subtype == 0x03:
+            reading.temperature = \
+                RfxPacketUtils.signed_magnitude_16(temperature) / 10
+        else:
+            reading.temperature = None
+
+        reading.sensor_id = id_
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 10 bytes packet in the UltraViolet format and return a
@@ -68,27 +113,4 @@ class UltraViolet(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        id_ = self.dump_hex(data[4:6])
-
-        uv = data[6]
-        temperature = ((data[7] & 0x7f) * 256 + data[8]) / 10
-        signbit = data[7] & 0x80
-        if signbit != 0:
-            temperature = -temperature
-
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        sensor_specific = {
-            'id': id_,
-            'uv': uv
-        }
-        if sub_type == 0x03:
-            sensor_specific['temperature'] = temperature
-
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[9]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
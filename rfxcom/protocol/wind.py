@@ -5,10 +5,26 @@ Wind sensors
 
 """
 
-from rfxcom.protocol.base import BasePacketHandler
+from struct import Struct
+
+from rfxcom.protocol.base import BasePacketHandler, SensorReading
 from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
 
 
+class WindReading(SensorReading):
+    """The Reading for packets decoded by :py:class:`Wind`. The average
+    speed, temperature and wind chill are None for the subtypes which don't
+    provide them.
+    """
+
+    __slots__ = ('direction', 'av_speed', 'wind_gust', 'temperature',
+                 'wind_chill', 'signal_level', 'battery_level')
+
+    FIELDS = SensorReading.FIELDS + __slots__
+
+    OPTIONAL_FIELDS = frozenset(['av_speed', 'temperature', 'wind_chill'])
+
+
 class Wind(BasePacketHandler):
     """
     ====    ====
@@ -35,21 +51,64 @@ class Wind(BasePacketHandler):
 
 
     """
-    def __init__(self, *args, **kwargs):
-
-        super().__init__(*args, **kwargs)
-
-        self.PACKET_TYPES = {
-            0x56: "Wind sensors"
-        }
-        self.PACKET_SUBTYPES = {
-            0x01: 'WTGR800',
-            0x02: 'WGR800',
-            0x03: 'STR918, WGR918, WGR928',
-            0x04: 'TFA',
-            0x05: 'UPM WDS500',
-            0x06: 'WS2300'
-        }
+
+    PACKET_TYPES = {
+        0x56: "Wind sensors"
+    }
+    PACKET_SUBTYPES = {
+        0x01: 'WTGR800',
+        0x02: 'WGR800',
+        0x03: 'STR918, WGR918, WGR928',
+        0x04: 'TFA',
+        0x05: 'UPM WDS500',
+        0x06: 'WS2300'
+    }
+
+    #: Header, ID, direction, average speed, gust, temperature, wind chill,
+    #: RSSI and battery level.
+    STRUCT = Struct('>BBBBHHHHHHB')
+
+    def decode(self, data):
+        """Decode a 17 bytes packet in the Wind format into a
+        :py:class:`WindReading`.
+
+        :param data: bytearray to be decoded
+        :type data: bytearray
+
+        :return: The reading containing the decoded values
+        :rtype: WindReading
+        """
+
+        self.validate_packet(data)
+
+        reading = WindReading(self, data)
+
+        (reading.packet_length, reading.packet_type, reading.packet_subtype,
+         reading.sequence_number, id_, reading.direction, av_speed, gust,
+         temperature, wind_chill,
+         signal_battery) = self.STRUCT.unpack_from(data)
+
+        sub_type = reading.packet_subtype
+
+        if sub_type != 0x05:
+            reading.av_speed = av_speed * 0.1
+        else:
+            reading.av_speed = None
+        if sub_type == 0x04:
+            reading.temperature = \
+                RfxPacketUtils.signed_magnitude_16(temperature) / 10
+            reading.wind_chill = \
+                RfxPacketUtils.signed_magnitude_16(wind_chill) / 10
+        else:
+            reading.temperature = None
+            reading.wind_chill = None
+
+        reading.sensor_id = id_
+        reading.wind_gust = gust * 0.1
+        reading.signal_level = signal_battery >> 4
+        reading.battery_level = signal_battery & 0x0f
+
+        return reading
 
     def parse(self, data):
         """Parse a 17 bytes packet in the Wind format and return a
@@ -82,47 +141,4 @@ class Wind(BasePacketHandler):
         :rtype: dict
         """
 
-        self.validate_packet(data)
-
-        results = self.parse_header_part(data)
-        sub_type = results['packet_subtype']
-
-        id_ = self.dump_hex(data[4:6])
-
-        direction = data[6] * 256 + data[7]
-        if sub_type != 0x05:
-            av_speed = (data[8] * 256 + data[9]) * 0.1
-        else:
-            av_speed = '--??--'
-        gust = (data[10] * 256 + data[11]) * 0.1
-        if sub_type == 0x04:
-            temperature = ((data[12] & 0x7f) * 256 + data[13]) / 10
-            signbit = data[12] & 0x80
-            if signbit != 0:
-                temperature = -temperature
-        else:
-            temperature = '--??--'
-        if sub_type == 0x04:
-            wind_chill = ((data[14] & 0x7f) * 256 + data[15]) / 10
-            signbit = data[14] & 0x80
-            if signbit != 0:
-                wind_chill = -wind_chill
-        else:
-            wind_chill = '--??--'
-
-        sensor_specific = {
-            'id': id_,
-            'direction': direction,
-            'wind_gust': gust
-        }
-        if av_speed != '--??--':
-            sensor_specific['av_speed'] = av_speed
-        if temperature != '--??--':
-            sensor_specific['temperature'] = temperature
-        if wind_chill != '--??--':
-            sensor_specific['wind_chill'] = wind_chill
-
-        results.update(RfxPacketUtils.parse_signal_and_battery(data[16]))
-        results.update(sensor_specific)
-
-        return results
+        return self.decode(data).as_dict()
@@ -0,0 +1,111 @@
+"""
+rfxcom.timing
+=============
+
+The times a packet reaches each stage between the serial line and its
+callback, as integer nanoseconds from :py:func:`monotonic_ns`. Monotonic
+stamps are cheap to take and to subtract, and aren't affected by the wall
+clock being changed, so they are what the transports record. A wall clock
+``datetime`` is only worked out from a stamp when it is asked for, with
+:py:func:`wall_clock`, against a single reading of both clocks taken when
+the module is imported.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+try:
+    from time import monotonic_ns
+except ImportError:  # Python < 3.7
+
+    def monotonic_ns():
+        """The value of :py:func:`time.monotonic` in integer nanoseconds."""
+        return int(time.monotonic() * 1e9)
+
+_EPOCH = datetime(1970, 1, 1)
+
+#: The wall clock and monotonic time, read together once, which the
+#: stamps are converted against.
+_ANCHOR = (time.time(), monotonic_ns())
+
+
+def wall_clock(stamp):
+    """Return the UTC time at which a :py:func:`monotonic_ns` stamp was
+    taken, as a naive ``datetime`` like ``datetime.utcnow`` returns. It is
+    worked out from the wall clock when this module was imported, so the
+    same stamp always gives the same time, and changes to the wall clock
+    since aren't followed.
+
+    :param stamp: The stamp, in nanoseconds.
+    :type stamp: int
+
+    :rtype: datetime.datetime
+    """
+
+    wall, monotonic = _ANCHOR
+
+    return _EPOCH + timedelta(seconds=wall + (stamp - monotonic) / 1e9)
+
+
+class Timings:
+    """The :py:func:`monotonic_ns` stamps of the stages a packet went
+    through in a transport. A stage the packet hasn't reached yet is None.
+
+    - ``first_byte``: When the bytes holding the start of the packet were
+      read from the device.
+    - ``framed``: When the bytes completing the packet were read.
+    - ``decoded``: When the packet handler had decoded the packet.
+    - ``dispatched``: When the reading was passed, or scheduled to be
+      passed, to its callback.
+
+    The stamps are taken when the transport gets the bytes, so
+    ``first_byte`` and ``framed`` include any time they spent in the
+    serial driver's buffer, but not the time taken to transmit them.
+    """
+
+    __slots__ = ('first_byte', 'framed', 'decoded', 'dispatched')
+
+    #: The stages, in order.
+    STAGES = __slots__
+
+    def __init__(self, first_byte=None, framed=None):
+        self.first_byte = first_byte
+        self.framed = framed
+        self.decoded = None
+        self.dispatched = None
+
+    def elapsed(self, start, end):
+        """The seconds between two stages, or None if either hasn't been
+        reached.
+
+        :param start: The name of the first stage.
+        :type start: str
+
+        :param end: The name of the later stage.
+        :type end: str
+
+        :rtype: float
+        """
+
+        start = getattr(self, start)
+        end = getattr(self, end)
+
+        if start is None or end is None:
+            return None
+
+        return (end - start) / 1e9
+
+    def as_dict(self):
+        """Return the stamps as wall clock ``datetime`` objects, by stage."""
+
+        result = {}
+
+        for stage in self.STAGES:
+            stamp = getattr(self, stage)
+            result[stage] = None if stamp is None else wall_clock(stamp)
+
+        return result
+
+    def __repr__(self):
+        return "<Timings %s>" % " ".join(
+            "%s=%s" % (stage, getattr(self, stage)) for stage in self.STAGES)
@@ -5,3 +5,5 @@ rfxcom.transport.__init__
 """
 
 from .asyncio import AsyncioTransport  # NOQA
+from .nonblocking import NonBlockingTransport  # NOQA
+from .threaded import ThreadedTransport  # NOQA
@@ -6,109 +6,369 @@ rfxcom.transport.asyncio
 
 import asyncio
 
+from rfxcom.exceptions import PacketHandlerNotFound, RFXComException
 from rfxcom.transport.base import BaseTransport
-from rfxcom.protocol import RESET_PACKET, STATUS_PACKET, MODE_PACKET
+from rfxcom.transport.dispatcher import AsyncDispatcher
+from rfxcom.transport.hooks import DISPATCHED
+from rfxcom.transport.packetstream import BLOCK, PacketStream
+from rfxcom.transport.policy import CallbackPolicy
+from rfxcom.transport.subscriptions import Fanout
+from rfxcom.protocol import (RESET_PACKET, STATUS_PACKET, MODE_PACKET,
+                             RESPONSE_TYPES)
+from rfxcom.protocol.base import Packet
+from rfxcom.protocol.status import Status
+
+#: The states of :py:attr:`AsyncioTransport.state` while the RFXtrx is
+#: initialised.
+RESETTING = 'resetting'
+REQUESTING_STATUS = 'requesting status'
+SETTING_MODE = 'setting mode'
+READY = 'ready'
+FAILED = 'failed'
 
 
 class AsyncioTransport(BaseTransport):
+
+    #: The default number of seconds ``request`` waits for a response.
+    REQUEST_TIMEOUT = 2.0
+
+    #: The number of seconds to wait after a reset, the RFXtrx needs at least
+    #: 50ms before it responds to the status request.
+    RESET_DELAY = 0.05
+
+    #: The number of seconds to wait for the status during initialisation.
+    STATUS_TIMEOUT = 5.0
+
     def __init__(self, device, loop, callback=None, callbacks=None,
-                 SerialClass=None):
+                 SerialClass=None, lazy=False, max_tasks=100):
 
         super().__init__(device, callback=callback, callbacks=callbacks,
-                         SerialClass=SerialClass)
+                         SerialClass=SerialClass, lazy=lazy)
 
         self.loop = loop
-        asyncio.async(self._setup())
+        self.dispatcher = AsyncDispatcher(
+            loop, max_tasks, finished=self.callback_finished)
+        self.streams = []
+        self.reading_paused = False
+        self._requests = {}
+        self._sequence_number = 0
+        # Responses are decoded with these when the callbacks didn't decode
+        # them, so the status can always be read whatever is subscribed.
+        self._response_handlers = (Status(), Packet())
 
-    def _setup(self):
+        self.state = None
+        self.ready = self.loop.create_future()
+        self.loop.create_task(self._setup())
+
+    async def _setup(self):
         """Performs the RFXtrx initialisation protocol in a Future.
 
         Currently this is the rough workflow of the interactions with the
         RFXtrx. We also do a few extra things - flush the buffer, and attach
-        readers/writers to the asyncio loop.
+        readers/writers to the asyncio loop. ``state`` is updated as each
+        step is started and ``ready`` is resolved with the status once the
+        RFXtrx is ready.
 
         1. Write a RESET packet (write all zeros)
         2. Wait at least 50ms and less than 9000ms
         3. Write the STATUS packet to verify the device is up.
         4. Receive status response
-        5. Write the MODE packet to enable or disabled the required protocols.
+        5. If the enabled protocols in the status don't match the MODE packet,
+           write the MODE packet to enable or disable the required protocols.
         """
+        try:
+            self.ready.set_result(await self._initialise())
+        except Exception as exc:
+            self.log.exception("Failed to initialise the RFXtrx.")
+            self.state = FAILED
+            self.ready.set_exception(exc)
+
+        # The status has to be read while the RFXtrx is set up, so a pause
+        # requested before now is only applied once it's finished.
+        if self.reading_paused:
+            self.loop.remove_reader(self.dev.fd)
+
+    async def _initialise(self):
+
+        self.state = RESETTING
+
         self.log.info("Adding reader to prepare to receive.")
         self.loop.add_reader(self.dev.fd, self.read)
 
         self.log.info("Flushing the RFXtrx buffer.")
         self.flushSerialInput()
 
-        self.log.info("Writing the reset packet to the RFXtrx. (blocking)")
-        yield from self.sendRESET()
+        self.log.info("Writing the reset packet to the RFXtrx.")
+        await self.sendRESET()
 
-        self.log.info("Wating 0.4s")
-        yield from asyncio.sleep(0.4)
+        self.log.info("Waiting %ss" % self.RESET_DELAY)
+        await asyncio.sleep(self.RESET_DELAY)
 
-        self.log.info("Write the status packet (blocking)")
-        yield from self.sendSTATUS()
+        # Anything received before the reset completed is discarded.
+        self.flushSerialInput()
+
+        self.state = REQUESTING_STATUS
+        self.log.info("Requesting the status.")
+        status = await self.request(STATUS_PACKET, self.STATUS_TIMEOUT)
+
+        if self.mode_matches(status):
+            self.log.info("The mode is already set, not writing it.")
+        else:
+            self.state = SETTING_MODE
+            self.log.info("Writing the mode packet.")
+            status = await self.request(MODE_PACKET, self.STATUS_TIMEOUT)
+
+        self.state = READY
+        self.log.info("The RFXtrx is ready.")
 
-        # TODO receive status response, compare it with the needed MODE and
-        # request a new MODE if required. Currently MODE is always sent.
+        return status
 
-        self.log.info("Adding mode packet to the write queue (blocking)")
-        yield from self.sendMODE()
+    def mode_matches(self, status):
+        """Compare the status reported by the RFXtrx with the MODE packet.
+
+        :param status: The status decoded from the RFXtrx's response.
+        :type status: rfxcom.protocol.status.StatusReading
+
+        :return: True if the transceiver type and enabled protocols are the
+            same as the MODE packet would set.
+        :rtype: boolean
+        """
+
+        return (status.transceiver_type == MODE_PACKET[5] and
+                status.protocol_flags == tuple(MODE_PACKET[7:10]))
 
-    @asyncio.coroutine
     def flushSerialInput(self):
         self.dev.flushInput()
+        self.decoder.reset()
+
+    async def send(self, data):
+        """Write a packet to the RFXtrx and wait until it has been written.
+        This transport writes to the device immediately, which blocks.
+
+        :param data: The packet to be written
+        :type data: bytes
+        """
+        self.write(data)
+
+    def _next_sequence_number(self):
+        """Return the next sequence number which isn't used by a request
+        waiting for a response.
+        """
+
+        for _ in range(256):
+            self._sequence_number = (self._sequence_number + 1) % 256
+            if self._sequence_number not in self._requests:
+                return self._sequence_number
+
+        raise RFXComException(
+            "All 256 sequence numbers are waiting for a response.")
+
+    async def request(self, data, timeout=REQUEST_TIMEOUT):
+        """Write a packet to the RFXtrx and wait for the response to it, such
+        as the status or the acknowledgement that a packet was transmitted.
+        The packet is stamped with a sequence number, which the RFXtrx copies
+        to the response, so any number of requests can wait for a response
+        at the same time.
+
+        :param data: The packet to be written, its sequence number (the 4th
+            byte) is replaced.
+        :type data: bytes
+
+        :param timeout: The number of seconds to wait for the response.
+        :type timeout: float
+
+        :raises: :py:class:`asyncio.TimeoutError`: If there is no response
+            within ``timeout`` seconds.
+
+        :return: The decoded response.
+        :rtype: rfxcom.protocol.base.Reading
+        """
+
+        sequence_number = self._next_sequence_number()
+
+        packet = bytearray(data)
+        packet[3] = sequence_number
+
+        future = self.loop.create_future()
+        self._requests[sequence_number] = future
+
+        try:
+            await self.send(bytes(packet))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._requests.pop(sequence_number, None)
+
+    def _resolve_request(self, pkt, reading):
+        """If the packet is a response to a request waiting for one, resolve
+        its future with the reading. Returns True if the packet was matched
+        to a request.
+        """
+
+        if len(pkt) < 4 or pkt[1] not in RESPONSE_TYPES:
+            return False
+
+        future = self._requests.pop(pkt[3], None)
 
-    @asyncio.coroutine
-    def sendRESET(self):
-        super().write(RESET_PACKET)
+        if future is None:
+            return False
 
-    @asyncio.coroutine
-    def sendMODE(self):
-        super().write(MODE_PACKET)
+        if not future.done():
+            if reading is None or type(reading.handler) is Packet:
+                reading = self._decode_response(pkt)
+            future.set_result(reading)
 
-    @asyncio.coroutine
-    def sendSTATUS(self):
-        super().write(STATUS_PACKET)
+        return True
 
-    def do_callback(self, pkt):
+    def _decode_response(self, pkt):
+        """Decode a response with the first response handler which can."""
+
+        for handler in self._response_handlers:
+            if handler.can_handle(pkt):
+                return handler.decode(pkt)
+
+        return self._response_handlers[-1].decode(pkt)
+
+    def _fail_requests(self, exc):
+        """Fail every request waiting for a response."""
+
+        for future in self._requests.values():
+            if not future.done():
+                future.set_exception(exc)
+
+        self._requests.clear()
+
+    async def sendRESET(self):
+        await self.send(RESET_PACKET)
+
+    async def sendMODE(self):
+        await self.send(MODE_PACKET)
+
+    async def sendSTATUS(self):
+        await self.send(STATUS_PACKET)
+
+    def packets(self, maxsize=1000, policy=BLOCK):
+        """Create a :py:class:`rfxcom.transport.packetstream.PacketStream`
+        that every decoded packet is added to, alongside the callbacks. The
+        stream can be consumed with ``async for``.
+
+        :param maxsize: The number of packets held before the policy applies.
+        :type maxsize: int
+
+        :param policy: What to do when the stream is full, one of ``BLOCK``,
+            ``DROP_OLDEST`` or ``DROP_NEWEST`` from
+            :py:mod:`rfxcom.transport.packetstream`.
+        :type policy: str
+
+        :return: The new stream
+        :rtype: PacketStream
+        """
+
+        stream = PacketStream(maxsize, policy, transport=self)
+        self.streams.append(stream)
+        return stream
+
+    def remove_stream(self, stream):
+        """Stop adding packets to a stream, this is called when the stream is
+        closed.
+        """
+
+        if stream in self.streams:
+            self.streams.remove(stream)
+            self.resume_reading()
+
+    def pause_reading(self):
+        """Stop reading from the device until ``resume_reading`` is called.
+        If the RFXtrx is still being set up, reading stops once it's
+        finished.
+        """
+
+        if not self.reading_paused:
+            self.log.debug("READ : Paused")
+            self.reading_paused = True
+
+            if self.state in (READY, FAILED):
+                self.loop.remove_reader(self.dev.fd)
+
+    def resume_reading(self):
+        """Start reading from the device again, unless a stream with the
+        ``BLOCK`` policy is still full.
+        """
+
+        if not self.reading_paused:
+            return
+
+        for stream in self.streams:
+            if stream.policy == BLOCK and stream.full():
+                return
+
+        self.log.debug("READ : Resumed")
+        self.reading_paused = False
+
+        if self.state in (READY, FAILED):
+            self.loop.add_reader(self.dev.fd, self.read)
+
+    def do_callback(self, pkt, timings=None):
         """Add the callback to the event loop, we use call soon because we just
         want it to be called at some point, but don't care when particularly.
+        Callbacks wrapped in a
+        :py:class:`rfxcom.transport.policy.CallbackPolicy` are run where, and
+        as often as, the policy allows. The decoded packet is added to every
+        stream straight away and, if it is a response to a request, the
+        request is resolved.
         """
-        callback, parser = self.get_callback_parser(pkt)
 
-        if asyncio.iscoroutinefunction(callback):
-            self.loop.call_soon_threadsafe(self._do_async_callback,
-                                           callback, parser)
+        try:
+            callback, parser = self.get_callback_parser(pkt, timings)
+        except PacketHandlerNotFound:
+            if self._requests and self._resolve_request(pkt, None):
+                return
+            raise
+
+        if self._requests:
+            self._resolve_request(pkt, parser)
+
+        for stream in self.streams:
+            stream.put(parser)
+
+        if isinstance(callback, Fanout):
+            for subscriber in callback:
+                self._schedule_callback(subscriber, parser)
+        else:
+            self._schedule_callback(callback, parser)
+
+        self.record_dispatch(timings)
+
+        if self.hooks.dispatched:
+            self.hooks.emit(DISPATCHED, self, callback, parser)
+
+    def _schedule_callback(self, callback, parser):
+
+        if isinstance(callback, CallbackPolicy):
+            callback.dispatch(self.loop, parser, self.callback_finished)
+        elif asyncio.iscoroutinefunction(callback):
+            # Coroutine callbacks for the same sensor run in order, and no
+            # more than max_tasks run at once.
+            self.dispatcher.submit(self.ordering_key(parser), callback,
+                                   parser)
         else:
-            self.loop.call_soon(callback, parser)
+            self.loop.call_soon(self.run_callback, callback, parser)
 
-    @staticmethod
-    def _do_async_callback(callback, parser):
-        """ Call a the callback coroutine function in the event loop
-        :param callback: Coroutine function
-        :param parser: Packet parser found for received packet
+    def queue_depth(self):
+        """The number of coroutine callbacks waiting in the dispatcher and
+        packets waiting in the streams.
         """
-        asyncio.async(callback(parser))
+        return self.dispatcher.queued + sum(len(s) for s in self.streams)
 
     def read(self):
-        """We have been called to read! As a consumer, continue to read for
-        the length of the packet and then pass to the callback.
+        """We have been called to read! As a consumer, read everything that
+        is available and pass each complete packet to the callback. A partial
+        packet is kept until the next time we are called.
         """
 
-        data = self.dev.read()
+        data = self.dev.read(self.dev.in_waiting or 1)
 
         if len(data) == 0:
             self.log.warning("READ : Nothing received")
             return
 
-        if data == b'\x00':
-            self.log.warning("READ : Empty packet (Got \\x00)")
-            return
-
-        pkt = bytearray(data)
-        data = self.dev.read(pkt[0])
-        pkt.extend(bytearray(data))
-
-        self.log.info("READ : %s" % self.format_packet(pkt))
-        self.do_callback(pkt)
-        return pkt
+        return self.data_received(data)
@@ -3,18 +3,25 @@ rfxcom.transport.base
 =====================
 
 """
-from logging import getLogger
+from logging import INFO, getLogger
+from time import perf_counter
 
 from serial import Serial
 
 from rfxcom.exceptions import PacketHandlerNotFound, RFXComException
-from rfxcom.protocol import HANDLERS
+from rfxcom.metrics import TransportMetrics
+from rfxcom.protocol.base import PacketView
+from rfxcom.protocol.stream import StreamDecoder
+from rfxcom.timing import Timings, monotonic_ns
+from rfxcom.transport.hooks import (CALLBACK_FINISHED, DECODED, DISPATCHED,
+                                    FRAME_RECEIVED, WRITTEN, Hooks)
+from rfxcom.transport.subscriptions import DEFAULT, Subscriptions
 
 
 class BaseTransport:
 
     def __init__(self, device, callback=None, callbacks=None,
-                 SerialClass=None):
+                 SerialClass=None, lazy=False):
 
         self.log = getLogger('rfxcom.transport.%s' % self.__class__.__name__)
 
@@ -26,6 +33,11 @@ class BaseTransport:
         else:
             self.dev = device
 
+        self.decoder = StreamDecoder()
+        self.lazy = lazy
+        self.metrics = TransportMetrics()
+        self.hooks = Hooks()
+
         self._setup_callbacks(callback, callbacks)
 
     def format_packet(self, pkt):
@@ -40,81 +52,265 @@ class BaseTransport:
 
         elif callback is not None:
             self.callbacks = {}
-            self.default_callback = callback
+            self.subscriptions = Subscriptions.from_callbacks({}, callback)
             self.log.info("Starting with individual callback: %s" % callback)
 
+        elif isinstance(callbacks, Subscriptions):
+            self.callbacks = {}
+            self.subscriptions = callbacks
+            self.log.info("Starting with %s subscriptions." % len(callbacks))
+
         elif callbacks is not None:
 
             self.callbacks = callbacks
-            self.default_callback = self.callbacks.pop('*', None)
+            default_callback = self.callbacks.pop(DEFAULT, None)
+            self.subscriptions = Subscriptions.from_callbacks(
+                self.callbacks, default_callback)
 
             for packet, callback in self.callbacks.items():
                 self.log.info("Callback %s added for packet %s" % (
                               callback, packet))
 
-            if self.default_callback is not None:
-                self.log.info("Default callback: %s" %
-                              self.default_callback)
+            if default_callback is not None:
+                self.log.info("Default callback: %s" % default_callback)
             else:
                 self.log.warning("No default callback provided.")
 
-    def get_callback_parser(self, pkt):
+    @property
+    def default_callback(self):
+        """The callback for the packets no other subscription matches, or
+        None. Setting it replaces the ``DEFAULT`` subscription.
+        """
+        return self.subscriptions.default
 
-        for PacketParser, callback in self.callbacks.items():
+    @default_callback.setter
+    def default_callback(self, callback):
+        self.subscriptions.subscribe(DEFAULT, callback)
 
-            parser = PacketParser()
+    def subscribe(self, key, callback, sensor_id=None):
+        """Subscribe a callback to the packets matching a key, see
+        :py:meth:`rfxcom.transport.subscriptions.Subscriptions.subscribe`.
+        """
+        self.subscriptions.subscribe(key, callback, sensor_id=sensor_id)
 
-            if parser.can_handle(pkt):
-                parser.load(pkt)
-                return callback, parser
+    def unsubscribe(self, key, callback, sensor_id=None):
+        """Remove a subscription added with ``subscribe``."""
+        self.subscriptions.unsubscribe(key, callback, sensor_id=sensor_id)
+
+    def get_callback_parser(self, pkt, timings=None):
+        """Find the packet handler for a packet and decode it.
+
+        The packet is routed by the transport's
+        :py:class:`rfxcom.transport.subscriptions.Subscriptions`. When more
+        than one subscription matches the packet the callback is a
+        :py:class:`rfxcom.transport.subscriptions.Fanout` of them all, and
+        when none do (because they are limited to other sensors and there is
+        no default callback) it is an empty ``Fanout``.
+
+        :param pkt: The raw untouched bytearray as recieved by the RFXtrx
+        :type pkt: bytearray
 
-        if not self.default_callback:
-            raise PacketHandlerNotFound("No packet handler found for %s" %
-                                        self.format_packet(pkt))
+        :param timings: The stamps of the packet so far, the ``decoded``
+            stamp is added and the reading keeps them in ``timings``.
+        :type timings: rfxcom.timing.Timings
 
-        for PacketParser in HANDLERS:
+        :raises: :py:class:`rfxcom.exceptions.PacketHandlerNotFound`: If no
+            handler understands the packet and there is no default callback.
+
+        :return: A tuple of the callback to be called and the decoded
+            :py:class:`rfxcom.protocol.base.Reading`, or a
+            :py:class:`rfxcom.protocol.base.PacketView` if the transport was
+            created with ``lazy=True``.
+        :rtype: tuple
+        """
+
+        metrics = self.metrics
+        metrics.count_packet(pkt)
+
+        for parser, callback, by_sensor in self.subscriptions.route(pkt):
 
-            parser = PacketParser()
             if parser.can_handle(pkt):
-                parser.load(pkt)
-                break
 
-        return self.default_callback, parser
+                start = monotonic_ns()
+
+                if self.lazy:
+                    reading = parser.view(pkt)
+                else:
+                    reading = parser.decode(pkt)
+
+                decoded = monotonic_ns()
+                metrics.decode_time.observe((decoded - start) / 1e9)
+
+                if timings is not None:
+                    timings.decoded = decoded
+                    reading.timings = timings
+
+                if self.hooks.decoded:
+                    self.hooks.emit(DECODED, self, pkt, reading)
+
+                if by_sensor is not None:
+                    callback = by_sensor.get(
+                        getattr(reading, 'sensor_id', None), callback)
+
+                return callback, reading
+
+        metrics.handler_not_found += 1
+
+        raise PacketHandlerNotFound("No packet handler found for %s" %
+                                    self.format_packet(pkt))
+
+    def queue_depth(self):
+        """The number of packets waiting to be passed to a callback or
+        consumer. The callbacks are called as soon as a packet is read, so
+        this is always 0 unless a subclass queues packets.
+        """
+        return 0
+
+    def metrics_snapshot(self):
+        """Return the transport's metrics as a dict, see
+        :py:class:`rfxcom.metrics.TransportMetrics`. It also includes the
+        current ``queue_depth`` and the ``framing_errors``, the number of
+        bytes skipped between packets because they couldn't start one.
+        """
+
+        return self.metrics.snapshot(framing_errors=self.decoder.skipped,
+                                     queue_depth=self.queue_depth())
+
+    def ordering_key(self, reading):
+        """The key the callbacks are run in order by, the packet handler and
+        the sensor ID. A :py:class:`rfxcom.protocol.base.PacketView` that
+        hasn't been decoded is keyed by its handler alone, as reading the
+        sensor ID would decode it.
+
+        :param reading: The decoded reading or the view of the packet.
+
+        :rtype: tuple
+        """
+
+        handler = reading.handler.__class__
+
+        if isinstance(reading, PacketView) and not reading.decoded:
+            return (handler, None)
+
+        return (handler, getattr(reading, 'sensor_id', None))
+
+    def record_dispatch(self, timings):
+        """Stamp a packet's timings as dispatched to its callback and
+        record the time the packet took to arrive and to get this far.
+
+        :param timings: The stamps of the packet, or None.
+        :type timings: rfxcom.timing.Timings
+        """
+
+        if timings is None:
+            return
+
+        timings.dispatched = monotonic_ns()
+
+        metrics = self.metrics
+        metrics.frame_time.observe(
+            (timings.framed - timings.first_byte) / 1e9)
+        metrics.dispatch_latency.observe(
+            (timings.dispatched - timings.framed) / 1e9)
+
+    def run_callback(self, callback, reading):
+        """Call a callback with a reading and record how long it took."""
+
+        start = perf_counter()
+
+        try:
+            callback(reading)
+        finally:
+            self.callback_finished(callback, reading, perf_counter() - start)
+
+    def callback_finished(self, callback, reading, seconds):
+        """Record the seconds a callback took and call the
+        ``CALLBACK_FINISHED`` hooks.
+        """
+
+        self.metrics.callback_time.observe(seconds)
+
+        if self.hooks.callback_finished:
+            self.hooks.emit(CALLBACK_FINISHED, self, callback, reading,
+                            seconds)
 
     def write(self, data):
 
         assert type(data) == bytes
 
         pkt = bytearray(data)
-        self.log.info("WRITE: %s" % self.format_packet(pkt))
+
+        if self.log.isEnabledFor(INFO):
+            self.log.info("WRITE: %s" % self.format_packet(pkt))
+
+        if self.hooks.written:
+            self.hooks.emit(WRITTEN, self, pkt)
+
         self.dev.write(pkt)
 
     def read(self):
+        """Read everything the device has available, or wait for a single
+        byte if nothing is available, and pass every complete packet to the
+        callback.
+
+        :return: The last complete packet read or None.
+        :rtype: bytearray
+        """
 
         self.log.debug("READ : STARTING")
-        data = self.dev.read()
+        data = self.dev.read(self.dev.in_waiting or 1)
+
+        if len(data) == 0:
+            self.log.debug("READ : Nothing received")
+            return
+
+        return self.data_received(data)
 
-        while True:
+    def data_received(self, data):
+        """Frame the bytes received into packets and pass every complete
+        packet to the callback. Partial packets are buffered until the rest
+        of the packet is received. A packet that no handler can decode is
+        logged and counted in the metrics, and the packets after it are
+        still passed on.
 
-            if len(data) == 0:
-                self.log.debug("READ : Nothing received")
-                return
+        :param data: The bytes received from the device.
+        :type data: bytes
 
-            if data == b'\x00':
-                self.log.debug("READ : Empty packet (Got \x00)")
-                return
+        :return: The last complete packet or None.
+        :rtype: bytearray
+        """
 
-            pkt = bytearray(data)
-            data = self.dev.read(pkt[0])
-            pkt.extend(bytearray(data))
-            break
+        self.metrics.bytes_read += len(data)
+        self.decoder.feed(data)
+
+        decoder = self.decoder
+        hooks = self.hooks
+        log_packets = self.log.isEnabledFor(INFO)
+        pkt = None
+
+        for pkt in decoder:
+
+            if log_packets:
+                self.log.info("READ : %s" % self.format_packet(pkt))
+
+            if hooks.frame_received:
+                hooks.emit(FRAME_RECEIVED, self, pkt)
+
+            try:
+                self.do_callback(pkt, Timings(decoder.first_byte_ns,
+                                              decoder.framed_ns))
+            except PacketHandlerNotFound:
+                self.log.warning("No packet handler found for %s"
+                                 % self.format_packet(pkt))
 
-        self.log.info("READ : %s" % self.format_packet(pkt))
-        self.do_callback(pkt)
         return pkt
 
-    def do_callback(self, pkt):
+    def do_callback(self, pkt, timings=None):
+
+        callback, parser = self.get_callback_parser(pkt, timings)
+        self.record_dispatch(timings)
 
-        callback, parser = self.get_callback_parser(pkt)
+        if self.hooks.dispatched:
+            self.hooks.emit(DISPATCHED, self, callback, parser)
 
-        callback(parser)
+        self.run_callback(callback, parser)
@@ -0,0 +1,181 @@
+"""
+rfxcom.transport.dispatcher
+===========================
+
+"""
+
+import time
+from collections import deque
+from logging import getLogger
+
+
+class LatencyStats:
+    """The number, total and maximum of a series of durations in seconds."""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'max': self.max,
+        }
+
+
+class AsyncDispatcher:
+    """Run coroutine callbacks with a bounded number of tasks, keeping the
+    callbacks for each key in order.
+
+    Packets are sharded by a key, which the transports make from the packet
+    handler and the sensor ID. The callbacks for one key run one at a time
+    in the order they were submitted, while different keys run concurrently
+    in at most ``limit`` tasks. When every task is busy, keys wait their turn
+    and a task that still has work for its key hands over to a waiting key
+    after each callback, so a busy sensor can't starve the others.
+
+    The dispatcher keeps the metrics returned by ``as_dict``: the number of
+    callbacks ``queued`` and the most there have been, the number of tasks
+    ``running``, the callbacks ``completed`` and ``failed``, and the time the
+    callbacks waited to start (``wait_time``) and took to run
+    (``run_time``).
+
+    :param loop: The event loop to create the tasks on.
+
+    :param limit: The maximum number of tasks running at the same time.
+    :type limit: int
+
+    :param finished: A function called with the callback, the packet and the
+        seconds it took after each callback, such as the transport's
+        ``callback_finished``.
+    """
+
+    def __init__(self, loop, limit=100, finished=None):
+
+        if limit < 1:
+            raise ValueError("limit must be at least 1, got %s" % limit)
+
+        self.log = getLogger('rfxcom.transport.%s' % self.__class__.__name__)
+
+        self.loop = loop
+        self.limit = limit
+
+        self.queued = 0
+        self.max_queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time = LatencyStats()
+        self.run_time = LatencyStats()
+        self.finished = finished
+
+        self._shards = {}
+        self._waiting = deque()
+
+    def submit(self, key, callback, packet):
+        """Schedule ``callback(packet)``, a coroutine, after the callbacks
+        already submitted for the key.
+        """
+
+        shard = self._shards.get(key)
+
+        if shard is None:
+            shard = self._shards[key] = deque()
+            active = False
+        else:
+            active = True
+
+        shard.append((callback, packet, time.monotonic()))
+
+        self.queued += 1
+        if self.queued > self.max_queued:
+            self.max_queued = self.queued
+
+        if active:
+            return
+
+        if self.running < self.limit:
+            self._start(key)
+        else:
+            self._waiting.append(key)
+
+    def _start(self, key):
+
+        self.running += 1
+        self.loop.create_task(self._drain(key))
+
+    async def _drain(self, key):
+
+        shard = self._shards[key]
+        handed_over = False
+
+        try:
+            while shard:
+
+                callback, packet, queued_at = shard.popleft()
+                self.queued -= 1
+
+                started = time.monotonic()
+                self.wait_time.add(started - queued_at)
+
+                try:
+                    await callback(packet)
+                except Exception:
+                    self.failed += 1
+                    self.log.exception("Callback %s failed for %s" % (
+                                       callback, packet))
+                else:
+                    self.completed += 1
+
+                elapsed = time.monotonic() - started
+                self.run_time.add(elapsed)
+
+                if self.finished is not None:
+                    self.finished(callback, packet, elapsed)
+
+                if shard and self._waiting:
+                    # Let a waiting key have the task, this one queues up
+                    # behind it.
+                    self._waiting.append(key)
+                    handed_over = True
+                    return
+
+        finally:
+            if not handed_over:
+                # The shard is only left with callbacks if the task was
+                # cancelled, and they are dropped with it.
+                del self._shards[key]
+                self.queued -= len(shard)
+
+            self.running -= 1
+
+            if self._waiting:
+                self._start(self._waiting.popleft())
+
+    def __len__(self):
+        return self.queued
+
+    def as_dict(self):
+        return {
+            'queued': self.queued,
+            'max_queued': self.max_queued,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'wait_time': self.wait_time.as_dict(),
+            'run_time': self.run_time.as_dict(),
+        }
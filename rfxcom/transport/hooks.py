@@ -0,0 +1,105 @@
+"""
+rfxcom.transport.hooks
+======================
+
+Hooks are called at each step a packet takes through a transport, for
+tracing and debugging without changing the callbacks. Every transport has a
+:py:class:`Hooks` in its ``hooks`` attribute:
+
+.. code-block:: python
+
+    from rfxcom.transport.hooks import DECODED
+
+    def trace(transport, pkt, reading):
+        print(transport.format_packet(pkt), reading)
+
+    transport.hooks.add(DECODED, trace)
+
+The hooks for each event are kept in a tuple, which is empty when nothing is
+added, so an event without hooks costs the transport a single attribute
+check.
+
+The events and the arguments their hooks are called with are:
+
+- ``FRAME_RECEIVED``: ``(transport, pkt)`` when a complete packet has been
+  framed from the bytes read, before it is decoded.
+- ``DECODED``: ``(transport, pkt, reading)`` when a packet handler has
+  decoded the packet.
+- ``DISPATCHED``: ``(transport, callback, reading)`` when the reading has
+  been passed, or scheduled to be passed, to its callback.
+- ``CALLBACK_FINISHED``: ``(transport, callback, reading, seconds)`` when a
+  callback run by the transport, or a coroutine callback run by its
+  dispatcher, has returned or raised.
+- ``WRITTEN``: ``(transport, data)`` when a packet is written to the
+  RFXtrx, or queued to be written by the
+  :py:class:`rfxcom.transport.nonblocking.NonBlockingTransport`.
+"""
+
+from logging import getLogger
+
+FRAME_RECEIVED = 'frame_received'
+DECODED = 'decoded'
+DISPATCHED = 'dispatched'
+CALLBACK_FINISHED = 'callback_finished'
+WRITTEN = 'written'
+
+#: Every event hooks can be added for.
+EVENTS = (FRAME_RECEIVED, DECODED, DISPATCHED, CALLBACK_FINISHED, WRITTEN)
+
+log = getLogger('rfxcom.transport.hooks')
+
+
+class Hooks:
+    """The hooks added to a transport, in a tuple attribute for each event
+    which is empty when there are none.
+    """
+
+    __slots__ = EVENTS
+
+    def __init__(self):
+
+        for event in EVENTS:
+            setattr(self, event, ())
+
+    def add(self, event, hook):
+        """Call ``hook`` for every ``event``, after the hooks already added.
+
+        :param event: One of ``EVENTS``.
+        :type event: str
+
+        :param hook: The function to call, see the module documentation for
+            its arguments.
+
+        :raises: ValueError: If the event is unknown.
+        """
+
+        if event not in EVENTS:
+            raise ValueError("Unknown event %r, expected one of %s" % (
+                             event, ", ".join(EVENTS)))
+
+        setattr(self, event, getattr(self, event) + (hook, ))
+
+    def remove(self, event, hook):
+        """Stop calling a hook added with ``add``.
+
+        :raises: ValueError: If the hook wasn't added for the event.
+        """
+
+        hooks = list(getattr(self, event, ()))
+
+        if hook not in hooks:
+            raise ValueError("%r is not a hook for %r" % (hook, event))
+
+        hooks.remove(hook)
+        setattr(self, event, tuple(hooks))
+
+    def emit(self, event, *args):
+        """Call every hook for an event. A hook that raises is logged and
+        doesn't stop the others or the packet.
+        """
+
+        for hook in getattr(self, event):
+            try:
+                hook(*args)
+            except Exception:
+                log.exception("Hook %s failed for %s" % (hook, event))
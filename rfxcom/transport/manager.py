@@ -0,0 +1,304 @@
+"""
+rfxcom.transport.manager
+========================
+
+"""
+
+import glob
+import time
+from collections import namedtuple
+from logging import getLogger
+
+from rfxcom.transport.nonblocking import NonBlockingTransport
+from rfxcom.transport.packetstream import BLOCK, PacketStream
+
+#: A packet received by a :py:class:`DeviceManager`, tagged with the name of
+#: the device which received it.
+TaggedPacket = namedtuple('TaggedPacket', ['device', 'packet'])
+
+
+class DeviceStats:
+    """The number of packets and errors seen for a single device managed by
+    a :py:class:`DeviceManager`. The stats are kept when the device is
+    disconnected and added to when it is reconnected.
+    """
+
+    __slots__ = ('device', 'packets', 'errors', 'connected', 'connected_at',
+                 'last_packet_at', '_packets_at_connect')
+
+    def __init__(self, device):
+        self.device = device
+        self.packets = 0
+        self.errors = 0
+        self.connected = False
+        self.connected_at = None
+        self.last_packet_at = None
+        self._packets_at_connect = 0
+
+    def connect(self):
+        self.connected = True
+        self.connected_at = time.monotonic()
+        self._packets_at_connect = self.packets
+
+    @property
+    def rate(self):
+        """The average number of packets received per second since the device
+        was last connected.
+        """
+
+        if not self.connected:
+            return 0.0
+
+        packets = self.packets - self._packets_at_connect
+        elapsed = time.monotonic() - self.connected_at
+        return packets / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'device': self.device,
+            'packets': self.packets,
+            'errors': self.errors,
+            'connected': self.connected,
+            'rate': self.rate,
+            'last_packet_at': self.last_packet_at,
+        }
+
+
+class DeviceManager:
+    """Manage a number of RFXtrx devices on one event loop. The packets from
+    every device are merged into streams of :py:class:`TaggedPacket`, created
+    with ``packets``, and the stats for each device are kept in ``stats``.
+
+    Devices can be added and removed by name with ``add`` and ``remove``. If
+    ``patterns`` are given, ``start`` also looks for devices matching the
+    glob patterns every ``scan_interval`` seconds. Devices that appear are
+    added, and devices that disappear or fail are removed, so they are
+    reconnected if they come back.
+
+    .. code-block:: python
+
+        manager = DeviceManager(loop, ['/dev/serial/by-id/usb-RFXCOM_*'])
+        manager.start()
+
+        async for tagged in manager.packets():
+            print(tagged.device, tagged.packet)
+
+    :param loop: The event loop the transports are created on.
+
+    :param patterns: Glob patterns matching the names of the devices to add.
+    :type patterns: list
+
+    :param scan_interval: The number of seconds between looking for devices.
+    :type scan_interval: float
+
+    :param transport_class: The transport created for each device, it is
+        passed the device name, the loop and ``transport_kwargs``.
+    """
+
+    def __init__(self, loop, patterns=(), scan_interval=5.0,
+                 transport_class=NonBlockingTransport, **transport_kwargs):
+
+        self.log = getLogger('rfxcom.transport.%s' % self.__class__.__name__)
+
+        self.loop = loop
+        self.patterns = list(patterns)
+        self.scan_interval = scan_interval
+        self.transport_class = transport_class
+        self.transport_kwargs = transport_kwargs
+
+        self.transports = {}
+        self.stats = {}
+        self.streams = []
+        self.reading_paused = False
+
+        self._scan_handle = None
+
+    def start(self):
+        """Add the devices matching the patterns and keep looking for devices
+        every ``scan_interval`` seconds.
+        """
+
+        self.scan()
+
+        if self.patterns:
+            self._scan_handle = self.loop.call_later(
+                self.scan_interval, self._scan_later)
+
+    def _scan_later(self):
+
+        self.scan()
+        self._scan_handle = self.loop.call_later(
+            self.scan_interval, self._scan_later)
+
+    def scan(self):
+        """Remove the devices that have failed or disappeared, and add the
+        devices matching the patterns that aren't managed yet.
+        """
+
+        found = set()
+
+        for pattern in self.patterns:
+            found.update(glob.glob(pattern))
+
+        for device, transport in list(self.transports.items()):
+            if not getattr(transport, 'connected', True):
+                self.log.warning("Device %s has failed." % device)
+                self.stats[device].errors += 1
+                self.remove(device)
+            elif self.patterns and device not in found:
+                self.log.warning("Device %s has disappeared." % device)
+                self.remove(device)
+
+        for device in sorted(found):
+            if device not in self.transports:
+                self.add(device)
+
+    def add(self, device):
+        """Create a transport for a device and merge its packets into the
+        streams.
+
+        :param device: The name of the serial device.
+        :type device: str
+
+        :return: The transport or None if it couldn't be created.
+        """
+
+        if device in self.transports:
+            return self.transports[device]
+
+        stats = self.stats.get(device)
+
+        if stats is None:
+            stats = self.stats[device] = DeviceStats(device)
+
+        def callback(packet):
+            self._received(stats, packet)
+
+        try:
+            transport = self.transport_class(
+                device, self.loop, callback=callback, **self.transport_kwargs)
+        except Exception:
+            self.log.exception("Failed to open device %s." % device)
+            stats.errors += 1
+            return None
+
+        self.log.info("Added device %s." % device)
+
+        self.transports[device] = transport
+        stats.connect()
+
+        ready = getattr(transport, 'ready', None)
+
+        if ready is not None:
+            ready.add_done_callback(
+                lambda future: self._ready(device, transport, future))
+
+        if self.reading_paused:
+            transport.pause_reading()
+
+        return transport
+
+    def _ready(self, device, transport, future):
+
+        if future.cancelled() or future.exception() is None:
+            return
+
+        # Closing a device while it is initialised also fails it.
+        if self.transports.get(device) is transport:
+            self.log.error("Failed to initialise device %s." % device)
+            self.stats[device].errors += 1
+            self.remove(device)
+
+    def remove(self, device):
+        """Stop managing a device and close its transport."""
+
+        transport = self.transports.pop(device, None)
+
+        if transport is None:
+            return
+
+        self.log.info("Removed device %s." % device)
+        self.stats[device].connected = False
+
+        close = getattr(transport, 'close', None)
+
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                self.log.exception("Failed to close device %s." % device)
+
+    def close(self):
+        """Stop looking for devices, remove every device and close the
+        streams.
+        """
+
+        if self._scan_handle is not None:
+            self._scan_handle.cancel()
+            self._scan_handle = None
+
+        for device in list(self.transports):
+            self.remove(device)
+
+        for stream in list(self.streams):
+            stream.close()
+
+    def _received(self, stats, packet):
+
+        stats.packets += 1
+        stats.last_packet_at = time.time()
+
+        tagged = TaggedPacket(stats.device, packet)
+
+        for stream in self.streams:
+            stream.put(tagged)
+
+    def packets(self, maxsize=1000, policy=BLOCK):
+        """Create a :py:class:`rfxcom.transport.packetstream.PacketStream`
+        of the :py:class:`TaggedPacket` received by every device. With the
+        ``BLOCK`` policy every device is paused while the stream is full.
+
+        :param maxsize: The number of packets held before the policy applies.
+        :type maxsize: int
+
+        :param policy: What to do when the stream is full.
+        :type policy: str
+
+        :return: The new stream
+        :rtype: PacketStream
+        """
+
+        stream = PacketStream(maxsize, policy, transport=self)
+        self.streams.append(stream)
+        return stream
+
+    def remove_stream(self, stream):
+
+        if stream in self.streams:
+            self.streams.remove(stream)
+            self.resume_reading()
+
+    def pause_reading(self):
+        """Stop reading from every device."""
+
+        if not self.reading_paused:
+            self.reading_paused = True
+            for transport in self.transports.values():
+                transport.pause_reading()
+
+    def resume_reading(self):
+        """Start reading from every device again, unless a stream with the
+        ``BLOCK`` policy is still full.
+        """
+
+        if not self.reading_paused:
+            return
+
+        for stream in self.streams:
+            if stream.policy == BLOCK and stream.full():
+                return
+
+        self.reading_paused = False
+
+        for transport in self.transports.values():
+            transport.resume_reading()
@@ -0,0 +1,295 @@
+"""
+rfxcom.transport.nonblocking
+============================
+
+"""
+
+import asyncio
+import os
+from collections import deque
+from logging import INFO
+
+from rfxcom.transport.asyncio import AsyncioTransport
+from rfxcom.transport.hooks import WRITTEN
+
+
+class NonBlockingTransport(AsyncioTransport, asyncio.Protocol):
+    """An asyncio transport which never blocks the event loop.
+
+    The file descriptor of the serial device is switched to non-blocking mode
+    and, each time the loop reports it as readable, everything available is
+    read straight from the file descriptor into a reusable buffer and passed
+    to ``data_received``, as with an :py:class:`asyncio.Protocol`. The
+    pyserial ``read`` method, and its timeout, is never used.
+
+    Writes are queued and written when the loop reports the file descriptor
+    as writable. Interface commands (packet type 0x00) queued together are
+    coalesced into a single write. Every other packet is transmitted over RF
+    by the RFXtrx, so they are written one at a time and at most once every
+    ``tx_interval`` seconds, which stops the RFXtrx dropping commands when a
+    lot are sent at once.
+
+    :param buffer_size: The size of the reusable read buffer. If it is filled
+        the file descriptor is read again until it has no more data.
+    :type buffer_size: int
+
+    :param tx_interval: The minimum number of seconds between writing two
+        packets that are transmitted over RF.
+    :type tx_interval: float
+    """
+
+    #: The default minimum number of seconds between RF transmissions.
+    TX_INTERVAL = 0.1
+
+    def __init__(self, device, loop, callback=None, callbacks=None,
+                 SerialClass=None, lazy=False, max_tasks=100,
+                 buffer_size=4096, tx_interval=TX_INTERVAL):
+
+        super().__init__(device, loop, callback=callback, callbacks=callbacks,
+                         SerialClass=SerialClass, lazy=lazy,
+                         max_tasks=max_tasks)
+
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self.connected = True
+
+        self.tx_interval = tx_interval
+        self._write_queue = deque()
+        self._write_buffer = bytearray()
+        self._write_futures = []
+        self._writer_added = False
+        self._tx_handle = None
+        self._next_tx = 0
+
+        os.set_blocking(self.dev.fd, False)
+
+    def read(self):
+        """Read everything available from the file descriptor without
+        blocking and pass it to ``data_received``. If the device has gone
+        away ``connection_lost`` is called.
+
+        :return: The last complete packet read or None.
+        :rtype: bytearray
+        """
+
+        fd = self.dev.fd
+        buffer_ = [self._view]
+        size = len(self._buffer)
+        pkt = None
+
+        while True:
+
+            try:
+                count = os.readv(fd, buffer_)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self.connection_lost(exc)
+                break
+
+            if count == 0:
+                self.connection_lost(None)
+                break
+
+            pkt = self.data_received(self._view[:count]) or pkt
+
+            if count < size or self.reading_paused:
+                break
+
+        return pkt
+
+    def connection_lost(self, exc):
+        """Called when the device is closed or stops responding. The reader is
+        removed from the loop and any partial packet is discarded.
+
+        :param exc: The exception raised by the read or None at the end of
+            file.
+        :type exc: Exception
+        """
+
+        if exc is None:
+            self.log.warning("READ : End of file, the device was closed")
+        else:
+            self.log.error("READ : The device failed: %s" % exc)
+
+        self.connected = False
+        self.loop.remove_reader(self.dev.fd)
+        self.decoder.reset()
+        self._abort_writes(exc)
+        self._fail_requests(exc or ConnectionError("The device is closed"))
+
+        for stream in list(self.streams):
+            stream.close()
+
+    def resume_reading(self):
+
+        if self.connected:
+            super().resume_reading()
+
+    def close(self):
+        """Stop reading from the device, close it and close the streams."""
+
+        if self.connected:
+            self.connected = False
+            self.loop.remove_reader(self.dev.fd)
+            self._abort_writes(None)
+            self._fail_requests(ConnectionError("The device is closed"))
+
+        for stream in list(self.streams):
+            stream.close()
+
+        self.dev.close()
+
+    def write(self, data):
+        """Queue a packet to be written to the RFXtrx. This never blocks, the
+        packet is written once the file descriptor is writable and, for
+        packets transmitted over RF, ``tx_interval`` has passed since the
+        last one.
+
+        :param data: The packet to be written
+        :type data: bytes
+
+        :return: A future which is done once the packet has been written.
+        :rtype: asyncio.Future
+        """
+
+        assert isinstance(data, bytes)
+
+        future = self.loop.create_future()
+
+        if not self.connected:
+            future.set_exception(ConnectionError("The device is closed"))
+            return future
+
+        if self.log.isEnabledFor(INFO):
+            self.log.info("WRITE: %s" % self.format_packet(data))
+
+        if self.hooks.written:
+            self.hooks.emit(WRITTEN, self, data)
+
+        self._write_queue.append((data, future))
+        self._start_writing()
+
+        return future
+
+    async def send(self, data):
+        """Write a packet to the RFXtrx and wait until it has been written.
+
+        :param data: The packet to be written
+        :type data: bytes
+        """
+        await self.write(data)
+
+    async def drain(self):
+        """Wait until every queued packet has been written."""
+
+        futures = self._write_futures + [f for _, f in self._write_queue]
+
+        if futures:
+            await asyncio.wait(futures)
+
+    def _start_writing(self):
+
+        if not self._writer_added and self._tx_handle is None:
+            self._writer_added = True
+            self.loop.add_writer(self.dev.fd, self._write_ready)
+
+    def _stop_writing(self):
+
+        if self._writer_added:
+            self._writer_added = False
+            self.loop.remove_writer(self.dev.fd)
+
+    def _resume_writing(self):
+
+        self._tx_handle = None
+
+        if self.connected:
+            self._start_writing()
+
+    def _fill_write_buffer(self, now):
+        """Move the packets that can be written now from the queue to the
+        write buffer. Interface commands are coalesced, packets transmitted
+        over RF are written on their own once ``tx_interval`` has passed.
+        """
+
+        queue = self._write_queue
+        buffer_ = self._write_buffer
+
+        while queue:
+
+            data, future = queue[0]
+
+            if len(data) > 1 and data[1] != 0x00:
+
+                if buffer_ or now < self._next_tx:
+                    break
+
+                self._next_tx = now + self.tx_interval
+                buffer_.extend(data)
+                self._write_futures.append(future)
+                queue.popleft()
+                break
+
+            buffer_.extend(data)
+            self._write_futures.append(future)
+            queue.popleft()
+
+    def _write_ready(self):
+        """Called by the loop when the file descriptor is writable."""
+
+        if not self._write_buffer:
+            now = self.loop.time()
+            self._fill_write_buffer(now)
+
+            if not self._write_buffer:
+                # The next packet has to wait for tx_interval.
+                self._stop_writing()
+                if self._write_queue:
+                    self._tx_handle = self.loop.call_later(
+                        self._next_tx - now, self._resume_writing)
+                return
+
+        try:
+            count = os.write(self.dev.fd, self._write_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            self.connection_lost(exc)
+            return
+
+        del self._write_buffer[:count]
+
+        if self._write_buffer:
+            return
+
+        for future in self._write_futures:
+            if not future.done():
+                future.set_result(None)
+
+        del self._write_futures[:]
+
+        if not self._write_queue:
+            self._stop_writing()
+
+    def _abort_writes(self, exc):
+        """Fail every packet that hasn't been written yet."""
+
+        self._stop_writing()
+
+        if self._tx_handle is not None:
+            self._tx_handle.cancel()
+            self._tx_handle = None
+
+        if exc is None:
+            exc = ConnectionError("The device is closed")
+
+        futures = self._write_futures + [f for _, f in self._write_queue]
+
+        for future in futures:
+            if not future.done():
+                future.set_exception(exc)
+
+        del self._write_futures[:]
+        del self._write_buffer[:]
+        self._write_queue.clear()
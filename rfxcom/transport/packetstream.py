@@ -0,0 +1,168 @@
+"""
+rfxcom.transport.packetstream
+=============================
+
+"""
+
+import asyncio
+
+from rfxcom.exceptions import PacketStreamClosed
+
+#: When the stream is full, stop reading from the device until the consumer
+#: catches up.
+BLOCK = 'block'
+
+#: When the stream is full, drop the oldest packet to make room.
+DROP_OLDEST = 'drop_oldest'
+
+#: When the stream is full, drop the packet that was just received.
+DROP_NEWEST = 'drop_newest'
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+# Queued when the stream is closed, to wake up the consumers.
+_CLOSED = object()
+
+
+class PacketStream:
+    """A bounded queue of decoded packets which can be consumed with
+    ``async for``. Streams are usually created with
+    :py:meth:`rfxcom.transport.AsyncioTransport.packets`, which adds every
+    packet the transport decodes to the stream.
+
+    .. code-block:: python
+
+        async for packet in transport.packets(maxsize=100):
+            print(packet.data)
+
+    When the stream holds ``maxsize`` packets the ``policy`` decides what
+    happens to the next one:
+
+    - ``BLOCK`` pauses reading from the device until the consumer has taken
+      a packet. Every packet is delivered, but the packets already read from
+      the device are still added, so the stream can briefly hold more than
+      ``maxsize`` packets.
+    - ``DROP_OLDEST`` drops the oldest packet in the stream.
+    - ``DROP_NEWEST`` drops the packet that was just received.
+
+    The number of packets dropped is counted in ``dropped``.
+
+    :param maxsize: The number of packets held before the policy applies.
+    :type maxsize: int
+
+    :param policy: One of ``BLOCK``, ``DROP_OLDEST`` or ``DROP_NEWEST``.
+    :type policy: str
+
+    :param transport: The transport to pause with the ``BLOCK`` policy.
+    :type transport: rfxcom.transport.AsyncioTransport
+    """
+
+    def __init__(self, maxsize=1000, policy=BLOCK, transport=None):
+
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1, got %s" % maxsize)
+
+        if policy not in POLICIES:
+            raise ValueError("Unknown policy %r, expected one of %s" % (
+                             policy, ", ".join(POLICIES)))
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.transport = transport
+        self.dropped = 0
+        self.closed = False
+
+        self._queue = asyncio.Queue()
+
+    def __len__(self):
+        return self._queue.qsize() - self.closed
+
+    def full(self):
+        """Return True if the stream holds ``maxsize`` or more packets."""
+
+        return len(self) >= self.maxsize
+
+    def put(self, packet):
+        """Add a packet to the stream, applying the policy if it is full. This
+        never blocks, so it can be called from the reader.
+
+        :param packet: The decoded packet.
+
+        :return: False if the packet was dropped or the stream is closed.
+        :rtype: boolean
+        """
+
+        if self.closed:
+            return False
+
+        queue = self._queue
+
+        if queue.qsize() >= self.maxsize:
+
+            if self.policy == DROP_NEWEST:
+                self.dropped += 1
+                return False
+
+            if self.policy == DROP_OLDEST:
+                queue.get_nowait()
+                self.dropped += 1
+
+        queue.put_nowait(packet)
+
+        if (self.policy == BLOCK and self.transport is not None and
+                queue.qsize() >= self.maxsize):
+            self.transport.pause_reading()
+
+        return True
+
+    # A stream can also be used directly as a transport callback.
+    __call__ = put
+
+    async def get(self):
+        """Wait for and return the next packet in the stream.
+
+        :raises: :py:class:`rfxcom.exceptions.PacketStreamClosed`: If the
+            stream was closed and every packet has been consumed.
+        """
+
+        queue = self._queue
+        packet = await queue.get()
+
+        if packet is _CLOSED:
+            # Leave it for any other consumers.
+            queue.put_nowait(_CLOSED)
+            raise PacketStreamClosed("The packet stream is closed")
+
+        transport = self.transport
+
+        if (self.policy == BLOCK and transport is not None and
+                transport.reading_paused and not self.full()):
+            transport.resume_reading()
+
+        return packet
+
+    def close(self):
+        """Stop adding packets to the stream. Consumers will receive the
+        packets already in the stream before their iteration ends.
+        """
+
+        if self.closed:
+            return
+
+        self.closed = True
+        self._queue.put_nowait(_CLOSED)
+
+        transport = self.transport
+
+        if transport is not None:
+            transport.remove_stream(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+
+        try:
+            return await self.get()
+        except PacketStreamClosed:
+            raise StopAsyncIteration
@@ -0,0 +1,177 @@
+"""
+rfxcom.transport.policy
+=======================
+
+Callback policies decide where an :py:class:`rfxcom.transport.AsyncioTransport`
+runs a callback and how many packets it may handle at the same time. Wrap a
+callback in a policy wherever a callback is accepted:
+
+.. code-block:: python
+
+    from rfxcom.transport.policy import InProcess, InThread
+
+    transport = AsyncioTransport(dev_name, loop, callbacks={
+        protocol.Elec: InProcess(compute_aggregates, limit=2),
+        '*': InThread(save_to_sqlite, limit=1),
+    })
+
+When ``limit`` callbacks are running, the next packets are queued and
+passed to the callback in order as the running ones finish.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from logging import getLogger
+from time import perf_counter
+
+
+class CallbackPolicy:
+    """The base class for callback policies.
+
+    :param callback: The function or coroutine function to call with each
+        decoded packet.
+
+    :param limit: The maximum number of packets handled by the callback at
+        the same time, or None for no limit.
+    :type limit: int
+    """
+
+    def __init__(self, callback, limit=None):
+
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1, got %s" % limit)
+
+        self.log = getLogger('rfxcom.transport.%s' % self.__class__.__name__)
+
+        self.callback = callback
+        self.limit = limit
+        self.running = 0
+        self.backlog = deque()
+
+    def dispatch(self, loop, packet, finished=None):
+        """Run the callback for a packet, or queue the packet if ``limit``
+        callbacks are already running.
+
+        :param finished: A function called with the callback, the packet and
+            the seconds from the callback being started to it finishing,
+            such as the transport's ``callback_finished``.
+        """
+
+        if self.limit is not None and self.running >= self.limit:
+            self.backlog.append((packet, finished))
+            return
+
+        self._start(loop, packet, finished)
+
+    def _start(self, loop, packet, finished):
+
+        self.running += 1
+        started = perf_counter()
+
+        try:
+            future = self.run(loop, packet)
+        except Exception:
+            self.log.exception("Callback %s failed." % self.callback)
+            self._finished(loop, packet, finished, started)
+            return
+
+        if future.done():
+            self._done(loop, future, packet, finished, started)
+        else:
+            future.add_done_callback(lambda future: self._done(
+                loop, future, packet, finished, started))
+
+    def _done(self, loop, future, packet, finished, started):
+
+        if not future.cancelled() and future.exception() is not None:
+            self.log.error("Callback %s failed." % self.callback,
+                           exc_info=future.exception())
+
+        self._finished(loop, packet, finished, started)
+
+    def _finished(self, loop, packet, finished, started):
+
+        self.running -= 1
+
+        if finished is not None:
+            finished(self.callback, packet, perf_counter() - started)
+
+        if self.backlog:
+            self._start(loop, *self.backlog.popleft())
+
+    def run(self, loop, packet):
+        """Start running the callback for a packet.
+
+        :return: A future which is done when the callback has finished.
+        :rtype: asyncio.Future
+        """
+        raise NotImplementedError()
+
+    def __repr__(self):
+        return "<{0} {1!r} limit={2}>".format(
+            self.__class__.__name__, self.callback, self.limit)
+
+
+class Inline(CallbackPolicy):
+    """Run the callback on the event loop. A coroutine function is run as a
+    task, so ``limit`` bounds the number of tasks running at once, a plain
+    function is called directly.
+    """
+
+    def run(self, loop, packet):
+
+        if asyncio.iscoroutinefunction(self.callback):
+            return asyncio.ensure_future(self.callback(packet), loop=loop)
+
+        # The callback has already run, so the future is returned done and
+        # the next packet can be handled straight away.
+        future = loop.create_future()
+        future.set_result(self.callback(packet))
+        return future
+
+
+class InThread(CallbackPolicy):
+    """Run the callback in a thread pool, for callbacks that block, for
+    example by writing to a database.
+
+    :param executor: The :py:class:`concurrent.futures.ThreadPoolExecutor` to
+        use, or None for the loop's default executor.
+    """
+
+    def __init__(self, callback, limit=None, executor=None):
+        super().__init__(callback, limit=limit)
+        self.executor = executor
+
+    def run(self, loop, packet):
+        return loop.run_in_executor(self.executor, self.callback, packet)
+
+
+class InProcess(CallbackPolicy):
+    """Run the callback in a process pool, for CPU heavy callbacks. The
+    callback and the decoded packet are pickled to be sent to the process, so
+    the callback needs to be defined at the top level of a module.
+
+    :param executor: The :py:class:`concurrent.futures.ProcessPoolExecutor`
+        to use. If it isn't given, one with ``limit`` processes is created
+        when it is first needed and closed by ``shutdown``.
+    """
+
+    def __init__(self, callback, limit=None, executor=None):
+        super().__init__(callback, limit=limit)
+        self.executor = executor
+        self._own_executor = executor is None
+
+    def run(self, loop, packet):
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.limit)
+
+        return loop.run_in_executor(self.executor, self.callback, packet)
+
+    def shutdown(self, wait=True):
+        """Shut down the process pool, if it was created by the policy."""
+
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
@@ -0,0 +1,339 @@
+"""
+rfxcom.transport.subscriptions
+==============================
+
+"""
+
+from collections import OrderedDict
+from inspect import isclass
+
+from rfxcom.protocol import HANDLERS
+from rfxcom.protocol.base import BasePacket
+
+#: The key for the default callback, which receives the packets that no other
+#: subscription matches.
+DEFAULT = '*'
+
+#: Used as the subtype in a ``(packet_type, ANY_SUBTYPE)`` key to subscribe
+#: to every subtype of a packet type.
+ANY_SUBTYPE = '*'
+
+
+class Fanout:
+    """A callable which calls a number of callbacks in order with the same
+    packet. It is returned as the callback when more than one subscription
+    matches a packet. If a callback raises an exception, the callbacks after
+    it are not called.
+    """
+
+    __slots__ = ('callbacks',)
+
+    def __init__(self, callbacks):
+        self.callbacks = tuple(callbacks)
+
+    def __call__(self, packet):
+        for callback in self.callbacks:
+            callback(packet)
+
+    def __iter__(self):
+        return iter(self.callbacks)
+
+    def __len__(self):
+        return len(self.callbacks)
+
+    def __eq__(self, other):
+        if isinstance(other, Fanout):
+            return self.callbacks == other.callbacks
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.callbacks)
+
+    def __repr__(self):
+        return "<Fanout %r>" % (self.callbacks, )
+
+
+def _normalise_sensor_id(sensor_id):
+    """Accept a sensor ID as an int or formatted like ``Reading.id``."""
+
+    if sensor_id is None or isinstance(sensor_id, int):
+        return sensor_id
+
+    try:
+        return int(sensor_id, 16)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid sensor ID %r" % (sensor_id, ))
+
+
+def _callback_for(subscriptions):
+    """Return a single callable for a list of ``(order, callback)`` pairs,
+    calling each distinct callback once in the order they subscribed.
+    """
+
+    callbacks = []
+
+    for _, callback in sorted(subscriptions, key=lambda s: s[0]):
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    return Fanout(callbacks)
+
+
+class Subscriptions:
+    """A registry of the callbacks a transport dispatches packets to. A
+    subscription key is one of:
+
+    - A packet handler class, which matches the packets it decodes.
+    - A ``(packet_type, packet_subtype)`` tuple, which matches packets with
+      that header whatever handler decodes them. Use ``ANY_SUBTYPE`` as the
+      subtype to match every subtype of the type.
+    - ``DEFAULT`` (``'*'``) for the default callback, which receives the
+      packets that no other subscription matches.
+
+    Any subscription apart from the default can be limited to a single
+    sensor by also passing the ``sensor_id``, as an int or formatted like
+    the ``id`` of a reading, for example ``"0x2EB2"``.
+
+    .. code-block:: python
+
+        subscriptions = Subscriptions()
+        subscriptions.subscribe(protocol.Elec, elec_handler)
+        subscriptions.subscribe((0x52, ANY_SUBTYPE), temp_humidity_handler)
+        subscriptions.subscribe(protocol.TempHumidity, kitchen_handler,
+                                sensor_id="0x2EB2")
+        subscriptions.subscribe(DEFAULT, default_handler)
+
+        transport = AsyncioTransport(dev_name, loop, callbacks=subscriptions)
+
+    Each packet is decoded once, by the first handler that understands it.
+    Handler classes with a subscription are tried in the order they were
+    first subscribed, followed by the ``HANDLERS`` when there is a default
+    callback or a packet type subscription. Every matching callback is then
+    called in the order it subscribed.
+
+    The subscriptions are compiled into an index, keyed by packet type and
+    subtype and then by sensor ID, the first time a packet is routed after a
+    change. Routing a packet is then a couple of dict lookups however many
+    subscriptions there are.
+    """
+
+    def __init__(self):
+
+        self.default = None
+
+        self._subscriptions = []
+        self._order = 0
+        self._handlers = {}
+        self._routes = None
+        self._fallback = None
+
+    @classmethod
+    def from_callbacks(cls, callbacks, default=None):
+        """Create the subscriptions for a dict mapping keys to callbacks, as
+        accepted by the ``callbacks`` argument of the transports.
+        """
+
+        subscriptions = cls()
+
+        for key, callback in callbacks.items():
+            subscriptions.subscribe(key, callback)
+
+        if default is not None:
+            subscriptions.subscribe(DEFAULT, default)
+
+        return subscriptions
+
+    def _check_key(self, key, sensor_id):
+
+        if key == DEFAULT:
+            if sensor_id is not None:
+                raise ValueError(
+                    "The default callback can't be limited to a sensor.")
+            return
+
+        if isclass(key) and issubclass(key, BasePacket):
+            return
+
+        if (isinstance(key, tuple) and len(key) == 2 and
+                isinstance(key[0], int) and
+                (isinstance(key[1], int) or key[1] == ANY_SUBTYPE)):
+            return
+
+        raise ValueError("Invalid subscription key %r" % (key, ))
+
+    def subscribe(self, key, callback, sensor_id=None):
+        """Subscribe a callback to the packets matching a key.
+
+        :param key: A packet handler class, a ``(packet_type,
+            packet_subtype)`` tuple or ``DEFAULT``.
+
+        :param callback: The callable to call with each matching packet.
+
+        :param sensor_id: Only match the packets from this sensor.
+        :type sensor_id: int or str
+        """
+
+        sensor_id = _normalise_sensor_id(sensor_id)
+        self._check_key(key, sensor_id)
+
+        if key == DEFAULT:
+            self.default = callback
+        else:
+            self._order += 1
+            self._subscriptions.append(
+                (self._order, key, callback, sensor_id))
+
+        self._routes = None
+
+    def unsubscribe(self, key, callback, sensor_id=None):
+        """Remove a subscription added with ``subscribe``.
+
+        :raises: ValueError: If there is no such subscription.
+        """
+
+        sensor_id = _normalise_sensor_id(sensor_id)
+
+        if key == DEFAULT and sensor_id is None:
+            if self.default != callback:
+                raise ValueError("%r is not the default callback" % (
+                                 callback, ))
+            self.default = None
+            self._routes = None
+            return
+
+        for subscription in self._subscriptions:
+            if subscription[1:] == (key, callback, sensor_id):
+                self._subscriptions.remove(subscription)
+                self._routes = None
+                return
+
+        raise ValueError("No subscription of %r to %r" % (callback, key))
+
+    def __len__(self):
+        return len(self._subscriptions) + (self.default is not None)
+
+    def _handler(self, PacketHandler):
+        """Return the shared instance of a packet handler class."""
+
+        handler = self._handlers.get(PacketHandler)
+
+        if handler is None:
+            handler = self._handlers[PacketHandler] = PacketHandler()
+
+        return handler
+
+    def compile(self):
+        """Build the index used by ``route``. It is called by ``route``
+        whenever the subscriptions have changed.
+        """
+
+        self._by_class = {}
+        self._by_pair = {}
+        candidates = OrderedDict()
+
+        for order, key, callback, sensor_id in self._subscriptions:
+            if isinstance(key, tuple):
+                subscriptions = self._by_pair.setdefault(key, [])
+            else:
+                subscriptions = self._by_class.setdefault(key, [])
+                candidates.setdefault(key, self._handler(key))
+            subscriptions.append((order, callback, sensor_id))
+
+        if self.default is not None or self._by_pair:
+            for PacketHandler in HANDLERS:
+                candidates.setdefault(PacketHandler,
+                                      self._handler(PacketHandler))
+
+        self._candidates = tuple(candidates.values())
+        self._routes = {}
+
+        for handler in self._candidates:
+            for packet_type in handler.PACKET_TYPES:
+                for packet_subtype in handler.PACKET_SUBTYPES:
+                    key = (packet_type, packet_subtype)
+                    if key not in self._routes:
+                        self._routes[key] = self._match(*key)
+
+        # Entries for packets that are too short to contain a type and
+        # subtype.
+        self._fallback = self._match(None, None)
+
+    def _match(self, packet_type, packet_subtype):
+        """Return the ordered ``(handler, callback, by_sensor)`` entries for
+        the packets with the given type and subtype. ``None`` only matches
+        handlers that don't restrict the type or subtype respectively.
+        """
+
+        matches = []
+
+        for handler in self._candidates:
+            types = handler.PACKET_TYPES
+            subtypes = handler.PACKET_SUBTYPES
+
+            if types and packet_type not in types:
+                continue
+            if subtypes and packet_subtype not in subtypes:
+                continue
+
+            subscriptions = list(self._by_class.get(handler.__class__, ()))
+
+            if packet_type is not None:
+                subscriptions.extend(self._by_pair.get(
+                    (packet_type, packet_subtype), ()))
+                subscriptions.extend(self._by_pair.get(
+                    (packet_type, ANY_SUBTYPE), ()))
+
+            if not subscriptions and self.default is None:
+                # Nothing wants the packets this handler would decode.
+                continue
+
+            general = [(order, callback) for order, callback, sensor_id
+                       in subscriptions if sensor_id is None]
+
+            sensors = {}
+
+            for order, callback, sensor_id in subscriptions:
+                if sensor_id is not None:
+                    sensors.setdefault(sensor_id, []).append(
+                        (order, callback))
+
+            if general:
+                callback = _callback_for(general)
+            elif self.default is not None:
+                callback = self.default
+            else:
+                callback = Fanout(())
+
+            by_sensor = dict(
+                (sensor_id, _callback_for(general + specific))
+                for sensor_id, specific in sensors.items())
+
+            matches.append((handler, callback, by_sensor or None))
+
+        return tuple(matches)
+
+    def route(self, pkt):
+        """Return the ordered ``(handler, callback, by_sensor)`` entries for
+        a packet. The packet should be decoded by the first handler that can
+        handle it, and passed to ``by_sensor[reading.sensor_id]`` if there is
+        one or to ``callback`` otherwise.
+        """
+
+        if self._routes is None:
+            self.compile()
+
+        if len(pkt) < 3:
+            return self._fallback
+
+        key = (pkt[1], pkt[2])
+        entries = self._routes.get(key)
+
+        if entries is None:
+            # A pair no handler declared, typically handled by a catch all
+            # such as Packet. Memoise it so it is only resolved once.
+            entries = self._routes[key] = self._match(*key)
+
+        return entries
@@ -0,0 +1,244 @@
+"""
+rfxcom.transport.threaded
+=========================
+
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from queue import SimpleQueue
+except ImportError:  # Python < 3.7
+    from queue import Queue as SimpleQueue
+
+from serial import SerialException
+
+from rfxcom.exceptions import PacketHandlerNotFound
+from rfxcom.metrics import CALLBACK_BUCKETS, Histogram
+from rfxcom.transport.base import BaseTransport
+from rfxcom.transport.hooks import DISPATCHED
+
+# Put on the queue to stop the dispatcher thread.
+_STOP = object()
+
+
+class ThreadedTransport(BaseTransport):
+    """A transport for applications that don't use asyncio. Once ``start``
+    is called a dedicated reader thread reads from the device and hands
+    every complete packet to a dispatcher thread, which decodes it and runs
+    the callback in a :py:mod:`concurrent.futures` executor. The reader
+    thread never runs callbacks, so a slow callback can't delay reading from
+    the device.
+
+    Callbacks for packets from the same sensor (the same packet handler and
+    sensor ID) are run one at a time in the order the packets were received.
+    Callbacks for different sensors run concurrently. With ``lazy=True`` the
+    packets aren't decoded to find the sensor, so the callbacks for each
+    packet handler run one at a time instead.
+
+    .. code-block:: python
+
+        with ThreadedTransport(dev_name, callback=handler) as transport:
+            transport.join()
+
+    :param executor: The executor used to run the callbacks. It must run
+        them in threads, a :py:class:`concurrent.futures.ProcessPoolExecutor`
+        can't be used as the transport's methods are submitted to it. If it
+        isn't given a :py:class:`concurrent.futures.ThreadPoolExecutor` with
+        ``max_workers`` threads is created, and shut down by ``stop``.
+    :type executor: concurrent.futures.Executor
+
+    :param max_workers: The number of threads in the default executor.
+    :type max_workers: int
+    """
+
+    def __init__(self, device, callback=None, callbacks=None,
+                 SerialClass=None, lazy=False, executor=None, max_workers=4):
+
+        super().__init__(device, callback=callback, callbacks=callbacks,
+                         SerialClass=SerialClass, lazy=lazy)
+
+        # The callbacks finish on the executor's threads.
+        self.metrics.callback_time = Histogram(CALLBACK_BUCKETS,
+                                               lock=threading.Lock())
+
+        self._own_executor = executor is None
+
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        self.executor = executor
+        self.running = False
+
+        self._queue = SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._reader = None
+        self._dispatcher = None
+
+    def start(self):
+        """Start the reader and dispatcher threads."""
+
+        if self.running:
+            return
+
+        self.running = True
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="rfxcom-dispatcher", daemon=True)
+        self._reader = threading.Thread(
+            target=self._read_loop, name="rfxcom-reader", daemon=True)
+
+        self._dispatcher.start()
+        self._reader.start()
+
+    def stop(self, wait=True):
+        """Stop reading from the device. Packets that have already been read
+        are still passed to the callbacks.
+
+        The reader thread stops after its current read and then stops the
+        dispatcher thread, which shuts down the executor if it was created
+        by the transport. Nothing is submitted to the executor after it is
+        shut down.
+
+        :param wait: Wait for the threads to finish and, if the executor was
+            created by the transport, for the callbacks to finish.
+        :type wait: boolean
+        """
+
+        if not self.running:
+            return
+
+        self.running = False
+
+        if wait:
+            self.join()
+
+            if self._own_executor:
+                self.executor.shutdown(wait=True)
+
+    def join(self, timeout=None):
+        """Wait until the reader and dispatcher threads have finished, which
+        happens after ``stop`` is called or the device fails.
+        """
+
+        for thread in (self._reader, self._dispatcher):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def queue_depth(self):
+        """The number of packets read but not yet decoded and dispatched."""
+        return self._queue.qsize()
+
+    def do_callback(self, pkt, timings=None):
+        """Hand a packet from the reader thread to the dispatcher thread."""
+
+        self._queue.put((pkt, timings))
+
+    def _read_loop(self):
+
+        try:
+            while self.running:
+                try:
+                    self.read()
+                except (SerialException, OSError):
+                    self.log.exception("READ : The device failed, stopping.")
+                    break
+                except Exception:
+                    self.log.exception("READ : Failed to read a packet.")
+        finally:
+            # Only the reader puts packets on the queue, so the dispatcher
+            # is stopped once it has handled all of them.
+            self.running = False
+            self._queue.put(_STOP)
+
+    def _dispatch_loop(self):
+
+        try:
+            self._dispatch_packets()
+        finally:
+            # This is the only thread that submits to the executor, so it
+            # can be shut down once it is done. Callbacks already submitted
+            # still run.
+            if self._own_executor:
+                self.executor.shutdown(wait=False)
+
+    def _dispatch_packets(self):
+
+        queue = self._queue
+
+        while True:
+
+            item = queue.get()
+
+            if item is _STOP:
+                return
+
+            pkt, timings = item
+
+            try:
+                callback, reading = self.get_callback_parser(pkt, timings)
+            except PacketHandlerNotFound:
+                self.log.warning("No packet handler found for %s"
+                                 % self.format_packet(pkt))
+                continue
+
+            self._submit(self.ordering_key(reading), callback, reading)
+            self.record_dispatch(timings)
+
+            if self.hooks.dispatched:
+                self.hooks.emit(DISPATCHED, self, callback, reading)
+
+    def _submit(self, key, callback, reading):
+        """Run the callback in the executor, after any callbacks still
+        pending for the same key.
+        """
+
+        with self._lock:
+            pending = self._pending.get(key)
+
+            if pending is not None:
+                pending.append((callback, reading))
+                return
+
+            self._pending[key] = deque()
+
+        try:
+            self.executor.submit(self._run, key, callback, reading)
+        except Exception:
+            # Nothing will run the callbacks for this key, so they mustn't
+            # be queued behind this one.
+            with self._lock:
+                del self._pending[key]
+            raise
+
+    def _run(self, key, callback, reading):
+        """Run a callback and then the callbacks queued behind it for the same
+        key.
+        """
+
+        while True:
+
+            try:
+                self.run_callback(callback, reading)
+            except Exception:
+                self.log.exception("Callback %s failed for %s" % (
+                                   callback, reading))
+
+            with self._lock:
+                pending = self._pending[key]
+
+                if not pending:
+                    del self._pending[key]
+                    return
+
+                callback, reading = pending.popleft()
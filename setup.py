@@ -1,7 +1,6 @@
 import ast
 import codecs
 import os
-import sys
 
 from setuptools import setup, find_packages
 
@@ -27,25 +26,23 @@ def find_version(*parts):
     return finder.version
 
 install_requires = [
-    'pyserial>=2.7'
+    'pyserial>=3.0'
 ]
 
-# We only want to install asyncio on Python 3.3 - it comes with 3.4 and wont
-# work on earlier versions.
-if sys.version_info[:2] == (3, 3):
-    install_requires.append('asyncio>=0.4.1')
-
 setup(
     name="rfxcom",
     version=find_version("rfxcom", "__init__.py"),
     url='https://github.com/d0ugal/rfxcom',
     license='BSD',
-    description="RFXCOM RFXtrx Library for Python 3.3+",
+    description="RFXCOM RFXtrx Library for Python 3.5+",
     long_description=read('README.rst'),
     author='Dougal Matthews',
     author_email='dougal@dougalmatthews.com',
     packages=find_packages(exclude=["tests*"]),
     install_requires=install_requires,
+    extras_require={
+        'numpy': ['numpy'],
+    },
     include_package_data=True,
     platforms='any',
     classifiers=[
@@ -54,8 +51,7 @@ setup(
         'License :: OSI Approved :: BSD License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3.5',
     ],
     zip_safe=False,
 )
@@ -0,0 +1,60 @@
+"""Unit tests for rfxcom.bench.loopback."""
+import os
+from unittest import TestCase, skipUnless
+
+from rfxcom.bench import loopback
+from rfxcom.protocol import Elec, Status
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+class LoopbackTestCase(TestCase):
+
+    def test_elec_packet(self):
+
+        reading = Elec().decode(bytearray(loopback.elec_packet(70000)))
+
+        self.assertEqual(reading.current_watts, 70000)
+        self.assertEqual(reading.sequence_number, 70000 % 256)
+
+    def test_status_response(self):
+
+        request = bytearray(b'\x0D\x00\x00\x07\x02' + b'\x00' * 9)
+        reading = Status().decode(bytearray(
+            loopback.status_response(request)))
+
+        self.assertEqual(reading.sequence_number, 7)
+        self.assertEqual(reading.command_type, 2)
+
+    def test_percentiles(self):
+
+        results = loopback.percentiles([i / 1e6 for i in range(1, 101)])
+
+        self.assertAlmostEqual(results['p50_us'], 51)
+        self.assertAlmostEqual(results['p99_us'], 99)
+        self.assertAlmostEqual(results['max_us'], 100)
+        self.assertAlmostEqual(results['mean_us'], 50.5)
+
+        self.assertIsNone(loopback.percentiles([])['p99_us'])
+
+    @skipUnless(hasattr(os, 'openpty'), "Needs a pseudo-terminal")
+    def test_run(self):
+
+        results = loopback.run(rates=[2000], packets=20,
+                               transports=['nonblocking', 'base'])
+
+        self.assertEqual(results['metric'], 'p99_us')
+
+        for transport in ('nonblocking', 'base'):
+            result = results['results'][transport]['2000/s']
+            self.assertEqual(result['written'], 20)
+            self.assertEqual(result['received'], 20)
+            self.assertEqual(result['lost'], 0)
+            self.assertGreater(result['p50_us'], 0)
+            self.assertGreaterEqual(result['max_us'], result['p99_us'])
+
+    def test_unknown_transport(self):
+
+        with self.assertRaises(ValueError):
+            loopback.measure('serial', 100, 1)
@@ -0,0 +1,111 @@
+"""Unit tests for rfxcom.bench and rfxcom.bench.parsers."""
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from rfxcom.bench import compare, parsers, read_results, write_results
+from rfxcom.bench.__main__ import main
+from rfxcom.bench.packets import generate_packets
+from rfxcom.protocol import HANDLERS, Packet
+from rfxcom.protocol.lighting2 import Lighting2
+from rfxcom.protocol.status import Status
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+class GeneratePacketsTestCase(TestCase):
+
+    def test_every_handler(self):
+
+        for Handler in HANDLERS:
+
+            handler = Handler()
+            packets = generate_packets(Handler, 10)
+
+            self.assertEqual(len(packets), 10)
+
+            for pkt in packets:
+                self.assertTrue(handler.can_handle(pkt), Handler)
+                self.assertEqual(pkt[0], len(pkt) - 1)
+                handler.decode(pkt)
+
+    def test_packet_lengths(self):
+
+        self.assertEqual(len(generate_packets(Status, 1)[0]), 14)
+        self.assertEqual(len(generate_packets(Lighting2, 1)[0]), 12)
+
+    def test_repeatable(self):
+
+        self.assertEqual(generate_packets(Packet, 5, seed=1),
+                         generate_packets(Packet, 5, seed=1))
+        self.assertNotEqual(generate_packets(Packet, 5, seed=1),
+                            generate_packets(Packet, 5, seed=2))
+
+
+class ParsersTestCase(TestCase):
+
+    def setUp(self):
+
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        for name in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, name))
+        os.rmdir(self.dir)
+
+    def test_run(self):
+
+        results = parsers.run(packets=5, repeat=1)
+
+        self.assertEqual(results['benchmark'], 'parsers')
+        self.assertEqual(results['settings']['packets'], 5)
+        self.assertEqual(sorted(results['results']),
+                         sorted(Handler.__name__ for Handler in HANDLERS))
+
+        elec = results['results']['Elec']
+
+        self.assertEqual(sorted(elec), [
+            'decode', 'get_callback_parser', 'get_callback_parser_lazy',
+            'load', 'parse'])
+        self.assertGreater(elec['decode']['ns_per_packet'], 0)
+        self.assertGreater(elec['decode']['packets_per_second'], 0)
+        self.assertGreater(elec['decode']['blocks_per_packet'], 0)
+        self.assertGreater(elec['decode']['bytes_per_packet'], 0)
+
+    def test_compare(self):
+
+        old = parsers.run(packets=5, repeat=1, handlers=['Elec'])
+        new = json.loads(json.dumps(old))
+        new['results']['Elec']['decode']['ns_per_packet'] *= 2
+
+        lines, regressions = compare(old, new, threshold=10)
+
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(regressions, ['Elec.decode'])
+        self.assertIn('ns_per_packet', lines[0])
+        self.assertIn('+100.0%', lines[1])
+
+    def test_main(self):
+
+        old = os.path.join(self.dir, 'old.json')
+        new = os.path.join(self.dir, 'new.json')
+
+        main(['parsers', '--packets', '5', '--repeat', '1',
+              '--handler', 'Wind', '--output', old])
+
+        results = read_results(old)
+        self.assertEqual(list(results['results']), ['Wind'])
+
+        results['results']['Wind']['parse']['ns_per_packet'] *= 3
+        write_results(results, new)
+
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertIsNone(main(['compare', old, old]))
+            self.assertEqual(main(['compare', old, new, '--threshold', '50']),
+                             1)
+
+        self.assertIn('Wind.parse', stdout.getvalue())
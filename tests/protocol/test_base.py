@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta, timezone
 from unittest import TestCase
 
-from rfxcom.protocol.base import BasePacketHandler
+from rfxcom.protocol import base
+from rfxcom.protocol.base import (BasePacketHandler, Packet, PacketView,
+                                  Reading)
 from rfxcom.exceptions import InvalidPacketLength
 from rfxcom.exceptions import MalformedPacket
+from rfxcom import timing
 
 
 class BaseTestCase(TestCase):
@@ -35,12 +39,127 @@ class BaseTestCase(TestCase):
         with self.assertRaises(MalformedPacket):
             self.parser.validate_packet(data)
 
+    def test_check_packet(self):
+
+        self.assertEquals(self.parser.check_packet(self.data), base.VALID)
+        self.assertIsNone(self.parser.packet_error(base.VALID, self.data))
+
+    def test_check_packet_invalid(self):
+
+        malformed = self.data[0:3]
+        malformed[0] = 2
+
+        for data, status, error in (
+                (bytearray(), base.INVALID_LENGTH, InvalidPacketLength),
+                (self.data[:1], base.INVALID_LENGTH, InvalidPacketLength),
+                (malformed, base.MALFORMED, MalformedPacket)):
+
+            self.assertEquals(self.parser.check_packet(data), status)
+            self.assertIsInstance(self.parser.packet_error(status, data),
+                                  error)
+            self.assertFalse(self.parser.can_handle(data))
+
+            with self.assertRaises(error):
+                self.parser.validate_packet(data)
+
     def test_not_implemented(self):
 
         with self.assertRaises(NotImplementedError):
             self.parser.load(self.data)
 
+    def test_dump_hex(self):
+
+        self.assertEquals(self.parser.dump_hex(bytearray(b'\x03\x00\xAB')),
+                          "0x0300AB")
+        self.assertEquals(self.parser.dump_hex(memoryview(b'\x0f')), "0x0F")
+
     def test_log_namer(self):
 
         self.assertEquals(self.parser.log.name,
                           'rfxcom.protocol.BasePacketHandler')
+
+
+class ParseOnlyHandler(BasePacketHandler):
+
+    def parse(self, data):
+        return {'id': '0x01', 'packet_length': data[0]}
+
+
+class ReadingTestCase(TestCase):
+
+    def setUp(self):
+
+        self.data = bytearray(b'\x03\xFF\x01\x00')
+
+    def test_decode_parse_only_handler(self):
+
+        # Handlers that only implement parse get their dict wrapped.
+        reading = ParseOnlyHandler().decode(self.data)
+
+        self.assertIs(type(reading), Reading)
+        self.assertEquals(reading.data, {'id': '0x01', 'packet_length': 3})
+        self.assertEquals(reading.as_dict(), reading.data)
+        self.assertEquals(str(reading), "<ParseOnlyHandler ID:0x01>")
+
+    def test_packet_reading(self):
+
+        reading = Packet().decode(self.data)
+
+        self.assertEquals(reading.packet_type, 0xFF)
+        self.assertEquals(reading.as_dict(), {
+            'packet_length': 3,
+            'packet_type': 255,
+            'packet_subtype': 1,
+            'packet': self.data,
+        })
+        self.assertEquals(str(reading), "<Packet ID:None>")
+
+    def test_packet_view(self):
+
+        view = Packet().view(self.data)
+
+        self.assertIsInstance(view, PacketView)
+        self.assertEquals(view.packet_type, 0xFF)
+        self.assertEquals(view.packet, self.data)
+        self.assertEquals(view.data, Packet().parse(self.data))
+        self.assertEquals(str(view), "<Packet ID:None>")
+
+    def test_loaded_at(self):
+
+        before = datetime.now(timezone.utc).replace(tzinfo=None)
+        reading = Packet().decode(self.data)
+        after = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        self.assertIsInstance(reading.loaded_ns, int)
+        self.assertIsNone(reading.timings)
+
+        tolerance = timedelta(milliseconds=10)
+        self.assertTrue(before - tolerance <= reading.loaded_at <=
+                        after + tolerance)
+
+    def test_loaded_at_is_fixed(self):
+
+        reading = Packet().decode(self.data)
+        view = Packet().view(self.data)
+
+        self.assertEqual(reading.loaded_at, reading.loaded_at)
+        self.assertEqual(view.loaded_at, view.loaded_at)
+
+    def test_packet_view_timings(self):
+
+        view = Packet().view(self.data)
+        view.timings = timing.Timings(1, 2)
+
+        self.assertIsNone(view._reading)
+        self.assertIsInstance(view.loaded_at, datetime)
+        self.assertIsNone(view._reading)
+
+        self.assertIs(view.reading.timings, view.timings)
+
+    def test_load(self):
+
+        handler = Packet()
+        handler.load(self.data)
+
+        self.assertIsInstance(handler.loaded_ns, int)
+        self.assertIsInstance(handler.loaded_at, datetime)
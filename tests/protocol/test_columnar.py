@@ -0,0 +1,131 @@
+from math import isnan
+from unittest import TestCase, skipIf
+
+from rfxcom.exceptions import InvalidPacketLength
+from rfxcom.protocol import (Elec, Humidity, Temperature, TempHumidity,
+                             UltraViolet, Wind)
+from rfxcom.protocol.columnar import decode_columns, numpy
+
+
+class ColumnarTestCase(TestCase):
+
+    use_numpy = False
+
+    def setUp(self):
+
+        self.buffer = b''.join([
+            b'\x08\x50\x06\x02\xAE\x01\x80\x55\x59',
+            b'\x08\x51\x01\x12\x70\x05\x2D\x00\x89',
+            b'\x0A\x52\x01\x00\x2E\xB2\x00\xD5\x5B\x03\x69',
+            b'\x0A\x52\x01\x01\x2E\xB2\x80\xA7\x5B\x03\x69',
+            b'\x09\x57\x01\x00\x2E\xB2\x03\x05\x00\x69',
+            b'\x09\x57\x03\x00\x2E\xB2\x05\x80\x16\x54',
+            b'\x10\x56\x04\x02\xB2\x06\x00\x0F\x00\x09\x01\x0E\x80\x0F'
+            b'\x02\x09\x56',
+            b'\x10\x56\x05\x09\x5D\x01\x01\x00\x00\x02\x01\x18\x00\x0C'
+            b'\x46\xA8\x64',
+            # Skipped: not columnar, unknown subtype and too short.
+            b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00\x02\xB4\x00\x00\x0C'
+            b'\x46\xA8\x11\x69',
+            b'\x0A\x52\xEE\x00\x2E\xB2\x00\xD5\x5B\x03\x69',
+            b'\x03\x52\x01\x00',
+        ])
+
+    def decode(self, buffer_):
+        columns = decode_columns(buffer_, use_numpy=self.use_numpy)
+        return dict(
+            (Handler, dict((name, list(values))
+                           for name, values in handler_columns.items()))
+            for Handler, handler_columns in columns.items()
+        )
+
+    def test_handlers(self):
+
+        columns = self.decode(self.buffer)
+
+        self.assertEqual(
+            set(columns),
+            {Temperature, Humidity, TempHumidity, UltraViolet, Wind})
+        self.assertNotIn(Elec, columns)
+
+    def test_temperature(self):
+
+        self.assertEqual(self.decode(self.buffer)[Temperature], {
+            'packet_subtype': [6],
+            'sequence_number': [2],
+            'id': [0xAE01],
+            'signal_level': [5],
+            'battery_level': [9],
+            'temperature': [-8.5],
+        })
+
+    def test_humidity(self):
+
+        self.assertEqual(self.decode(self.buffer)[Humidity], {
+            'packet_subtype': [1],
+            'sequence_number': [18],
+            'id': [0x7005],
+            'signal_level': [8],
+            'battery_level': [9],
+            'humidity': [45],
+            'humidity_status': ['Dry'],
+        })
+
+    def test_temp_humidity(self):
+
+        self.assertEqual(self.decode(self.buffer)[TempHumidity], {
+            'packet_subtype': [1, 1],
+            'sequence_number': [0, 1],
+            'id': [0x2EB2, 0x2EB2],
+            'signal_level': [6, 6],
+            'battery_level': [9, 9],
+            'channel': [0xB2, 0xB2],
+            'temperature': [21.3, -16.7],
+            'humidity': [91, 91],
+            'humidity_status': ['Wet', 'Wet'],
+        })
+
+    def test_ultraviolet(self):
+
+        columns = self.decode(self.buffer)[UltraViolet]
+
+        self.assertEqual(columns['uv'], [3, 5])
+        self.assertTrue(isnan(columns['temperature'][0]))
+        self.assertEqual(columns['temperature'][1], -2.2)
+
+    def test_wind(self):
+
+        columns = self.decode(self.buffer)[Wind]
+
+        self.assertEqual(columns['direction'], [15, 256])
+        self.assertEqual(columns['wind_gust'], [27.0, 28.0])
+        self.assertEqual(columns['av_speed'][0], 0.9)
+        self.assertTrue(isnan(columns['av_speed'][1]))
+        self.assertEqual(columns['temperature'][0], -1.5)
+        self.assertEqual(columns['wind_chill'][0], 52.1)
+        self.assertTrue(isnan(columns['wind_chill'][1]))
+
+    def test_truncated(self):
+
+        with self.assertRaises(InvalidPacketLength):
+            decode_columns(self.buffer + b'\x0A\x52',
+                           use_numpy=self.use_numpy)
+
+
+@skipIf(numpy is None, "NumPy isn't installed")
+class NumpyColumnarTestCase(ColumnarTestCase):
+
+    use_numpy = True
+
+    def test_arrays(self):
+
+        columns = decode_columns(self.buffer, use_numpy=True)
+
+        self.assertIsInstance(columns[TempHumidity]['temperature'],
+                              numpy.ndarray)
+
+    def test_empty(self):
+
+        columns = decode_columns(b'', use_numpy=True)
+
+        self.assertEqual(len(columns[Wind]['wind_gust']), 0)
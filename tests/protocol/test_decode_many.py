@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from rfxcom.exceptions import InvalidPacketLength
+from rfxcom.protocol import Elec, Packet, TempHumidity, decode_many
+
+
+class DecodeManyTestCase(TestCase):
+
+    def setUp(self):
+
+        self.elec_packet = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                            b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+        self.temp_humidity_packet = (b'\x0A\x52\x01\x00\x2E\xB2\x00\xD5'
+                                     b'\x5B\x03\x69')
+        self.unknown_packet = b'\x03\xFF\x00\x00'
+
+        self.buffer = (self.elec_packet + self.temp_humidity_packet +
+                       self.unknown_packet + self.elec_packet)
+
+    def test_decode_many(self):
+
+        readings = list(decode_many(self.buffer))
+
+        self.assertEqual([type(r.handler) for r in readings],
+                         [Elec, TempHumidity, Packet, Elec])
+        self.assertEqual(readings[0].data['current_watts'], 692)
+        self.assertEqual(readings[1].data['temperature'], 21.3)
+        self.assertEqual(readings[2].data['packet_type'], 0xFF)
+        self.assertEqual(bytes(readings[3].raw), self.elec_packet)
+
+    def test_decode_many_shares_handlers(self):
+
+        first, _, _, last = decode_many(self.buffer)
+
+        self.assertIs(first.handler, last.handler)
+
+    def test_decode_many_grouped(self):
+
+        groups = decode_many(self.buffer, grouped=True)
+
+        self.assertEqual(set(groups), {Elec, TempHumidity, Packet})
+        self.assertEqual(len(groups[Elec]), 2)
+        self.assertEqual(len(groups[TempHumidity]), 1)
+
+    def test_decode_many_invalid_length(self):
+
+        # A known packet type with the wrong length is treated as unknown.
+        data = bytearray(self.temp_humidity_packet[:4])
+        data[0] = 3
+
+        reading, = decode_many(data)
+
+        self.assertIsInstance(reading.handler, Packet)
+
+    def test_decode_many_truncated(self):
+
+        readings = decode_many(self.buffer + self.elec_packet[:5])
+
+        with self.assertRaises(InvalidPacketLength):
+            list(readings)
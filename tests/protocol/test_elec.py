@@ -30,13 +30,26 @@ class ElecTestCase(TestCase):
             'sequence_number': 0,
             'packet_subtype': 1,
             'packet_subtype_name': "CM119/160",
-            'total_watts': 920825.1947099693,
+            'total_watts': 920824.5195961836,
             'battery_level': 9,
             'signal_level': 6
         })
 
         self.assertEquals(str(self.parser), "<Elec ID:0x2EB2>")
 
+    def test_decode(self):
+
+        reading = self.parser.decode(self.data)
+
+        self.assertIs(reading.handler, self.parser)
+        self.assertIs(reading.raw, self.data)
+        self.assertEquals(reading.data['current_watts'], 692)
+        self.assertEquals(str(reading), "<Elec ID:0x2EB2>")
+
+        # decode doesn't store anything on the shared handler.
+        self.assertFalse(hasattr(self.parser, 'data'))
+        self.assertFalse(hasattr(self.parser, 'raw'))
+
     def test_validate_bytes_short(self):
 
         data = self.data[:1]
@@ -70,9 +83,9 @@ class ElecTestCase(TestCase):
 
     def test_bytes_to_uint_48(self):
 
-        data = self.data[11:16]
+        data = self.data[11:17]
 
-        self.assertEquals(self.parser._bytes_to_uint_48(data), 205957288)
+        self.assertEquals(self.parser._bytes_to_uint_48(data), 205957137)
 
     def test_log_namer(self):
 
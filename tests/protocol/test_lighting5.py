@@ -37,6 +37,23 @@ class Lighting5TestCase(TestCase):
 
         self.assertEquals(str(self.parser), "<Lighting5 ID:0xF394AB>")
 
+    def test_view(self):
+
+        view = self.parser.view(memoryview(self.data))
+
+        # Only the header is read until another field is accessed.
+        self.assertEquals(view.packet_subtype, 0)
+        self.assertIsNone(view._reading)
+
+        self.assertEquals(view.command_text, "On")
+        self.assertEquals(view.id, "0xF394AB")
+        self.assertIs(view.id, view.id)
+        self.assertEquals(view.as_dict(), self.parser.parse(self.data))
+        self.assertEquals(str(view), "<Lighting5 ID:0xF394AB>")
+
+        with self.assertRaises(AttributeError):
+            view.temperature
+
     def test_validate_bytes_short(self):
 
         data = self.data[:1]
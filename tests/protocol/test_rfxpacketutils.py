@@ -0,0 +1,53 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from rfxcom.protocol.rfxpacketutils import RfxPacketUtils
+
+
+class RfxPacketUtilsTestCase(TestCase):
+
+    def test_header(self):
+
+        data = bytearray(b'\x08\x50\x02\x11\x70\x02\x00\xA7\x89')
+
+        self.assertEqual(RfxPacketUtils.HEADER.unpack_from(data),
+                         (8, 0x50, 2, 0x11))
+
+    def test_signed_magnitude_16(self):
+
+        self.assertEqual(RfxPacketUtils.signed_magnitude_16(0x00A7), 167)
+        self.assertEqual(RfxPacketUtils.signed_magnitude_16(0x8055), -85)
+        self.assertEqual(RfxPacketUtils.signed_magnitude_16(0x8000), 0)
+
+    def test_uint_48(self):
+
+        self.assertEqual(RfxPacketUtils.uint_48(0x0000, 0x0C46A811),
+                         205957137)
+        self.assertEqual(RfxPacketUtils.uint_48(0x0102, 0x03040506),
+                         0x010203040506)
+
+    def test_format_id(self):
+
+        self.assertEqual(RfxPacketUtils.format_id(0x2EB2, 2), "0x2EB2")
+        self.assertEqual(RfxPacketUtils.format_id(0x0111F342, 4),
+                         "0x0111F342")
+        self.assertEqual(RfxPacketUtils.format_id(0x0A, 3), "0x00000A")
+
+    def test_format_id_cached(self):
+
+        first = RfxPacketUtils.format_id(0x2EB2, 2)
+
+        self.assertIs(RfxPacketUtils.format_id(0x2EB2, 2), first)
+        self.assertEqual(RfxPacketUtils.format_id(0x2EB2, 3), "0x002EB2")
+
+    def test_format_id_cache_full(self):
+
+        with patch.dict(RfxPacketUtils._id_cache, clear=True), \
+                patch.object(RfxPacketUtils, 'ID_CACHE_SIZE', 2):
+
+            RfxPacketUtils.format_id(1, 2)
+            RfxPacketUtils.format_id(2, 2)
+            self.assertEqual(len(RfxPacketUtils._id_cache), 2)
+
+            self.assertEqual(RfxPacketUtils.format_id(3, 2), "0x0003")
+            self.assertEqual(RfxPacketUtils._id_cache, {(3, 2): "0x0003"})
@@ -65,6 +65,13 @@ class StatusTestCase(TestCase):
 
         self.assertEquals(str(self.parser), "<Status ID:None>")
 
+    def test_protocol_flags(self):
+
+        reading = self.parser.decode(self.data)
+
+        self.assertEquals(reading.protocol_flags, (0x00, 0x0C, 0x2F))
+        self.assertNotIn('protocol_flags', reading.as_dict())
+
     def test_validate_bytes_short(self):
 
         data = self.data[:1]
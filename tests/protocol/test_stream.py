@@ -0,0 +1,140 @@
+from unittest import TestCase, mock
+
+from rfxcom.exceptions import InvalidPacketLength
+from rfxcom.protocol.stream import StreamDecoder, iter_frames
+
+
+class StreamDecoderTestCase(TestCase):
+
+    def setUp(self):
+
+        self.elec_packet = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                            b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+        self.temp_packet = b'\x08\x50\x02\x11\x70\x02\x00\xA7\x89'
+        self.decoder = StreamDecoder()
+
+    def test_empty(self):
+
+        self.assertEqual(list(self.decoder), [])
+        self.assertEqual(self.decoder.pending, 0)
+
+    def test_single_packet(self):
+
+        self.decoder.feed(self.elec_packet)
+
+        self.assertEqual(list(self.decoder), [bytearray(self.elec_packet)])
+        self.assertEqual(self.decoder.pending, 0)
+
+    def test_many_packets(self):
+
+        self.decoder.feed(self.elec_packet + self.temp_packet +
+                          self.elec_packet)
+
+        self.assertEqual(list(self.decoder), [
+            bytearray(self.elec_packet),
+            bytearray(self.temp_packet),
+            bytearray(self.elec_packet),
+        ])
+
+    def test_byte_at_a_time(self):
+
+        packets = []
+
+        for byte in self.temp_packet + self.elec_packet:
+            self.decoder.feed(bytes([byte]))
+            packets.extend(self.decoder)
+
+        self.assertEqual(packets, [
+            bytearray(self.temp_packet),
+            bytearray(self.elec_packet),
+        ])
+
+    def test_partial_packet(self):
+
+        self.decoder.feed(self.temp_packet + self.elec_packet[:5])
+
+        self.assertEqual(list(self.decoder), [bytearray(self.temp_packet)])
+        self.assertEqual(self.decoder.pending, 5)
+
+        self.decoder.feed(self.elec_packet[5:])
+
+        self.assertEqual(list(self.decoder), [bytearray(self.elec_packet)])
+        self.assertEqual(self.decoder.pending, 0)
+
+    def test_stamps(self):
+
+        with mock.patch('rfxcom.protocol.stream.monotonic_ns',
+                        side_effect=[100, 200]):
+
+            self.decoder.feed(self.temp_packet + self.elec_packet[:5])
+
+            next(self.decoder)
+            self.assertEqual(self.decoder.first_byte_ns, 100)
+            self.assertEqual(self.decoder.framed_ns, 100)
+
+            self.decoder.feed(self.elec_packet[5:] + self.temp_packet)
+
+            next(self.decoder)
+            self.assertEqual(self.decoder.first_byte_ns, 100)
+            self.assertEqual(self.decoder.framed_ns, 200)
+
+            next(self.decoder)
+            self.assertEqual(self.decoder.first_byte_ns, 200)
+            self.assertEqual(self.decoder.framed_ns, 200)
+
+    def test_packets_are_copies(self):
+
+        self.decoder.feed(self.temp_packet)
+        pkt = next(self.decoder)
+
+        self.decoder.feed(self.elec_packet)
+        list(self.decoder)
+
+        self.assertEqual(pkt, bytearray(self.temp_packet))
+
+    def test_skip_zero_bytes(self):
+
+        self.decoder.feed(b'\x00\x00' + self.temp_packet + b'\x00')
+
+        self.assertEqual(list(self.decoder), [bytearray(self.temp_packet)])
+        self.assertEqual(self.decoder.skipped, 3)
+        self.assertEqual(self.decoder.pending, 0)
+
+    def test_reset(self):
+
+        self.decoder.feed(self.elec_packet[:5])
+        self.decoder.reset()
+        self.decoder.feed(self.temp_packet)
+
+        self.assertEqual(list(self.decoder), [bytearray(self.temp_packet)])
+
+
+class IterFramesTestCase(TestCase):
+
+    def setUp(self):
+
+        self.elec_packet = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                            b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+        self.temp_packet = b'\x08\x50\x02\x11\x70\x02\x00\xA7\x89'
+
+    def test_iter_frames(self):
+
+        frames = list(iter_frames(self.elec_packet + b'\x00' +
+                                  self.temp_packet))
+
+        self.assertEqual([bytes(f) for f in frames],
+                         [self.elec_packet, self.temp_packet])
+        self.assertTrue(all(isinstance(f, memoryview) for f in frames))
+
+    def test_iter_frames_empty(self):
+
+        self.assertEqual(list(iter_frames(b'')), [])
+
+    def test_iter_frames_truncated(self):
+
+        frames = iter_frames(self.temp_packet + self.elec_packet[:5])
+
+        self.assertEqual(bytes(next(frames)), self.temp_packet)
+
+        with self.assertRaises(InvalidPacketLength):
+            next(frames)
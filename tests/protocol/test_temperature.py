@@ -1,5 +1,6 @@
 from unittest import TestCase
 
+from rfxcom.protocol import base
 from rfxcom.protocol.temperature import Temperature
 
 from rfxcom.exceptions import (InvalidPacketLength, UnknownPacketSubtype,
@@ -36,6 +37,14 @@ class TemperatureTestCase(TestCase):
 
         self.assertEquals(str(self.parser), "<Temperature ID:0x7002>")
 
+    def test_sensor_id(self):
+
+        reading = self.parser.decode(self.data)
+
+        self.assertEquals(reading.sensor_id, 0x7002)
+        self.assertEquals(reading.id, '0x7002')
+        self.assertIs(reading.id, self.parser.decode(self.data).id)
+
     def test_parse_bytes2(self):
 
         self.data = bytearray(b'\x08\x50\x03\x02\xAE\x01\x00\x63\x59')
@@ -91,11 +100,26 @@ class TemperatureTestCase(TestCase):
         with self.assertRaises(InvalidPacketLength):
             self.parser.validate_packet(data)
 
+    def test_validate_bytes_short_for_layout(self):
+
+        # The length byte matches, but it is too short for the layout.
+        data = self.data[:6]
+        data[0] = 5
+
+        self.assertFalse(self.parser.can_handle(data))
+        self.assertEquals(self.parser.check_packet(data),
+                          base.SHORT_FOR_LAYOUT)
+
+        with self.assertRaises(InvalidPacketLength):
+            self.parser.validate_packet(data)
+
     def test_validate_unkown_packet_type(self):
 
         self.data[1] = 0xFF
 
         self.assertFalse(self.parser.can_handle(self.data))
+        self.assertEquals(self.parser.check_packet(self.data),
+                          base.UNKNOWN_TYPE)
 
         with self.assertRaises(UnknownPacketType):
             self.parser.validate_packet(self.data)
@@ -105,6 +129,8 @@ class TemperatureTestCase(TestCase):
         self.data[2] = 0xEE
 
         self.assertFalse(self.parser.can_handle(self.data))
+        self.assertEquals(self.parser.check_packet(self.data),
+                          base.UNKNOWN_SUBTYPE)
 
         with self.assertRaises(UnknownPacketSubtype):
             self.parser.validate_packet(self.data)
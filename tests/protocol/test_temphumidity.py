@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from rfxcom.protocol.temphumidity import TempHumidity
+from rfxcom.protocol.temphumidity import TempHumidity, TempHumidityReading
 
 from rfxcom.exceptions import (InvalidPacketLength, UnknownPacketSubtype,
                                UnknownPacketType)
@@ -38,6 +38,22 @@ class TempHumidityTestCase(TestCase):
 
         self.assertEquals(str(self.parser), "<TempHumidity ID:0x7002>")
 
+    def test_decode(self):
+
+        reading = self.parser.decode(self.data)
+
+        self.assertIsInstance(reading, TempHumidityReading)
+        self.assertEquals(reading.id, '0x7002')
+        self.assertEquals(reading.temperature, 16.7)
+        self.assertEquals(reading.humidity, 45)
+        self.assertEquals(reading.packet_subtype_name,
+                          'THGR810, THGN801, THGN800')
+        self.assertEquals(reading.as_dict(), self.parser.parse(self.data))
+        self.assertIs(reading.data, reading.data)
+
+        # Readings use __slots__ rather than a per instance dict.
+        self.assertFalse(hasattr(reading, '__dict__'))
+
     def test_parse_bytes2(self):
 
         self.data = bytearray(b'\x0A\x52\x02\x02\xAE\x01\x00\x63'
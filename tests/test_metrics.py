@@ -0,0 +1,178 @@
+"""Unit tests for rfxcom.metrics."""
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from serial import Serial
+
+from rfxcom import metrics
+from rfxcom.exceptions import PacketHandlerNotFound
+from rfxcom.transport import ThreadedTransport
+from rfxcom.transport.base import BaseTransport
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+ELEC_PACKET = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+               b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+
+class HistogramTestCase(TestCase):
+
+    def test_observe(self):
+
+        histogram = metrics.Histogram((1, 10))
+
+        for value in (0.5, 1, 5, 20):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.as_dict(), {
+            'count': 4,
+            'sum': 26.5,
+            'buckets': [(1, 2), (10, 3), (float('inf'), 4)],
+        })
+
+
+class TransportMetricsTestCase(TestCase):
+
+    def setUp(self):
+
+        self.callback = Mock()
+        self.transport = BaseTransport(Mock(spec=Serial),
+                                       callback=self.callback)
+
+    def test_snapshot(self):
+
+        self.transport.data_received(b'\x00\x00' + ELEC_PACKET)
+        self.transport.data_received(ELEC_PACKET)
+
+        snapshot = self.transport.metrics_snapshot()
+
+        self.assertEqual(snapshot['bytes_read'], 2 + 2 * len(ELEC_PACKET))
+        self.assertEqual(snapshot['framing_errors'], 2)
+        self.assertEqual(snapshot['packets'], {(0x5A, 0x01): 2})
+        self.assertEqual(snapshot['packets_total'], 2)
+        self.assertEqual(snapshot['handler_not_found'], 0)
+        self.assertEqual(snapshot['queue_depth'], 0)
+        self.assertEqual(snapshot['decode_time']['count'], 2)
+        self.assertEqual(snapshot['callback_time']['count'], 2)
+        self.assertEqual(self.callback.call_count, 2)
+
+    def test_handler_not_found(self):
+
+        self.transport.subscriptions = Mock()
+        self.transport.subscriptions.route.return_value = ()
+
+        with self.assertRaises(PacketHandlerNotFound):
+            self.transport.get_callback_parser(bytearray(ELEC_PACKET))
+
+        snapshot = self.transport.metrics_snapshot()
+
+        self.assertEqual(snapshot['handler_not_found'], 1)
+        self.assertEqual(snapshot['decode_time']['count'], 0)
+
+    def test_callback_error_is_timed(self):
+
+        self.callback.side_effect = ValueError
+
+        with self.assertRaises(ValueError):
+            self.transport.data_received(ELEC_PACKET)
+
+        self.assertEqual(self.transport.metrics.callback_time.count, 1)
+
+
+class PrometheusTestCase(TestCase):
+
+    def setUp(self):
+
+        self.transport = BaseTransport(Mock(spec=Serial), callback=Mock())
+        self.transport.data_received(ELEC_PACKET)
+
+    def test_transport(self):
+
+        text = metrics.prometheus(self.transport)
+
+        self.assertIn("# TYPE rfxcom_bytes_read_total counter\n"
+                      "rfxcom_bytes_read_total 18\n", text)
+        self.assertIn('rfxcom_packets_total{packet_type="0x5A",'
+                      'packet_subtype="0x01"} 1\n', text)
+        self.assertIn('rfxcom_decode_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn("rfxcom_callback_seconds_count 1\n", text)
+        self.assertIn("rfxcom_frame_seconds_count 1\n", text)
+        self.assertIn("rfxcom_dispatch_latency_seconds_count 1\n", text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_devices(self):
+
+        manager = Mock(spec=['transports'])
+        manager.transports = {'/dev/ttyUSB0': self.transport}
+
+        text = metrics.prometheus(manager)
+
+        self.assertIn('rfxcom_queue_depth{device="/dev/ttyUSB0"} 0\n', text)
+        self.assertIn('rfxcom_packets_total{device="/dev/ttyUSB0",'
+                      'packet_type="0x5A",packet_subtype="0x01"} 1\n', text)
+
+    def test_write_prometheus(self):
+
+        path = os.path.join(tempfile.mkdtemp(), 'rfxcom.prom')
+        self.addCleanup(os.rmdir, os.path.dirname(path))
+        self.addCleanup(os.remove, path)
+
+        metrics.write_prometheus(path, {'rfx': self.transport})
+
+        with open(path) as f:
+            self.assertEqual(f.read(), metrics.prometheus(
+                {'rfx': self.transport}))
+
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['rfxcom.prom'])
+
+    def test_serve(self):
+
+        server = metrics.serve(self.transport, port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = "http://%s:%s" % server.server_address
+
+        with urlopen(url + "/metrics") as response:
+            self.assertEqual(response.headers['Content-Type'],
+                             metrics.CONTENT_TYPE)
+            self.assertIn(b"rfxcom_bytes_read_total 18\n", response.read())
+
+        with self.assertRaises(HTTPError):
+            urlopen(url + "/other")
+
+
+class LockedHistogramTestCase(TestCase):
+
+    def test_threads(self):
+
+        histogram = metrics.Histogram((1, ), lock=threading.Lock())
+
+        def observe():
+            for _ in range(10000):
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(histogram.as_dict()['count'], 40000)
+        self.assertEqual(histogram.as_dict()['buckets'][0], (1, 40000))
+
+    def test_threaded_transport(self):
+
+        transport = ThreadedTransport(Mock(spec=Serial), callback=Mock())
+        self.addCleanup(transport.executor.shutdown)
+
+        self.assertIsNotNone(transport.metrics.callback_time.lock)
+        self.assertIsNone(transport.metrics.decode_time.lock)
@@ -0,0 +1,100 @@
+"""Unit tests for rfxcom.timing."""
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from serial import Serial
+
+from rfxcom import timing
+from rfxcom.timing import Timings
+from rfxcom.transport.base import BaseTransport
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+ELEC_PACKET = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+               b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+
+class TimingTestCase(TestCase):
+
+    def test_monotonic_ns(self):
+
+        first = timing.monotonic_ns()
+        second = timing.monotonic_ns()
+
+        self.assertIsInstance(first, int)
+        self.assertLessEqual(first, second)
+
+    def test_wall_clock(self):
+
+        with patch('rfxcom.timing._ANCHOR', (1000.0, 5 * 10 ** 9)):
+            self.assertEqual(timing.wall_clock(3 * 10 ** 9),
+                             datetime(1970, 1, 1, 0, 16, 38))
+
+    def test_wall_clock_changed(self):
+
+        stamp = timing.monotonic_ns()
+        first = timing.wall_clock(stamp)
+
+        with patch('time.time', return_value=0.0):
+            self.assertEqual(timing.wall_clock(stamp), first)
+
+    def test_wall_clock_now(self):
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        self.assertLess(abs(timing.wall_clock(timing.monotonic_ns()) - now),
+                        timedelta(seconds=1))
+
+    def test_timings(self):
+
+        timings = Timings(1000, 3000)
+
+        self.assertEqual(timings.elapsed('first_byte', 'framed'), 2e-6)
+        self.assertIsNone(timings.elapsed('framed', 'decoded'))
+
+        timings.decoded = timings.dispatched = timing.monotonic_ns()
+
+        stamps = timings.as_dict()
+
+        self.assertEqual(list(stamps), list(Timings.STAGES))
+        self.assertTrue(all(isinstance(stamp, datetime)
+                            for stamp in stamps.values()))
+
+
+class TransportTimingsTestCase(TestCase):
+
+    def setUp(self):
+
+        self.callback = Mock()
+        self.transport = BaseTransport(Mock(spec=Serial),
+                                       callback=self.callback)
+
+    def test_stages(self):
+
+        self.transport.data_received(ELEC_PACKET[:5])
+        self.transport.data_received(ELEC_PACKET[5:])
+
+        timings = self.callback.call_args[0][0].timings
+
+        self.assertLess(timings.first_byte, timings.framed)
+        self.assertLessEqual(timings.framed, timings.decoded)
+        self.assertLessEqual(timings.decoded, timings.dispatched)
+
+        metrics = self.transport.metrics
+        self.assertEqual(metrics.frame_time.count, 1)
+        self.assertEqual(metrics.frame_time.sum,
+                         timings.elapsed('first_byte', 'framed'))
+        self.assertEqual(metrics.dispatch_latency.count, 1)
+
+    def test_lazy(self):
+
+        self.transport.lazy = True
+        self.transport.data_received(ELEC_PACKET)
+
+        view = self.callback.call_args[0][0]
+
+        self.assertIsNotNone(view.timings.dispatched)
+        self.assertIs(view.reading.timings, view.timings)
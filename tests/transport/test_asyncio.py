@@ -1,87 +1,134 @@
 """Unit tests for rfxcom.asyncio.AsyncioTransport."""
+import asyncio
 from unittest import TestCase, mock
 
+from rfxcom.exceptions import RFXComException
+from rfxcom.protocol import (Elec, MODE_PACKET, RESET_PACKET, STATUS_PACKET,
+                             Status)
 from rfxcom.transport import AsyncioTransport
+from rfxcom.transport.asyncio import FAILED, READY
 
 # It's a unittest, let's be flexible
 # pylint: disable=C0111,W0212,R0201
 
 
-def execute_coroutine(coroutine):
-    """Execute a coroutine.
+def run(coroutine):
+    """Run a coroutine to completion in a new event loop."""
 
-    The coroutine is a generator which 'yields from' other iterables in the
-    form of asyncio.Future instances. For each generated value, wait for it to
-    be done and move on to the next one, until the generator has completed.
+    loop = asyncio.new_event_loop()
 
-    Since there is no loop instance to enter, it might be needed to mock each
-    yielded value before executing the coroutine, to avoid blocking situations.
-
-    Exemple:
-        with mock.patch('coro.yielded.metod.Function'):
-            result = execute_coroutine(coro)
-
-    Althogh this helper is thought to work with coroutined generators, it
-    should work with any iterator.
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
 
-    @param coroutine: an iterable, e.g. an asyncio.coroutine decorated method
-      yielding something.
 
-    @returns the return value of the coroutine, or None if nothing is returned
-    """
-    try:
-        future = next(coroutine)
-        while not future.done():
-            pass
-    except StopIteration as exc:
-        if hasattr(exc, 'value'):
-            return exc.value
+async def _noop(*args, **kwargs):
+    pass
 
 
 class AsyncioTransportTestCase(TestCase):
 
     """AsyncioTransport test case."""
 
-    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport._setup')
-    @mock.patch('asyncio.async')
+    def setUp(self):
+
+        # The mocked loops never run the _setup task the constructor
+        # creates, so it is created on a real loop and cancelled after the
+        # test.
+        self.loop = asyncio.new_event_loop()
+        self.tasks = []
+        self.addCleanup(self.loop.close)
+        self.addCleanup(self.cancel_tasks)
+
+    def create_task(self, coroutine):
+
+        task = self.loop.create_task(coroutine)
+        self.tasks.append(task)
+        return task
+
+    def cancel_tasks(self):
+
+        for task in self.tasks:
+            task.cancel()
+
+        if self.tasks:
+            self.loop.run_until_complete(
+                asyncio.gather(*self.tasks, return_exceptions=True))
+
+    def transport(self, device, loop):
+
+        loop.create_task.side_effect = self.create_task
+        return AsyncioTransport(device, loop, callback=mock.Mock())
+
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport._setup',
+                new_callable=mock.Mock)
     @mock.patch('asyncio.AbstractEventLoop')
     @mock.patch('serial.Serial')
-    def test_transport_setup(self, device, loop, async, _setup):
+    def test_transport_setup(self, device, loop, _setup):
         AsyncioTransport(device, loop, callback=mock.Mock())
-        async.assert_called_once_with(_setup())
+        loop.create_task.assert_called_once_with(_setup())
 
-    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendRESET')
-    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendSTATUS')
-    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendMODE')
-    @mock.patch('asyncio.sleep')
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.sendRESET',
+                side_effect=_noop)
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.request')
+    @mock.patch('asyncio.sleep', side_effect=_noop)
     @mock.patch('asyncio.AbstractEventLoop')
     @mock.patch('serial.Serial')
-    def test_transport__setup(self, device, loop, sleep, mode, status, reset):
-        unit = AsyncioTransport(device, loop, callback=mock.Mock())
+    def test_transport__setup(self, device, loop, sleep, request, reset):
+        unit = self.transport(device, loop)
         # reset mocks which have been 'called' by the constructor
         device.reset_mock()
         loop.reset_mock()
 
-        # run: exaust the coroutine generator
-        execute_coroutine(unit._setup())
+        status = mock.Mock(transceiver_type=0x53, protocol_flags=(0, 0, 0))
+
+        async def respond(*args):
+            return status
+
+        request.side_effect = respond
+
+        run(unit._setup())
 
         loop.add_reader.assert_called_with(device.fd, unit.read)
+        self.assertEqual(device.flushInput.call_count, 2)
         reset.assert_called_once_with()
-        sleep.assert_has_calls((mock.ANY, mock.ANY))
+        sleep.assert_called_once_with(mock.ANY)
         slept_time = sleep.call_args[0][0]
         # by spec it needs to be between 0.5ms and 9000ms
-        self.assertGreater(slept_time, 0.05)
+        self.assertGreaterEqual(slept_time, 0.05)
         self.assertLess(slept_time, 9)
-        mode.assert_called_once_with()
-        status.assert_called_once_with()
+        self.assertEqual(request.call_args_list, [
+            mock.call(STATUS_PACKET, unit.STATUS_TIMEOUT),
+            mock.call(MODE_PACKET, unit.STATUS_TIMEOUT),
+        ])
+        self.assertEqual(unit.state, READY)
+        unit.ready.set_result.assert_called_once_with(status)
+
+    @mock.patch('asyncio.AbstractEventLoop')
+    @mock.patch('serial.Serial')
+    def test_transport_send(self, device, loop):
+        unit = self.transport(device, loop)
+
+        with mock.patch.object(unit, 'write') as write:
+            run(unit.sendRESET())
+            run(unit.sendSTATUS())
+            run(unit.sendMODE())
+
+        self.assertEquals(write.call_args_list, [
+            mock.call(RESET_PACKET),
+            mock.call(STATUS_PACKET),
+            mock.call(MODE_PACKET),
+        ])
 
     @mock.patch('asyncio.AbstractEventLoop')
     @mock.patch('serial.Serial')
     def test_transport_read_nothing(self, device, loop):
 
+        device.in_waiting = 0
         device.read.return_value = b''
 
-        unit = AsyncioTransport(device, loop, callback=mock.Mock())
+        unit = self.transport(device, loop)
 
         with mock.patch.object(unit, 'log') as unit_log:
             unit.read()
@@ -92,33 +139,49 @@ class AsyncioTransportTestCase(TestCase):
     @mock.patch('serial.Serial')
     def test_transport_read_empty_patcket(self, device, loop):
 
+        device.in_waiting = 1
         device.read.return_value = b'\x00'
 
-        unit = AsyncioTransport(device, loop, callback=mock.Mock())
+        unit = self.transport(device, loop)
 
         with mock.patch.object(unit, 'log') as unit_log:
-            unit.read()
-            unit_log.warning.assert_called_once_with(
-                "READ : Empty packet (Got \\x00)")
+            self.assertIsNone(unit.read())
+            self.assertFalse(unit_log.warning.called)
+
+        # A zero byte between packets is skipped by the decoder.
+        self.assertEqual(unit.decoder.skipped, 1)
 
     @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.do_callback')
     @mock.patch('asyncio.AbstractEventLoop')
     @mock.patch('serial.Serial')
     def test_transport_read(self, device, loop, callback):
 
-        unit = AsyncioTransport(device, loop, callback=mock.Mock())
+        unit = self.transport(device, loop)
 
-        def fake_read(*x):
-            data = {
-                (): b'\x02',
-                (2, ): b'\x01\x01'
-            }
-            return data[x]
-        device.read.side_effect = fake_read
+        device.in_waiting = 3
+        device.read.return_value = b'\x02\x01\x01'
 
         expected_result = b'\x02\x01\x01'
         self.assertEquals(unit.read(), expected_result)
-        callback.assert_called_once_with(expected_result)
+        callback.assert_called_once_with(expected_result, mock.ANY)
+        device.read.assert_called_once_with(3)
+
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport.do_callback')
+    @mock.patch('asyncio.AbstractEventLoop')
+    @mock.patch('serial.Serial')
+    def test_transport_read_partial(self, device, loop, callback):
+
+        unit = self.transport(device, loop)
+
+        device.in_waiting = 4
+        device.read.return_value = b'\x02\x01\x01\x02'
+        self.assertEquals(unit.read(), b'\x02\x01\x01')
+
+        device.in_waiting = 2
+        device.read.return_value = b'\x01\x01'
+        self.assertEquals(unit.read(), b'\x02\x01\x01')
+
+        self.assertEquals(callback.call_count, 2)
 
     @mock.patch(
         'rfxcom.transport.asyncio.AsyncioTransport.get_callback_parser')
@@ -126,30 +189,257 @@ class AsyncioTransportTestCase(TestCase):
     @mock.patch('serial.Serial')
     def test_transport_do_callback(self, device, loop, get_parser):
 
-        cb = mock.Mock()
-        get_parser.return_value = (cb, "test")
+        reading = mock.Mock(sensor_id=0x2EB2)
+        get_parser.return_value = (_noop, reading)
 
-        unit = AsyncioTransport(device, loop, callback=mock.Mock())
+        unit = self.transport(device, loop)
+        unit.dispatcher = mock.Mock()
 
-        def fake_read(*x):
-            data = {
-                (): b'\x02',
-                (2, ): b'\x01\x01'
-            }
-            return data[x]
-        device.read.side_effect = fake_read
+        device.in_waiting = 3
+        device.read.return_value = b'\x02\x01\x01'
 
         expected_result = b'\x02\x01\x01'
         self.assertEquals(unit.read(), expected_result)
-        loop.call_soon_threadsafe.assert_called_once_with(
-            AsyncioTransport._do_async_callback, cb, "test")
+        unit.dispatcher.submit.assert_called_once_with(
+            (reading.handler.__class__, 0x2EB2), _noop, reading)
+
+    @mock.patch(
+        'rfxcom.transport.asyncio.AsyncioTransport.get_callback_parser')
+    @mock.patch('asyncio.AbstractEventLoop')
+    @mock.patch('serial.Serial')
+    def test_transport_do_callback_lazy(self, device, loop, get_parser):
+
+        view = Elec().view(bytearray(b'\x11\x5A\x01\x00\x2E\xB2\x03\x00'
+                                     b'\x00\x02\xB4\x00\x00\x0C\x46\xA8'
+                                     b'\x11\x69'))
+        get_parser.return_value = (_noop, view)
+
+        unit = self.transport(device, loop)
+        unit.dispatcher = mock.Mock()
+        unit.do_callback(view.raw)
+
+        unit.dispatcher.submit.assert_called_once_with(
+            (Elec, None), _noop, view)
+        self.assertFalse(view.decoded)
+
+    @mock.patch(
+        'rfxcom.transport.asyncio.AsyncioTransport.get_callback_parser')
+    @mock.patch('asyncio.AbstractEventLoop')
+    @mock.patch('serial.Serial')
+    def test_transport_do_callback_sync(self, device, loop, get_parser):
+
+        cb = mock.Mock()
+        get_parser.return_value = (cb, "test")
+
+        unit = self.transport(device, loop)
+        unit.do_callback(b'\x02\x01\x01')
+
+        loop.call_soon.assert_called_once_with(unit.run_callback, cb, "test")
 
     @mock.patch('asyncio.AbstractEventLoop')
     @mock.patch('serial.Serial')
     def test_transport_write_from_queue(self, device, loop):
         payload = b'\x01\x01'
-        unit = AsyncioTransport(device, loop, callback=mock.Mock())
+        unit = self.transport(device, loop)
 
         unit.write(payload)
 
         device.write.assert_called_once_with(payload)
+
+
+class AsyncioTransportRequestTestCase(TestCase):
+
+    """AsyncioTransport.request test case."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.device = mock.Mock()
+
+        with mock.patch.object(AsyncioTransport, '_setup', _noop):
+            self.unit = AsyncioTransport(self.device, self.loop,
+                                         callback=mock.Mock())
+
+        self.status = bytearray(b'\x0D\x01\x00\x01\x02\x53\x45\x00\x0C'
+                                b'\x2F\x01\x01\x00\x00')
+
+    def tearDown(self):
+
+        # Run the patched _setup tasks of tests that didn't run the loop.
+        self.loop.run_until_complete(asyncio.sleep(0))
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def respond(self, sequence_number, packet=None, delay=0):
+
+        if packet is None:
+            packet = self.status
+
+        response = bytearray(packet)
+        response[3] = sequence_number
+        self.loop.call_later(delay, self.unit.do_callback, response)
+
+    def written(self):
+
+        return [bytes(c[0][0]) for c in self.device.write.call_args_list]
+
+    def test_request(self):
+
+        self.device.write.side_effect = lambda pkt: self.respond(pkt[3])
+
+        reading = self.loop.run_until_complete(
+            self.unit.request(STATUS_PACKET))
+
+        self.assertEqual(reading.sequence_number, 1)
+        self.assertEqual(reading.data['firmware_version'], 69)
+        self.assertEqual(self.written(), [STATUS_PACKET])
+        self.assertEqual(self.unit._requests, {})
+
+    def test_request_many(self):
+
+        # The responses arrive in reverse order and are matched by sequence
+        # number. The second is a transmitter acknowledgement.
+        def write(pkt):
+            if pkt[3] == 2:
+                self.respond(2, b'\x04\x02\x01\x00\x00', delay=0.02)
+            else:
+                self.respond(pkt[3], delay=0.04 - pkt[3] * 0.01)
+
+        self.device.write.side_effect = write
+
+        readings = self.loop.run_until_complete(asyncio.gather(
+            self.unit.request(STATUS_PACKET),
+            self.unit.request(MODE_PACKET),
+            self.unit.request(STATUS_PACKET),
+        ))
+
+        self.assertEqual([r.raw[3] for r in readings], [1, 2, 3])
+        self.assertEqual(readings[1].packet_type, 0x02)
+        self.assertEqual([p[3] for p in self.written()], [1, 2, 3])
+
+    def test_request_timeout(self):
+
+        # A response to a different request is ignored.
+        self.respond(9)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(
+                self.unit.request(STATUS_PACKET, timeout=0.01))
+
+        self.assertEqual(self.unit._requests, {})
+
+    def test_sequence_number_in_use(self):
+
+        self.unit._requests = dict.fromkeys(range(256))
+
+        with self.assertRaises(RFXComException):
+            self.unit._next_sequence_number()
+
+        del self.unit._requests[7]
+        self.assertEqual(self.unit._next_sequence_number(), 7)
+
+    def setup(self, protocol_flags):
+        """Run the initialisation, responding to every request with the
+        status packet with the given protocol flags.
+        """
+
+        status = bytearray(self.status)
+        status[7:10] = protocol_flags
+
+        def write(pkt):
+            if pkt[4] in (0x02, 0x03):
+                self.respond(pkt[3], status)
+
+        self.device.write.side_effect = write
+
+        with mock.patch.object(self.loop, 'add_reader'):
+            self.loop.run_until_complete(self.unit._setup())
+
+        return self.written()
+
+    def test_setup_mode_matches(self):
+
+        written = self.setup(MODE_PACKET[7:10])
+
+        # The MODE packet isn't needed.
+        self.assertEqual(written, [RESET_PACKET, STATUS_PACKET])
+        self.assertEqual(self.unit.state, READY)
+        self.assertEqual(self.unit.ready.result().protocol_flags,
+                         (0x00, 0x0E, 0x2F))
+
+    def test_setup_paused(self):
+
+        # DeviceManager.add pauses a device added while the manager is
+        # paused before it has been set up.
+        with mock.patch.object(self.loop, 'remove_reader') as remove_reader:
+            self.unit.pause_reading()
+            self.assertFalse(remove_reader.called)
+
+            self.setup(MODE_PACKET[7:10])
+
+        self.assertEqual(self.unit.state, READY)
+        self.assertTrue(self.unit.reading_paused)
+        remove_reader.assert_called_once_with(self.device.fd)
+
+    def test_setup_paused_and_resumed(self):
+
+        with mock.patch.object(self.loop, 'remove_reader') as remove_reader:
+            self.unit.pause_reading()
+            self.unit.resume_reading()
+
+            self.setup(MODE_PACKET[7:10])
+
+        self.assertFalse(self.unit.reading_paused)
+        self.assertFalse(remove_reader.called)
+
+    def test_setup_mode_differs(self):
+
+        written = self.setup(b'\x00\x0C\x2F')
+
+        self.assertEqual(len(written), 3)
+        self.assertEqual(written[2][3], 2)
+        self.assertEqual(written[2][4:], MODE_PACKET[4:])
+        self.assertEqual(self.unit.state, READY)
+
+    def no_default_callback(self):
+        """Replace the unit with one that only has an Elec callback, so the
+        status isn't decoded by the callbacks.
+        """
+
+        with mock.patch.object(AsyncioTransport, '_setup', _noop):
+            self.unit = AsyncioTransport(self.device, self.loop,
+                                         callbacks={Elec: mock.Mock()})
+
+    def test_setup_no_default_callback(self):
+
+        self.no_default_callback()
+
+        written = self.setup(b'\x00\x0C\x2F')
+
+        self.assertEqual(len(written), 3)
+        self.assertEqual(self.unit.state, READY)
+        self.assertIsInstance(self.unit.ready.result().handler, Status)
+
+    def test_setup_no_default_callback_mode_matches(self):
+
+        self.no_default_callback()
+
+        written = self.setup(MODE_PACKET[7:10])
+
+        # The MODE packet is still skipped when the callbacks can't decode
+        # the status.
+        self.assertEqual(written, [RESET_PACKET, STATUS_PACKET])
+        self.assertEqual(self.unit.state, READY)
+
+    def test_setup_failed(self):
+
+        self.unit.STATUS_TIMEOUT = 0.01
+
+        with mock.patch.object(self.loop, 'add_reader'), \
+                mock.patch.object(self.unit, 'log'):
+            self.loop.run_until_complete(self.unit._setup())
+
+        self.assertEqual(self.unit.state, FAILED)
+        self.assertIsInstance(self.unit.ready.exception(),
+                              asyncio.TimeoutError)
@@ -4,7 +4,8 @@ from unittest.mock import Mock, ANY
 from serial import Serial
 
 from rfxcom.exceptions import PacketHandlerNotFound, RFXComException
-from rfxcom.protocol import Elec
+from rfxcom.protocol import Elec, Packet, TempHumidity
+from rfxcom.protocol.base import PacketView
 from rfxcom.transport.base import BaseTransport
 
 
@@ -84,6 +85,91 @@ class BaseTransportTestCase(TestCase):
             (_callback2, ANY)
         )
 
+    def test_get_callback_parser_routed(self):
+
+        # Only a default callback, the packet should be routed through the
+        # HANDLERS to the matching handler.
+        temp_humidity_packet = bytearray(b'\x0A\x52\x01\x00\x2E\xB2\x00'
+                                         b'\xD5\x5B\x03\x69')
+
+        callback, reading = self.transport.get_callback_parser(
+            temp_humidity_packet)
+
+        self.assertEquals(callback, _callback)
+        self.assertIsInstance(reading.handler, TempHumidity)
+        self.assertEquals(reading.data['temperature'], 21.3)
+        self.assertEquals(reading.raw, temp_humidity_packet)
+        self.assertEquals(str(reading), "<TempHumidity ID:0x2EB2>")
+
+    def test_get_callback_parser_shared_handler(self):
+
+        elec_packet = bytearray(self.elec_packet)
+
+        _, first = self.transport.get_callback_parser(elec_packet)
+        _, second = self.transport.get_callback_parser(elec_packet)
+
+        # The handler is shared, the readings are not.
+        self.assertIs(first.handler, second.handler)
+        self.assertIsNot(first, second)
+        self.assertFalse(hasattr(first.handler, 'data'))
+
+    def test_get_callback_parser_lazy(self):
+
+        transport = BaseTransport(device=self.device, callback=_callback,
+                                  lazy=True)
+        elec_packet = bytearray(self.elec_packet)
+
+        callback, view = transport.get_callback_parser(elec_packet)
+
+        self.assertEquals(callback, _callback)
+        self.assertIsInstance(view, PacketView)
+        self.assertEquals(view.id, "0x2EB2")
+        self.assertEquals(view.current_watts, 692)
+
+    def test_ordering_key(self):
+
+        elec_packet = bytearray(self.elec_packet)
+        view = Elec().view(elec_packet)
+
+        self.assertEqual(self.transport.ordering_key(view), (Elec, None))
+        self.assertFalse(view.decoded)
+
+        view.reading
+        self.assertEqual(self.transport.ordering_key(view), (Elec, 0x2EB2))
+
+        reading = Elec().decode(elec_packet)
+        self.assertEqual(self.transport.ordering_key(reading),
+                         (Elec, 0x2EB2))
+
+    def test_get_callback_parser_fallback(self):
+
+        # An unknown type, a known type with an unknown subtype and a known
+        # type with the wrong length all end up with the catch all Packet.
+        packets = [
+            bytearray(b'\x03\xFF\x01\x00'),
+            bytearray(b'\x0A\x52\xEE\x00\x2E\xB2\x00\xD5\x5B\x03\x69'),
+            bytearray(b'\x0A\x52\x01\x00'),
+        ]
+
+        for pkt in packets:
+            callback, reading = self.transport.get_callback_parser(pkt)
+            self.assertEquals(callback, _callback)
+            self.assertIs(type(reading.handler), Packet)
+
+    def test_get_callback_parser_order(self):
+
+        # User callbacks are tried before the HANDLERS in insertion order,
+        # so a catch all Packet callback shadows the later Elec callback.
+        parser = BaseTransport(device=self.device, callbacks={
+            Packet: _callback2,
+            Elec: _callback,
+        })
+
+        self.assertEquals(
+            parser.get_callback_parser(bytearray(self.elec_packet)),
+            (_callback2, ANY)
+        )
+
     def test_no_packet_handler_found(self):
 
         # Setup - handler for Elec and fallback for the rest.
@@ -94,6 +180,23 @@ class BaseTransportTestCase(TestCase):
         with self.assertRaises(PacketHandlerNotFound):
             parser.get_callback_parser(self.bytes_array)
 
+    def test_unknown_packet_in_chunk(self):
+
+        callback = Mock()
+        transport = BaseTransport(device=self.device, callbacks={
+            Elec: callback,
+        })
+        unknown = b'\x0A\x52\x01\x00\x2E\xB2\x00\xD5\x5B\x03\x69'
+
+        self.assertEquals(transport.data_received(unknown + self.elec_packet),
+                          bytearray(self.elec_packet))
+
+        callback.assert_called_once_with(ANY)
+        self.assertEquals(callback.call_args[0][0].raw,
+                          bytearray(self.elec_packet))
+        self.assertEquals(transport.metrics.handler_not_found, 1)
+        self.assertEquals(transport.decoder.pending, 0)
+
     def test_no_callbacks(self):
 
         with self.assertRaises(RFXComException):
@@ -131,23 +234,81 @@ class BaseTransportTestCase(TestCase):
 
     def test_reader(self):
 
-        call_map = {
-            (): [self.elec_packet[0], ],
-            (17, ): self.elec_packet[1:]
-        }
-
-        self.device.read = lambda *x: call_map[x]
+        self.device.in_waiting = len(self.elec_packet)
+        self.device.read.return_value = self.elec_packet
 
         self.assertEquals(self.transport.read(), bytearray(self.elec_packet))
+        self.device.read.assert_called_once_with(len(self.elec_packet))
+
+    def test_reader_many(self):
+
+        callback = Mock()
+        transport = BaseTransport(device=self.device, callback=callback)
+
+        data = self.elec_packet * 3
+        self.device.in_waiting = len(data)
+        self.device.read.return_value = data
+
+        self.assertEquals(transport.read(), bytearray(self.elec_packet))
+        self.assertEquals(callback.call_count, 3)
+
+    def test_reader_partial(self):
+
+        callback = Mock()
+        transport = BaseTransport(device=self.device, callback=callback)
+
+        self.device.in_waiting = 5
+        self.device.read.return_value = self.elec_packet[:5]
+
+        self.assertEquals(transport.read(), None)
+        self.assertFalse(callback.called)
+
+        self.device.in_waiting = 13
+        self.device.read.return_value = self.elec_packet[5:]
+
+        self.assertEquals(transport.read(), bytearray(self.elec_packet))
+        callback.assert_called_once_with(ANY)
+
+    def test_reader_nothing_waiting(self):
+
+        # With nothing waiting we block for a single byte.
+        self.device.in_waiting = 0
+        self.device.read.return_value = b''
+
+        self.assertEquals(self.transport.read(), None)
+        self.device.read.assert_called_once_with(1)
 
     def test_reader_empty(self):
 
+        self.device.in_waiting = 0
         self.device.read.return_value = ''
 
         self.assertEquals(self.transport.read(), None)
 
     def test_read_blank(self):
 
+        self.device.in_waiting = 1
         self.device.read.return_value = b'\x00'
 
         self.assertEquals(self.transport.read(), None)
+        self.assertEquals(self.transport.decoder.skipped, 1)
+
+    def test_read_byte_at_a_time(self):
+
+        # The sequence number and some of the data are zero bytes, which
+        # must be kept when they are read on their own.
+        pkt = b'\x0A\x52\x01\x00\x2E\xB2\x00\xD5\x5B\x03\x69'
+        callback = Mock()
+        transport = BaseTransport(device=self.device, callback=callback)
+
+        self.device.in_waiting = 0
+        self.device.read.side_effect = [bytes([b]) for b in pkt]
+
+        for _ in pkt:
+            transport.read()
+
+        callback.assert_called_once_with(ANY)
+        reading = callback.call_args[0][0]
+        self.assertEquals(reading.raw, bytearray(pkt))
+        self.assertEquals(reading.id, '0x2EB2')
+        self.assertEquals(transport.decoder.skipped, 0)
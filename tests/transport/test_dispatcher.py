@@ -0,0 +1,181 @@
+"""Unit tests for rfxcom.transport.dispatcher.AsyncDispatcher."""
+import asyncio
+from unittest import TestCase, mock
+
+from rfxcom.transport.dispatcher import AsyncDispatcher
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+class AsyncDispatcherTestCase(TestCase):
+
+    """AsyncDispatcher test case."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.received = []
+        self.active = set()
+        self.peak = 0
+
+    def tearDown(self):
+
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    async def callback(self, packet):
+
+        key, _ = packet
+
+        # Callbacks for the same key must never overlap.
+        self.assertNotIn(key, self.active)
+        self.active.add(key)
+        self.peak = max(self.peak, len(self.active))
+
+        await asyncio.sleep(0.001)
+
+        self.active.remove(key)
+        self.received.append(packet)
+
+    def wait(self, dispatcher):
+
+        async def idle():
+            for _ in range(500):
+                if not dispatcher.queued and not dispatcher.running:
+                    return
+                await asyncio.sleep(0.01)
+            self.fail("The callbacks didn't finish.")
+
+        self.loop.run_until_complete(idle())
+
+    def cancel_tasks(self):
+
+        if hasattr(asyncio, 'all_tasks'):
+            tasks = asyncio.all_tasks(self.loop)
+        else:  # Python < 3.7
+            tasks = asyncio.Task.all_tasks(self.loop)
+
+        for task in tasks:
+            task.cancel()
+
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+    def test_invalid_limit(self):
+
+        with self.assertRaises(ValueError):
+            AsyncDispatcher(self.loop, limit=0)
+
+    def test_order(self):
+
+        dispatcher = AsyncDispatcher(self.loop, limit=2)
+
+        for number in range(5):
+            for key in 'abcd':
+                dispatcher.submit(key, self.callback, (key, number))
+
+        # A task per key up to the limit, the rest is queued.
+        self.assertEqual(dispatcher.running, 2)
+        self.assertEqual(len(dispatcher), 20)
+        self.assertEqual(list(dispatcher._waiting), ['c', 'd'])
+
+        self.wait(dispatcher)
+
+        self.assertEqual(self.peak, 2)
+        self.assertEqual(len(self.received), 20)
+
+        for key in 'abcd':
+            self.assertEqual(
+                [number for k, number in self.received if k == key],
+                [0, 1, 2, 3, 4])
+
+        stats = dispatcher.as_dict()
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['max_queued'], 20)
+        self.assertEqual(stats['running'], 0)
+        self.assertEqual(stats['completed'], 20)
+        self.assertEqual(stats['run_time']['count'], 20)
+        self.assertGreater(stats['run_time']['max'], 0)
+        self.assertGreater(stats['wait_time']['mean'], 0)
+        self.assertEqual(dispatcher._shards, {})
+
+    def test_fair(self):
+
+        # A busy key hands its task over, so the other keys don't wait for
+        # all of its callbacks.
+        dispatcher = AsyncDispatcher(self.loop, limit=1)
+
+        for number in range(3):
+            dispatcher.submit('a', self.callback, ('a', number))
+        dispatcher.submit('b', self.callback, ('b', 0))
+
+        self.wait(dispatcher)
+
+        self.assertEqual(self.received,
+                         [('a', 0), ('b', 0), ('a', 1), ('a', 2)])
+
+    def test_submit_while_running(self):
+
+        dispatcher = AsyncDispatcher(self.loop, limit=1)
+
+        async def callback(packet):
+            self.received.append(packet)
+            if packet == 0:
+                dispatcher.submit('a', callback, 1)
+
+        dispatcher.submit('a', callback, 0)
+        self.wait(dispatcher)
+
+        self.assertEqual(self.received, [0, 1])
+        self.assertEqual(dispatcher.completed, 2)
+
+    def test_callback_error(self):
+
+        dispatcher = AsyncDispatcher(self.loop)
+        dispatcher.log = mock.Mock()
+
+        async def callback(packet):
+            self.received.append(packet)
+            raise ValueError()
+
+        dispatcher.submit('a', callback, 0)
+        dispatcher.submit('a', callback, 1)
+        self.wait(dispatcher)
+
+        self.assertEqual(self.received, [0, 1])
+        self.assertEqual(dispatcher.failed, 2)
+        self.assertEqual(dispatcher.log.exception.call_count, 2)
+
+    def test_finished(self):
+
+        finished = mock.Mock()
+        dispatcher = AsyncDispatcher(self.loop, finished=finished)
+
+        dispatcher.submit('a', self.callback, ('a', 0))
+        self.wait(dispatcher)
+
+        finished.assert_called_once_with(self.callback, ('a', 0), mock.ANY)
+        self.assertGreater(finished.call_args[0][2], 0)
+
+    def test_cancelled(self):
+
+        dispatcher = AsyncDispatcher(self.loop, limit=1)
+
+        async def callback(packet):
+            await asyncio.sleep(10)
+
+        dispatcher.submit('a', callback, 0)
+        dispatcher.submit('a', callback, 1)
+        dispatcher.submit('b', callback, 0)
+
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.cancel_tasks()
+
+        # The queued callbacks for a are dropped, b gets the task.
+        self.assertNotIn('a', dispatcher._shards)
+        self.assertIn('b', dispatcher._shards)
+        self.assertEqual(dispatcher.queued, 0)
+        self.assertEqual(dispatcher.running, 1)
+
+        self.cancel_tasks()
@@ -0,0 +1,144 @@
+"""Unit tests for rfxcom.transport.hooks."""
+import logging
+from unittest import TestCase
+from unittest.mock import ANY, Mock, call, patch
+
+from serial import Serial
+
+from rfxcom.transport import hooks
+from rfxcom.transport.base import BaseTransport
+from rfxcom.transport.hooks import DECODED, WRITTEN, Hooks
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+ELEC_PACKET = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+               b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+
+class HooksTestCase(TestCase):
+
+    def setUp(self):
+
+        self.hooks = Hooks()
+
+    def test_empty(self):
+
+        for event in hooks.EVENTS:
+            self.assertEqual(getattr(self.hooks, event), ())
+
+    def test_add_remove(self):
+
+        first, second = Mock(), Mock()
+
+        self.hooks.add(DECODED, first)
+        self.hooks.add(DECODED, second)
+        self.assertEqual(self.hooks.decoded, (first, second))
+
+        self.hooks.remove(DECODED, first)
+        self.assertEqual(self.hooks.decoded, (second, ))
+
+        with self.assertRaises(ValueError):
+            self.hooks.remove(DECODED, first)
+
+    def test_unknown_event(self):
+
+        with self.assertRaises(ValueError):
+            self.hooks.add('read', Mock())
+
+    def test_emit(self):
+
+        failing = Mock(side_effect=ValueError)
+        hook = Mock()
+
+        self.hooks.add(WRITTEN, failing)
+        self.hooks.add(WRITTEN, hook)
+
+        with patch.object(hooks, 'log') as log:
+            self.hooks.emit(WRITTEN, 1, 2)
+
+        failing.assert_called_once_with(1, 2)
+        hook.assert_called_once_with(1, 2)
+        self.assertEqual(log.exception.call_count, 1)
+
+
+class TransportHooksTestCase(TestCase):
+
+    def setUp(self):
+
+        self.callback = Mock()
+        self.device = Mock(spec=Serial)
+        self.transport = BaseTransport(self.device, callback=self.callback)
+        self.trace = Mock()
+
+        for event in hooks.EVENTS:
+            self.transport.hooks.add(event, getattr(self.trace, event))
+
+    def test_read(self):
+
+        pkt = self.transport.data_received(ELEC_PACKET)
+        reading = self.callback.call_args[0][0]
+
+        self.assertEqual(self.trace.mock_calls, [
+            call.frame_received(self.transport, pkt),
+            call.decoded(self.transport, pkt, reading),
+            call.dispatched(self.transport, self.callback, reading),
+            call.callback_finished(self.transport, self.callback, reading,
+                                   ANY),
+        ])
+
+    def test_write(self):
+
+        self.transport.write(b'\x0D\x00\x00\x01\x02')
+
+        self.trace.written.assert_called_once_with(
+            self.transport, bytearray(b'\x0D\x00\x00\x01\x02'))
+        self.device.write.assert_called_once_with(
+            bytearray(b'\x0D\x00\x00\x01\x02'))
+
+
+class PacketLoggingTestCase(TestCase):
+
+    def setUp(self):
+
+        self.logger = logging.getLogger('rfxcom.transport.BaseTransport')
+        self.addCleanup(self.logger.setLevel, self.logger.level)
+
+    def test_disabled(self):
+
+        self.logger.setLevel(logging.WARNING)
+        transport = BaseTransport(Mock(spec=Serial), callback=Mock())
+
+        with patch.object(transport, 'format_packet') as format_packet:
+            transport.data_received(ELEC_PACKET)
+            transport.write(b'\x0D\x00\x00\x01\x02')
+
+        self.assertFalse(format_packet.called)
+        self.assertEqual(transport.hooks.frame_received, ())
+        self.assertEqual(transport.hooks.written, ())
+
+    def test_enabled(self):
+
+        self.logger.setLevel(logging.INFO)
+        transport = BaseTransport(Mock(spec=Serial), callback=Mock())
+
+        with patch.object(transport, 'log') as log:
+            transport.data_received(ELEC_PACKET)
+            transport.write(b'\x0D\x00')
+
+        self.assertEqual(log.info.mock_calls, [
+            call("READ : %s" % transport.format_packet(ELEC_PACKET)),
+            call("WRITE: 0x0d 0x00"),
+        ])
+
+    def test_enabled_after_construction(self):
+
+        self.logger.setLevel(logging.WARNING)
+        transport = BaseTransport(Mock(spec=Serial), callback=Mock())
+
+        with self.assertLogs(self.logger, logging.INFO) as logs:
+            transport.write(b'\x0D\x00')
+
+        self.assertEqual(logs.output, [
+            "INFO:rfxcom.transport.BaseTransport:WRITE: 0x0d 0x00"])
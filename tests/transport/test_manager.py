@@ -0,0 +1,187 @@
+"""Unit tests for rfxcom.transport.manager.DeviceManager."""
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from rfxcom.transport.manager import DeviceManager, TaggedPacket
+from rfxcom.transport.packetstream import DROP_NEWEST
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+class FakeTransport:
+
+    def __init__(self, device, loop, callback=None, **kwargs):
+
+        if device.endswith('broken'):
+            raise OSError("Could not open %s" % device)
+
+        self.device = device
+        self.callback = callback
+        self.kwargs = kwargs
+        self.connected = True
+        self.ready = loop.create_future()
+        self.pause_reading = mock.Mock()
+        self.resume_reading = mock.Mock()
+        self.close = mock.Mock()
+
+
+class DeviceManagerTestCase(TestCase):
+
+    """DeviceManager test case."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.dir = tempfile.mkdtemp()
+        self.pattern = os.path.join(self.dir, 'usb-RFXCOM_*')
+
+        self.manager = DeviceManager(self.loop, [self.pattern],
+                                     transport_class=FakeTransport, lazy=True)
+        self.manager.log = mock.Mock()
+
+    def tearDown(self):
+
+        self.manager.close()
+        asyncio.set_event_loop(None)
+        self.loop.close()
+        shutil.rmtree(self.dir)
+
+    def plug(self, name):
+
+        path = os.path.join(self.dir, name)
+        open(path, 'w').close()
+        return path
+
+    def test_add(self):
+
+        first = self.plug('usb-RFXCOM_433')
+        second = self.plug('usb-RFXCOM_868')
+        self.plug('usb-OTHER')
+
+        self.manager.start()
+
+        self.assertEqual(sorted(self.manager.transports), [first, second])
+        self.assertEqual(self.manager.transports[first].kwargs,
+                         {'lazy': True})
+        self.assertTrue(self.manager.stats[first].connected)
+
+    def test_packets(self):
+
+        first = self.plug('usb-RFXCOM_433')
+        second = self.plug('usb-RFXCOM_868')
+        self.manager.scan()
+
+        stream = self.manager.packets()
+
+        self.manager.transports[first].callback('a')
+        self.manager.transports[second].callback('b')
+        self.manager.transports[first].callback('c')
+
+        self.assertEqual(len(stream), 3)
+        self.assertEqual(
+            self.loop.run_until_complete(stream.get()),
+            TaggedPacket(first, 'a'))
+
+        stats = self.manager.stats[first]
+        self.assertEqual(stats.packets, 2)
+        self.assertEqual(self.manager.stats[second].packets, 1)
+        self.assertGreater(stats.rate, 0)
+        self.assertEqual(stats.as_dict()['packets'], 2)
+
+    def test_hotplug(self):
+
+        path = self.plug('usb-RFXCOM_433')
+        self.manager.scan()
+        transport = self.manager.transports[path]
+
+        os.remove(path)
+        self.manager.scan()
+
+        self.assertEqual(self.manager.transports, {})
+        self.assertFalse(self.manager.stats[path].connected)
+        self.assertEqual(self.manager.stats[path].rate, 0.0)
+        transport.close.assert_called_once_with()
+
+        self.plug('usb-RFXCOM_433')
+        self.manager.scan()
+
+        self.assertIsNot(self.manager.transports[path], transport)
+        self.assertTrue(self.manager.stats[path].connected)
+
+    def test_failed(self):
+
+        path = self.plug('usb-RFXCOM_433')
+        self.manager.scan()
+        transport = self.manager.transports[path]
+        transport.callback('a')
+
+        # The device is reconnected by the next scan.
+        transport.connected = False
+        self.manager.scan()
+
+        self.assertIsNot(self.manager.transports[path], transport)
+        self.assertEqual(self.manager.stats[path].errors, 1)
+        self.assertEqual(self.manager.stats[path].packets, 1)
+
+    def test_failed_ready(self):
+
+        path = self.plug('usb-RFXCOM_433')
+        self.manager.scan()
+        transport = self.manager.transports[path]
+
+        transport.ready.set_exception(asyncio.TimeoutError())
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+        self.assertEqual(self.manager.transports, {})
+        self.assertEqual(self.manager.stats[path].errors, 1)
+
+    def test_failed_open(self):
+
+        path = self.plug('usb-RFXCOM_broken')
+        self.manager.scan()
+        self.manager.scan()
+
+        self.assertEqual(self.manager.transports, {})
+        self.assertEqual(self.manager.stats[path].errors, 2)
+
+    def test_block(self):
+
+        first = self.plug('usb-RFXCOM_433')
+        self.manager.scan()
+
+        stream = self.manager.packets(maxsize=1)
+        self.manager.packets(maxsize=1, policy=DROP_NEWEST)
+
+        self.manager.transports[first].callback('a')
+
+        self.assertTrue(self.manager.reading_paused)
+        self.manager.transports[first].pause_reading.assert_called_once_with()
+
+        # Devices added while paused are paused too.
+        second = self.plug('usb-RFXCOM_868')
+        self.manager.scan()
+        self.manager.transports[second].pause_reading.assert_called_once_with()
+
+        self.loop.run_until_complete(stream.get())
+
+        self.assertFalse(self.manager.reading_paused)
+        for transport in self.manager.transports.values():
+            transport.resume_reading.assert_called_once_with()
+
+    def test_close(self):
+
+        self.plug('usb-RFXCOM_433')
+        self.manager.start()
+        stream = self.manager.packets()
+
+        self.manager.close()
+
+        self.assertEqual(self.manager.transports, {})
+        self.assertTrue(stream.closed)
+        self.assertIsNone(self.manager._scan_handle)
@@ -0,0 +1,227 @@
+"""Unit tests for rfxcom.transport.nonblocking.NonBlockingTransport."""
+import asyncio
+import os
+import socket
+from unittest import TestCase, mock
+
+from rfxcom.protocol import RESET_PACKET, STATUS_PACKET
+from rfxcom.transport import NonBlockingTransport
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+_os_write = os.write
+
+
+async def _noop(*args, **kwargs):
+    pass
+
+
+class NonBlockingTransportTestCase(TestCase):
+
+    """NonBlockingTransport test case."""
+
+    def setUp(self):
+
+        self.read_fd, self.write_fd = os.pipe()
+
+        self.device = mock.Mock()
+        self.device.fd = self.read_fd
+        self.loop = mock.Mock()
+
+        self.elec_packet = (b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                            b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+    def tearDown(self):
+
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def get_transport(self, **kwargs):
+
+        with mock.patch.object(NonBlockingTransport, '_setup',
+                               new_callable=mock.Mock):
+            return NonBlockingTransport(self.device, self.loop,
+                                        callback=mock.Mock(), **kwargs)
+
+    def test_non_blocking(self):
+
+        self.get_transport()
+
+        self.assertFalse(os.get_blocking(self.read_fd))
+
+    def test_read(self):
+
+        unit = self.get_transport()
+        os.write(self.write_fd, self.elec_packet)
+
+        self.assertEquals(unit.read(), self.elec_packet)
+        self.assertEquals(self.loop.call_soon.call_count, 1)
+        self.device.read.assert_not_called()
+
+    def test_read_nothing(self):
+
+        unit = self.get_transport()
+
+        self.assertIsNone(unit.read())
+        self.assertTrue(unit.connected)
+        self.loop.call_soon.assert_not_called()
+
+    def test_read_everything_available(self):
+
+        # The buffer is smaller than the data, so it is read repeatedly.
+        unit = self.get_transport(buffer_size=8)
+        os.write(self.write_fd, b'\x00' + self.elec_packet * 3)
+
+        self.assertEquals(unit.read(), self.elec_packet)
+        self.assertEquals(self.loop.call_soon.call_count, 3)
+
+    def test_read_partial(self):
+
+        unit = self.get_transport()
+
+        os.write(self.write_fd, self.elec_packet[:5])
+        self.assertIsNone(unit.read())
+
+        os.write(self.write_fd, self.elec_packet[5:])
+        self.assertEquals(unit.read(), self.elec_packet)
+
+    def test_connection_lost(self):
+
+        unit = self.get_transport()
+        os.write(self.write_fd, self.elec_packet[:5])
+        os.close(self.write_fd)
+
+        self.assertIsNone(unit.read())
+        self.assertTrue(unit.connected)
+
+        # The loop calls read again as the end of file is readable.
+        self.assertIsNone(unit.read())
+
+        self.assertFalse(unit.connected)
+        self.loop.remove_reader.assert_called_once_with(self.read_fd)
+        self.assertEquals(unit.decoder.pending, 0)
+
+    def test_close(self):
+
+        unit = self.get_transport()
+
+        unit.close()
+        unit.close()
+
+        self.loop.remove_reader.assert_called_once_with(self.read_fd)
+        self.assertEquals(self.device.close.call_count, 2)
+
+
+class NonBlockingTransportWriteTestCase(TestCase):
+
+    """NonBlockingTransport write queue test case."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.device_sock, self.sock = socket.socketpair()
+
+        self.device = mock.Mock()
+        self.device.fd = self.device_sock.fileno()
+
+        self.lighting5_packet = (b'\x0A\x14\x00\xAD\xF3\x94\xAB'
+                                 b'\x01\x01\x00\x60')
+
+        with mock.patch.object(NonBlockingTransport, '_setup', _noop):
+            self.unit = NonBlockingTransport(self.device, self.loop,
+                                             callback=mock.Mock(),
+                                             tx_interval=0.05)
+
+    def tearDown(self):
+
+        self.loop.close()
+        self.device_sock.close()
+        self.sock.close()
+
+    def received(self):
+
+        self.sock.setblocking(False)
+        try:
+            return self.sock.recv(4096)
+        except BlockingIOError:
+            return b''
+
+    def test_write_coalesced(self):
+
+        with mock.patch('os.write', wraps=os.write) as write:
+            futures = [self.unit.write(RESET_PACKET),
+                       self.unit.write(STATUS_PACKET)]
+
+            # Nothing is written until the loop runs.
+            write.assert_not_called()
+
+            self.loop.run_until_complete(asyncio.wait(futures))
+
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.received(), RESET_PACKET + STATUS_PACKET)
+        self.assertFalse(self.unit._writer_added)
+
+    def test_write_paced(self):
+
+        times = []
+
+        def timed_write(fd, data):
+            times.append(self.loop.time())
+            return _os_write(fd, data)
+
+        with mock.patch('os.write', side_effect=timed_write):
+            for _ in range(3):
+                self.unit.write(self.lighting5_packet)
+
+            self.loop.run_until_complete(self.unit.drain())
+
+        self.assertEqual(len(times), 3)
+        self.assertGreaterEqual(times[1] - times[0], 0.045)
+        self.assertGreaterEqual(times[2] - times[1], 0.045)
+        self.assertEqual(self.received(), self.lighting5_packet * 3)
+
+    def test_write_partial(self):
+
+        results = [BlockingIOError(), 4]
+
+        def partial_write(fd, data):
+            if results:
+                result = results.pop(0)
+                if isinstance(result, Exception):
+                    raise result
+                data = data[:result]
+            return _os_write(fd, data)
+
+        with mock.patch('os.write', side_effect=partial_write):
+            future = self.unit.write(RESET_PACKET)
+            self.loop.run_until_complete(future)
+
+        self.assertEqual(self.received(), RESET_PACKET)
+
+    def test_write_failed(self):
+
+        request = self.loop.create_future()
+        self.unit._requests[1] = request
+
+        with mock.patch('os.write', side_effect=OSError(5, "EIO")):
+            future = self.unit.write(self.lighting5_packet)
+
+            with self.assertRaises(OSError):
+                self.loop.run_until_complete(future)
+
+        self.assertFalse(self.unit.connected)
+        self.assertIsInstance(request.exception(), OSError)
+
+        future = self.unit.write(self.lighting5_packet)
+        self.assertIsInstance(future.exception(), ConnectionError)
+
+    def test_send(self):
+
+        self.loop.run_until_complete(self.unit.sendRESET())
+
+        self.assertEqual(self.received(), RESET_PACKET)
@@ -0,0 +1,174 @@
+"""Unit tests for rfxcom.transport.packetstream.PacketStream."""
+import asyncio
+from unittest import TestCase, mock
+
+from rfxcom.exceptions import PacketStreamClosed
+from rfxcom.transport import AsyncioTransport
+from rfxcom.transport.asyncio import READY
+from rfxcom.transport.packetstream import (BLOCK, DROP_NEWEST, DROP_OLDEST,
+                                           PacketStream)
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+async def _consume(stream):
+
+    packets = []
+
+    async for packet in stream:
+        packets.append(packet)
+
+    return packets
+
+
+class PacketStreamTestCase(TestCase):
+
+    """PacketStream test case."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def consume(self, stream):
+
+        return self.loop.run_until_complete(_consume(stream))
+
+    def test_invalid(self):
+
+        with self.assertRaises(ValueError):
+            PacketStream(maxsize=0)
+
+        with self.assertRaises(ValueError):
+            PacketStream(policy='wait')
+
+    def test_async_for(self):
+
+        stream = PacketStream()
+
+        for packet in range(3):
+            self.assertTrue(stream.put(packet))
+
+        stream.close()
+
+        self.assertEqual(self.consume(stream), [0, 1, 2])
+        self.assertFalse(stream.put(3))
+        self.assertEqual(len(stream), 0)
+
+        with self.assertRaises(PacketStreamClosed):
+            self.loop.run_until_complete(stream.get())
+
+    def test_get_waits(self):
+
+        stream = PacketStream()
+        self.loop.call_soon(stream.put, 'packet')
+
+        self.assertEqual(self.loop.run_until_complete(stream.get()),
+                         'packet')
+
+    def test_drop_oldest(self):
+
+        stream = PacketStream(maxsize=2, policy=DROP_OLDEST)
+
+        for packet in range(5):
+            self.assertTrue(stream.put(packet))
+
+        self.assertTrue(stream.full())
+        self.assertEqual(stream.dropped, 3)
+
+        stream.close()
+        self.assertEqual(self.consume(stream), [3, 4])
+
+    def test_drop_newest(self):
+
+        stream = PacketStream(maxsize=2, policy=DROP_NEWEST)
+
+        self.assertEqual([stream.put(packet) for packet in range(5)],
+                         [True, True, False, False, False])
+        self.assertEqual(stream.dropped, 3)
+
+        stream.close()
+        self.assertEqual(self.consume(stream), [0, 1])
+
+    def test_block(self):
+
+        transport = mock.Mock()
+        transport.reading_paused = False
+        stream = PacketStream(maxsize=2, policy=BLOCK, transport=transport)
+
+        stream.put(0)
+        transport.pause_reading.assert_not_called()
+
+        # Nothing is dropped, the reader is paused instead.
+        for packet in range(1, 4):
+            self.assertTrue(stream.put(packet))
+
+        self.assertEqual(transport.pause_reading.call_count, 3)
+        self.assertEqual(stream.dropped, 0)
+
+        # Reading is resumed once the stream is below maxsize.
+        transport.reading_paused = True
+        self.loop.run_until_complete(stream.get())
+        self.loop.run_until_complete(stream.get())
+        transport.resume_reading.assert_not_called()
+
+        self.loop.run_until_complete(stream.get())
+        transport.resume_reading.assert_called_once_with()
+
+        stream.close()
+        transport.remove_stream.assert_called_once_with(stream)
+
+
+class TransportPacketsTestCase(TestCase):
+
+    """AsyncioTransport.packets test case."""
+
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport._setup',
+                new_callable=mock.Mock)
+    def setUp(self, _setup):
+
+        self.loop = mock.Mock()
+        self.device = mock.Mock()
+        self.transport = AsyncioTransport(self.device, self.loop,
+                                          callback=mock.Mock())
+        self.transport.state = READY
+
+        self.elec_packet = bytearray(b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                                     b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+    def test_packets(self):
+
+        stream = self.transport.packets(maxsize=1, policy=DROP_NEWEST)
+
+        self.transport.do_callback(self.elec_packet)
+        self.transport.do_callback(self.elec_packet)
+
+        self.assertEqual(len(stream), 1)
+        self.assertEqual(stream.dropped, 1)
+        self.assertEqual(self.loop.call_soon.call_count, 2)
+
+    def test_packets_block(self):
+
+        stream = self.transport.packets(maxsize=1)
+
+        self.transport.do_callback(self.elec_packet)
+
+        self.assertTrue(self.transport.reading_paused)
+        self.loop.remove_reader.assert_called_once_with(self.device.fd)
+
+        # Still full, so reading isn't resumed.
+        self.transport.resume_reading()
+        self.loop.add_reader.assert_not_called()
+
+        stream.close()
+
+        self.assertFalse(self.transport.reading_paused)
+        self.assertEqual(self.transport.streams, [])
+        self.loop.add_reader.assert_called_once_with(
+            self.device.fd, self.transport.read)
@@ -0,0 +1,234 @@
+"""Unit tests for rfxcom.transport.policy."""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+from rfxcom.transport import AsyncioTransport
+from rfxcom.transport.hooks import CALLBACK_FINISHED
+from rfxcom.transport.policy import InProcess, InThread, Inline
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+TEMPERATURE_PACKET = bytearray([0x08, 0x50, 0x02, 0x00, 0x00, 0x01,
+                                0x00, 0xA7, 0x89])
+
+
+def process_callback(reading):
+    """Run in another process, so it needs to be at the module level."""
+    return os.getpid(), reading.as_dict()['temperature']
+
+
+async def _noop(*args, **kwargs):
+    pass
+
+
+class CallbackPolicyTestCase(TestCase):
+
+    """CallbackPolicy test case."""
+
+    def setUp(self):
+
+        self.loop = asyncio.new_event_loop()
+        self.received = []
+
+    def tearDown(self):
+
+        self.loop.close()
+
+    def wait(self, policy):
+        """Run the loop until the policy has finished every callback."""
+
+        async def idle():
+            for _ in range(500):
+                if not policy.running and not policy.backlog:
+                    return
+                await asyncio.sleep(0.01)
+            self.fail("The callbacks didn't finish.")
+
+        self.loop.run_until_complete(idle())
+
+    def test_invalid_limit(self):
+
+        with self.assertRaises(ValueError):
+            Inline(self.received.append, limit=0)
+
+    def test_inline(self):
+
+        policy = Inline(self.received.append)
+
+        policy.dispatch(self.loop, 1)
+        policy.dispatch(self.loop, 2)
+
+        self.assertEqual(self.received, [1, 2])
+        self.assertEqual(policy.running, 0)
+
+    def test_inline_coroutine_limit(self):
+
+        running = []
+        peak = []
+
+        async def callback(packet):
+            running.append(packet)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(packet)
+            self.received.append(packet)
+
+        policy = Inline(callback, limit=2)
+
+        for packet in range(5):
+            policy.dispatch(self.loop, packet)
+
+        self.assertEqual(policy.running, 2)
+        self.assertEqual([packet for packet, _ in policy.backlog], [2, 3, 4])
+
+        self.wait(policy)
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(sorted(self.received), [0, 1, 2, 3, 4])
+
+    def test_callback_error(self):
+
+        def callback(packet):
+            self.received.append(packet)
+            raise ValueError()
+
+        policy = Inline(callback, limit=1)
+        policy.log = mock.Mock()
+
+        policy.dispatch(self.loop, 1)
+        policy.dispatch(self.loop, 2)
+
+        self.assertEqual(self.received, [1, 2])
+        self.assertEqual(policy.log.exception.call_count, 2)
+        self.assertEqual(policy.running, 0)
+
+    def test_thread(self):
+
+        threads = []
+
+        def callback(packet):
+            threads.append(threading.current_thread())
+            self.received.append(packet)
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        policy = InThread(callback, limit=1, executor=executor)
+
+        for packet in range(3):
+            policy.dispatch(self.loop, packet)
+
+        self.wait(policy)
+        executor.shutdown()
+
+        # With a limit of one the packets are handled in order.
+        self.assertEqual(self.received, [0, 1, 2])
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_thread_error(self):
+
+        policy = InThread(mock.Mock(side_effect=ValueError()))
+        policy.log = mock.Mock()
+
+        policy.dispatch(self.loop, 1)
+        self.wait(policy)
+
+        self.assertEqual(policy.log.error.call_count, 1)
+
+    def test_finished(self):
+
+        policy = Inline(self.received.append, limit=1)
+        finished = mock.Mock()
+
+        policy.dispatch(self.loop, 1, finished)
+        self.wait(policy)
+
+        finished.assert_called_once_with(self.received.append, 1, mock.ANY)
+        self.assertGreaterEqual(finished.call_args[0][2], 0)
+
+    def test_process(self):
+
+        from rfxcom.protocol.temperature import Temperature
+
+        reading = Temperature().decode(TEMPERATURE_PACKET)
+        results = []
+
+        policy = InProcess(process_callback, limit=1)
+
+        def done(future):
+            results.append(future.result())
+
+        original_run = policy.run
+
+        def run(loop, packet):
+            future = original_run(loop, packet)
+            future.add_done_callback(done)
+            return future
+
+        policy.run = run
+
+        try:
+            policy.dispatch(self.loop, reading)
+            self.wait(policy)
+        finally:
+            policy.shutdown()
+
+        self.assertIsNone(policy.executor)
+        self.assertEqual(len(results), 1)
+        self.assertNotEqual(results[0][0], os.getpid())
+        self.assertEqual(results[0][1], 16.7)
+
+
+class AsyncioTransportPolicyTestCase(TestCase):
+
+    """AsyncioTransport callback policy test case."""
+
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport._setup',
+                side_effect=_noop)
+    @mock.patch('serial.Serial')
+    def test_do_callback(self, device, _setup):
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        policy = mock.Mock(spec=Inline)
+        transport = AsyncioTransport(device, loop, callback=policy)
+
+        transport.do_callback(TEMPERATURE_PACKET)
+
+        policy.dispatch.assert_called_once_with(
+            loop, mock.ANY, transport.callback_finished)
+        reading = policy.dispatch.call_args[0][1]
+        self.assertEqual(reading.sensor_id, 1)
+
+        loop.run_until_complete(asyncio.sleep(0))
+
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport._setup',
+                side_effect=_noop)
+    @mock.patch('serial.Serial')
+    def test_callback_finished(self, device, _setup):
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        callback = mock.Mock()
+        policy = InThread(callback, limit=1)
+        transport = AsyncioTransport(device, loop, callback=policy)
+        finished = mock.Mock()
+        transport.hooks.add(CALLBACK_FINISHED, finished)
+
+        transport.do_callback(TEMPERATURE_PACKET)
+        transport.do_callback(TEMPERATURE_PACKET)
+
+        async def idle():
+            while policy.running or policy.backlog:
+                await asyncio.sleep(0.01)
+
+        loop.run_until_complete(asyncio.wait_for(idle(), 5))
+
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(transport.metrics.callback_time.count, 2)
+        self.assertEqual(finished.call_count, 2)
+        finished.assert_called_with(transport, callback, mock.ANY, mock.ANY)
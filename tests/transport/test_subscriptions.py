@@ -0,0 +1,254 @@
+"""Unit tests for rfxcom.transport.subscriptions.Subscriptions."""
+import asyncio
+from unittest import TestCase, mock
+
+from serial import Serial
+
+from rfxcom.exceptions import PacketHandlerNotFound
+from rfxcom.protocol import Elec, Packet, TempHumidity
+from rfxcom.transport import AsyncioTransport
+from rfxcom.transport.base import BaseTransport
+from rfxcom.transport.subscriptions import (ANY_SUBTYPE, DEFAULT, Fanout,
+                                            Subscriptions)
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+ELEC_PACKET = bytearray(b'\x11\x5A\x01\x00\x2E\xB2\x03\x00\x00'
+                        b'\x02\xB4\x00\x00\x0C\x46\xA8\x11\x69')
+
+# Sensors 0x2EB2 and 0x1234
+TEMP_HUMIDITY_PACKET = bytearray(b'\x0A\x52\x01\x00\x2E\xB2\x00'
+                                 b'\xD5\x5B\x03\x69')
+OTHER_TEMP_HUMIDITY_PACKET = bytearray(b'\x0A\x52\x01\x00\x12\x34\x00'
+                                       b'\xD5\x5B\x03\x69')
+
+
+def _callback(packet):
+    pass
+
+
+def _callback2(packet):
+    pass
+
+
+def _callback3(packet):
+    pass
+
+
+async def _noop(*args, **kwargs):
+    pass
+
+
+class SubscriptionsTestCase(TestCase):
+
+    """Subscriptions test case."""
+
+    def setUp(self):
+
+        self.subscriptions = Subscriptions()
+        self.transport = BaseTransport(mock.Mock(spec=Serial),
+                                       callbacks=self.subscriptions)
+
+    def route(self, pkt):
+        return self.transport.get_callback_parser(pkt)
+
+    def test_invalid_key(self):
+
+        for key in ('Elec', (0x52, 'x'), (0x52, ), object):
+            with self.assertRaises(ValueError):
+                self.subscriptions.subscribe(key, _callback)
+
+        with self.assertRaises(ValueError):
+            self.subscriptions.subscribe(DEFAULT, _callback, sensor_id=1)
+
+        with self.assertRaises(ValueError):
+            self.subscriptions.subscribe(Elec, _callback, sensor_id="nope")
+
+    def test_handler_class(self):
+
+        self.subscriptions.subscribe(TempHumidity, _callback)
+
+        callback, reading = self.route(TEMP_HUMIDITY_PACKET)
+
+        self.assertIs(callback, _callback)
+        self.assertIsInstance(reading.handler, TempHumidity)
+
+        # Nothing else is subscribed, so the HANDLERS aren't used.
+        with self.assertRaises(PacketHandlerNotFound):
+            self.route(ELEC_PACKET)
+
+    def test_packet_type(self):
+
+        self.subscriptions.subscribe((0x52, 0x01), _callback)
+        self.subscriptions.subscribe((0x52, ANY_SUBTYPE), _callback2)
+
+        callback, reading = self.route(TEMP_HUMIDITY_PACKET)
+
+        self.assertEqual(callback, Fanout([_callback, _callback2]))
+        self.assertIsInstance(reading.handler, TempHumidity)
+
+        # An unknown subtype is decoded by the catch all Packet.
+        callback, reading = self.route(
+            bytearray(b'\x0A\x52\xEE\x00\x2E\xB2\x00\xD5\x5B\x03\x69'))
+
+        self.assertIs(callback, _callback2)
+        self.assertIs(type(reading.handler), Packet)
+
+        with self.assertRaises(PacketHandlerNotFound):
+            self.route(bytearray(b'\x02\x01'))
+
+    def test_sensor_id(self):
+
+        self.subscriptions.subscribe(TempHumidity, _callback)
+        self.subscriptions.subscribe(TempHumidity, _callback2,
+                                     sensor_id="0x2EB2")
+        self.subscriptions.subscribe((0x52, 0x01), _callback3,
+                                     sensor_id=0x1234)
+
+        callback, _ = self.route(TEMP_HUMIDITY_PACKET)
+        self.assertEqual(callback, Fanout([_callback, _callback2]))
+
+        callback, _ = self.route(OTHER_TEMP_HUMIDITY_PACKET)
+        self.assertEqual(callback, Fanout([_callback, _callback3]))
+
+    def test_sensor_id_only(self):
+
+        self.subscriptions.subscribe(TempHumidity, _callback,
+                                     sensor_id=0x2EB2)
+
+        callback, _ = self.route(TEMP_HUMIDITY_PACKET)
+        self.assertIs(callback, _callback)
+
+        # Another sensor is decoded but nothing is subscribed to it.
+        callback, _ = self.route(OTHER_TEMP_HUMIDITY_PACKET)
+        self.assertEqual(len(callback), 0)
+        callback(None)
+
+        # Unless there is a default callback.
+        self.transport.subscribe(DEFAULT, _callback3)
+
+        callback, _ = self.route(OTHER_TEMP_HUMIDITY_PACKET)
+        self.assertIs(callback, _callback3)
+
+    def test_lazy(self):
+
+        transport = BaseTransport(mock.Mock(spec=Serial),
+                                  callbacks=self.subscriptions, lazy=True)
+
+        self.subscriptions.subscribe(Elec, _callback)
+        callback, view = transport.get_callback_parser(ELEC_PACKET)
+        self.assertIs(callback, _callback)
+        self.assertIsNone(view._reading)
+
+        self.subscriptions.subscribe(Elec, _callback2, sensor_id=0x2EB2)
+        callback, view = transport.get_callback_parser(ELEC_PACKET)
+        self.assertEqual(callback, Fanout([_callback, _callback2]))
+
+    def test_default(self):
+
+        self.subscriptions.subscribe(Elec, _callback)
+        self.subscriptions.subscribe(DEFAULT, _callback2)
+
+        self.assertIs(self.route(ELEC_PACKET)[0], _callback)
+        self.assertIs(self.route(TEMP_HUMIDITY_PACKET)[0], _callback2)
+        self.assertIs(self.transport.default_callback, _callback2)
+        self.assertEqual(len(self.subscriptions), 2)
+
+    def test_set_default_callback(self):
+
+        self.subscriptions.subscribe(Elec, _callback)
+        self.transport.default_callback = _callback2
+
+        self.assertIs(self.subscriptions.default, _callback2)
+        self.assertIs(self.route(TEMP_HUMIDITY_PACKET)[0], _callback2)
+
+        self.transport.default_callback = None
+
+        with self.assertRaises(PacketHandlerNotFound):
+            self.route(TEMP_HUMIDITY_PACKET)
+
+    def test_duplicate(self):
+
+        # The same callback is only called once for a packet.
+        self.subscriptions.subscribe(Elec, _callback)
+        self.subscriptions.subscribe((0x5A, 0x01), _callback)
+
+        self.assertIs(self.route(ELEC_PACKET)[0], _callback)
+
+    def test_unsubscribe(self):
+
+        self.transport.subscribe(Elec, _callback)
+        self.transport.subscribe(Elec, _callback2, sensor_id=0x2EB2)
+        self.transport.subscribe(DEFAULT, _callback3)
+
+        self.assertEqual(self.route(ELEC_PACKET)[0],
+                         Fanout([_callback, _callback2]))
+
+        self.transport.unsubscribe(Elec, _callback2, sensor_id="0x2eb2")
+        self.assertIs(self.route(ELEC_PACKET)[0], _callback)
+
+        self.transport.unsubscribe(Elec, _callback)
+        self.assertIs(self.route(ELEC_PACKET)[0], _callback3)
+
+        self.transport.unsubscribe(DEFAULT, _callback3)
+
+        with self.assertRaises(PacketHandlerNotFound):
+            self.route(ELEC_PACKET)
+
+        with self.assertRaises(ValueError):
+            self.transport.unsubscribe(Elec, _callback)
+
+        with self.assertRaises(ValueError):
+            self.transport.unsubscribe(DEFAULT, _callback)
+
+    def test_compiled_once(self):
+
+        self.subscriptions.subscribe(Elec, _callback)
+
+        with mock.patch.object(self.subscriptions, 'compile',
+                               wraps=self.subscriptions.compile) as compile_:
+            self.route(ELEC_PACKET)
+            self.route(ELEC_PACKET)
+
+        self.assertEqual(compile_.call_count, 1)
+
+    def test_fanout(self):
+
+        callbacks = [mock.Mock(), mock.Mock()]
+
+        self.subscriptions.subscribe(Elec, callbacks[0])
+        self.subscriptions.subscribe(Elec, callbacks[1], sensor_id=0x2EB2)
+
+        self.transport.do_callback(ELEC_PACKET)
+
+        for callback in callbacks:
+            self.assertEqual(callback.call_count, 1)
+
+    @mock.patch('rfxcom.transport.asyncio.AsyncioTransport._setup',
+                side_effect=_noop)
+    def test_asyncio_fanout(self, _setup):
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        received = []
+
+        async def coroutine_callback(packet):
+            received.append(('coroutine', packet.sensor_id))
+
+        def callback(packet):
+            received.append(('function', packet.sensor_id))
+
+        self.subscriptions.subscribe(Elec, callback)
+        self.subscriptions.subscribe(Elec, coroutine_callback,
+                                     sensor_id=0x2EB2)
+
+        transport = AsyncioTransport(mock.Mock(spec=Serial), loop,
+                                     callbacks=self.subscriptions)
+        transport.do_callback(ELEC_PACKET)
+
+        loop.run_until_complete(asyncio.sleep(0.01))
+
+        self.assertEqual(sorted(received), [('coroutine', 0x2EB2),
+                                            ('function', 0x2EB2)])
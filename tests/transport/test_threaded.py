@@ -0,0 +1,228 @@
+"""Unit tests for rfxcom.transport.threaded.ThreadedTransport."""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+from serial import SerialException
+
+from rfxcom.transport import ThreadedTransport
+
+# It's a unittest, let's be flexible
+# pylint: disable=C0111,W0212,R0201
+
+
+class FakeDevice:
+    """A device which returns the chunks of data put in ``chunks`` and
+    behaves like a serial port with a short timeout when there are none.
+    """
+
+    in_waiting = 0
+
+    def __init__(self):
+        self.chunks = queue.Queue()
+
+    def read(self, size):
+        chunk = self.chunks.get(timeout=5)
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+
+def temperature_packet(id_, sequence_number):
+    return bytes([0x08, 0x50, 0x02, sequence_number, 0x00, id_,
+                  0x00, 0xA7, 0x89])
+
+
+class ThreadedTransportTestCase(TestCase):
+
+    """ThreadedTransport test case."""
+
+    def setUp(self):
+
+        self.device = FakeDevice()
+        self.received = []
+        self.done = threading.Event()
+
+    def callback(self, reading):
+        self.received.append(reading)
+
+    def test_callbacks(self):
+
+        threads = set()
+
+        def callback(reading):
+            threads.add(threading.current_thread().name)
+            self.callback(reading)
+            if len(self.received) == 3:
+                self.done.set()
+
+        with ThreadedTransport(self.device, callback=callback) as transport:
+
+            self.device.chunks.put(temperature_packet(1, 0) +
+                                   temperature_packet(2, 1)[:4])
+            self.device.chunks.put(temperature_packet(2, 1)[4:])
+            self.device.chunks.put(b'\x00' + temperature_packet(3, 2))
+
+            self.assertTrue(self.done.wait(5))
+            self.device.chunks.put(b'')
+
+        self.assertFalse(transport.running)
+        self.assertEqual(sorted(r.sensor_id for r in self.received),
+                         [1, 2, 3])
+        self.assertNotIn("rfxcom-reader", threads)
+        self.assertNotIn("rfxcom-dispatcher", threads)
+
+    def test_lazy(self):
+
+        def callback(view):
+            self.callback(view)
+            if len(self.received) == 2:
+                self.done.set()
+
+        with ThreadedTransport(self.device, callback=callback, lazy=True):
+
+            self.device.chunks.put(temperature_packet(1, 0) +
+                                   temperature_packet(2, 1))
+
+            self.assertTrue(self.done.wait(5))
+            self.device.chunks.put(b'')
+
+        # Dispatching the views didn't decode them.
+        self.assertEqual([view.decoded for view in self.received],
+                         [False, False])
+
+    def test_slow_callback(self):
+
+        # The callbacks for sensor 1 are slow, they must not delay sensor 2
+        # and must still be run in order.
+        release = threading.Event()
+
+        def callback(reading):
+            if reading.sensor_id == 1:
+                release.wait(5)
+            self.callback(reading)
+            if len(self.received) == 6:
+                self.done.set()
+
+        transport = ThreadedTransport(self.device, callback=callback,
+                                      max_workers=2)
+        transport.start()
+
+        for sequence_number in range(3):
+            self.device.chunks.put(temperature_packet(1, sequence_number))
+        for sequence_number in range(3):
+            self.device.chunks.put(temperature_packet(2, sequence_number))
+
+        deadline = time.time() + 5
+        while len(self.received) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual([r.sensor_id for r in self.received], [2, 2, 2])
+
+        release.set()
+        self.assertTrue(self.done.wait(5))
+
+        self.device.chunks.put(b'')
+        transport.stop()
+
+        self.assertEqual(
+            [r.sequence_number for r in self.received if r.sensor_id == 1],
+            [0, 1, 2])
+
+    def test_callback_error(self):
+
+        def callback(reading):
+            self.callback(reading)
+            if len(self.received) == 2:
+                self.done.set()
+            raise ValueError()
+
+        with ThreadedTransport(self.device, callback=callback) as transport:
+
+            with mock.patch.object(transport, 'log') as log:
+                self.device.chunks.put(temperature_packet(1, 0))
+                self.device.chunks.put(temperature_packet(1, 1))
+
+                self.assertTrue(self.done.wait(5))
+                self.device.chunks.put(b'')
+
+        self.assertEqual(log.exception.call_count, 2)
+
+    def test_device_failed(self):
+
+        transport = ThreadedTransport(self.device, callback=self.callback)
+
+        with mock.patch.object(transport, 'log') as log:
+            transport.start()
+            self.device.chunks.put(SerialException())
+            transport.join(5)
+
+        self.assertFalse(transport.running)
+        self.assertFalse(transport._reader.is_alive())
+        self.assertFalse(transport._dispatcher.is_alive())
+        self.assertEqual(log.exception.call_count, 1)
+
+        transport.stop()
+
+    def test_executor(self):
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        transport = ThreadedTransport(self.device, callback=self.callback,
+                                      executor=executor)
+
+        transport.start()
+        self.device.chunks.put(b'')
+        transport.stop()
+
+        # The executor wasn't created by the transport, so it is left alone.
+        self.assertIs(transport.executor, executor)
+        executor.submit(self.done.set).result(5)
+        executor.shutdown()
+
+    def test_stop_without_waiting(self):
+
+        def callback(reading):
+            self.callback(reading)
+            self.done.set()
+
+        transport = ThreadedTransport(self.device, callback=callback)
+        transport.start()
+        transport.stop(wait=False)
+
+        # The reader is still in its last read, the packet it returns is
+        # dispatched before the executor is shut down.
+        self.device.chunks.put(temperature_packet(1, 0))
+
+        self.assertTrue(self.done.wait(5))
+        transport.join(5)
+
+        self.assertEqual([r.sensor_id for r in self.received], [1])
+        self.assertTrue(transport.executor._shutdown)
+
+    def test_device_failed_releases_executor(self):
+
+        transport = ThreadedTransport(self.device, callback=self.callback)
+
+        with mock.patch.object(transport, 'log'):
+            transport.start()
+            self.device.chunks.put(SerialException())
+            transport.join(5)
+
+        self.assertTrue(transport.executor._shutdown)
+
+    def test_submit_failed(self):
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.shutdown()
+        transport = ThreadedTransport(self.device, callback=self.callback,
+                                      executor=executor)
+        key = ('handler', 1)
+
+        with self.assertRaises(RuntimeError):
+            transport._submit(key, self.callback, 'reading')
+
+        # The next reading for the sensor isn't queued behind the failed
+        # one.
+        self.assertEqual(transport._pending, {})